@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Memory report for the in-memory task representations.
+
+Builds the same synthetic store as plain dicts (what json.load produces),
+as a list of slotted Task objects (what TodoApp holds) and as a
+TaskColumns container (what partial loads keep), and reports the bytes
+allocated for each with tracemalloc.
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --size 100000
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def load_task_module():
+    """Load tasks3/task.py as a module."""
+    task_path = Path(__file__).resolve().parents[1] / "task.py"
+    spec = importlib.util.spec_from_file_location("task_cli", task_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_records(n: int) -> str:
+    """Serialized synthetic store, so every representation parses fresh strings."""
+    base = datetime(2025, 1, 1)
+    records = []
+    for i in range(n):
+        completed = i % 4 == 0
+        records.append({
+            'id': i + 1,
+            'title': f"Task {i}",
+            'description': "" if i % 3 else f"Details for task {i}",
+            'completed': completed,
+            'created_at': (base + timedelta(seconds=i, microseconds=i % 997)).isoformat(),
+            'completed_at': (base + timedelta(days=1, seconds=i)).isoformat() if completed else None,
+        })
+    return json.dumps(records)
+
+
+def measure(build) -> int:
+    """Bytes still allocated by the object build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare task representations' memory use")
+    parser.add_argument('--size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    task = load_task_module()
+    data = make_records(args.size)
+    results = {
+        'dict': measure(lambda: json.loads(data)),
+        'Task (__slots__)': measure(lambda: [task.Task.from_dict(d) for d in json.loads(data)]),
+        'TaskColumns': measure(lambda: task.TaskColumns(json.loads(data))),
+    }
+    baseline = results['dict']
+    print(f"{args.size} tasks")
+    print(f"{'Representation':<18} {'MB':>10} {'bytes/task':>11} {'vs dict':>8}")
+    for name, size in results.items():
+        print(f"{name:<18} {size / 1e6:>10.1f} {size / args.size:>11.0f} {size / baseline:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark reindexing after a single completion, before and after the
+incremental reorder in TodoApp.
+
+"before" is the original algorithm: split, re-parse every created_at with
+datetime.fromisoformat and fully re-sort both partitions.
+"after" is TodoApp applying a 'complete' operation, which moves one task
+between the maintained partitions and rewrites the IDs that changed.
+"after (full)" is TodoApp.reindex(), which rebuilds the partitions from the
+cached timestamps.
+
+Usage:
+    python benchmarks/bench_reindex.py
+    python benchmarks/bench_reindex.py --sizes 10000 100000
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def load_task_module():
+    """Load tasks3/task.py as a module."""
+    task_path = Path(__file__).resolve().parents[1] / "task.py"
+    spec = importlib.util.spec_from_file_location("task_cli", task_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_todos(n: int) -> List[Dict]:
+    """Synthetic store: 1 in 4 tasks completed, one creation per second."""
+    base = datetime(2025, 1, 1)
+    todos = []
+    for i in range(n):
+        todos.append({
+            'id': i + 1,
+            'title': f"Task {i}",
+            'description': "",
+            'completed': i % 4 == 0,
+            'created_at': (base + timedelta(seconds=i)).isoformat(),
+            'completed_at': None,
+        })
+    return todos
+
+
+def legacy_reindex(todos: List[Dict]) -> List[Dict]:
+    """The reindex algorithm as it was before incremental ordering."""
+    def safe_parse(ts: Optional[str]) -> float:
+        try:
+            return datetime.fromisoformat(ts).timestamp() if ts else float('inf')
+        except Exception:
+            return float('inf')
+
+    incompletes = [t for t in todos if not t.get('completed')]
+    completes = [t for t in todos if t.get('completed')]
+    incompletes.sort(key=lambda t: (safe_parse(t.get('created_at')), t.get('id', 0)))
+    completes.sort(key=lambda t: (safe_parse(t.get('created_at')), t.get('id', 0)))
+    new_list = incompletes + completes
+    for idx, t in enumerate(new_list, start=1):
+        t['id'] = idx
+    return new_list
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench(task, n: int, repeat: int) -> Dict[str, float]:
+    todos = make_todos(n)
+    before = best_of(lambda: legacy_reindex(todos), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = task.TodoApp(data_file=os.path.join(tmp, 'tasks.json'))
+        app.todos = make_todos(n)
+        app._reorder()  # build partitions and timestamp cache once
+
+        def complete_one():
+            # Complete the median incomplete task, without persisting
+            incompletes = app._partitions()[0]
+            target = incompletes[len(incompletes) // 2]
+            app._apply({'op': 'complete', 'ids': [target['id']], 'completed_at': None})
+
+        after = best_of(complete_one, repeat)
+
+        def full():
+            app._parts = None
+            app._reorder()
+
+        after_full = best_of(full, repeat)
+    return {'before': before, 'after': after, 'after_full': after_full}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark incremental reindexing")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    task = load_task_module()
+    print(f"{'Tasks':>10} {'before (s)':>12} {'after (s)':>12} {'after full (s)':>15} {'speedup':>9}")
+    for n in args.sizes:
+        r = bench(task, n, args.repeat)
+        speedup = r['before'] / r['after'] if r['after'] else float('inf')
+        print(f"{n:>10} {r['before']:>12.4f} {r['after']:>12.4f} {r['after_full']:>15.4f} {speedup:>8.1f}x")
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
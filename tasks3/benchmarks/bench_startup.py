@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup: wall time of short one-shot commands, each in a
+fresh interpreter, as shell hooks run them.
+
+"legacy entry" loads task.py the way the tasks3 entry point originally
+did (pathlib resolve, import spec, exec_module, full argparse tree).
+"tasks3 entry" is the current `tasks3:main`, and "task.py" runs the
+script directly. With --baseline REV the entry point and task.py from
+that git revision are timed as well, on a copy of the same store. Older
+revisions have no --file option, so that copy is the tasks.json next to
+their task.py, which they use by default.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 50 --baseline HEAD~1
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT = Path(__file__).resolve().parents[1]
+
+# The original tasks3.main, verbatim apart from the path argument
+LEGACY_ENTRY = """
+import sys
+from pathlib import Path
+import importlib.util as _import_util
+cli_path = Path(sys.argv.pop(1)).resolve()
+spec = _import_util.spec_from_file_location("tasks3_cli", str(cli_path))
+module = _import_util.module_from_spec(spec)
+spec.loader.exec_module(module)
+module.main()
+"""
+
+CURRENT_ENTRY = """
+import sys
+sys.path.insert(0, sys.argv.pop(1))
+import tasks3
+tasks3.main()
+"""
+
+COMMANDS = [
+    ['list'],
+    ['list', '--all'],
+    ['search', 'report'],
+    ['add', 'Benchmark', 'task'],
+    ['--help'],
+]
+
+
+def make_store(path: Path, n: int) -> None:
+    todos = [{
+        'id': i + 1, 'title': f"Task {i} report" if i % 7 == 0 else f"Task {i}",
+        'description': "", 'completed': i % 4 == 0,
+        'created_at': f"2025-01-01T00:00:{i % 60:02d}", 'completed_at': None,
+    } for i in range(n)]
+    path.write_text(json.dumps(todos, indent=2))
+
+
+def materialize(rev: str, dest: Path) -> Path:
+    """Write task.py and the tasks3 package from git revision rev under dest."""
+    for rel in ('task.py', 'src/tasks3/__init__.py'):
+        blob = subprocess.run(['git', 'show', f"{rev}:./{rel}"], cwd=PROJECT,
+                              capture_output=True, check=True).stdout
+        target = dest / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(blob)
+    return dest
+
+
+def time_runs(argv: List[str], repeat: int, cwd: Path) -> List[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False, cwd=cwd)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per command and entry (default: 20)')
+    parser.add_argument('--tasks', type=int, default=200, help='Tasks in the store (default: 200)')
+    parser.add_argument('--baseline', metavar='REV', help='Also time the entry point from this git revision')
+    parser.add_argument('--json', metavar='PATH', help='Write the results as JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        store = tmp_path / 'tasks.json'
+        # Tree, and the store its CLI is run on: the current one is pointed at
+        # the temporary store, a baseline one uses its default tasks.json
+        trees = {'current': (PROJECT, store)}
+        if args.baseline:
+            baseline = materialize(args.baseline, tmp_path / 'baseline')
+            trees[args.baseline] = (baseline, baseline / 'tasks.json')
+
+        # name -> (argv, store, working directory)
+        entries: Dict[str, tuple] = {}
+        for label, (tree, tree_store) in trees.items():
+            suffix = '' if label == 'current' else f" @ {label}"
+            options = ['--file', str(store)] if label == 'current' else []
+            entries[f"legacy entry{suffix}"] = ([sys.executable, '-c', LEGACY_ENTRY, str(tree / 'task.py')] + options,
+                                                tree_store, tree)
+            entries[f"tasks3 entry{suffix}"] = ([sys.executable, '-c', CURRENT_ENTRY, str(tree / 'src')] + options,
+                                                tree_store, tree)
+            entries[f"task.py{suffix}"] = ([sys.executable, str(tree / 'task.py')] + options, tree_store, tree)
+
+        # Warm every bytecode cache once so all entries are timed alike
+        for argv, _, cwd in entries.values():
+            subprocess.run(argv + ['--help'], capture_output=True, cwd=cwd)
+
+        results = {}
+        print(f"{'command':<24} " + ' '.join(f"{name:>20}" for name in entries))
+        for command in COMMANDS:
+            row = {}
+            for name, (argv, tree_store, cwd) in entries.items():
+                make_store(tree_store, args.tasks)
+                runs = time_runs(argv + command, args.repeat, cwd)
+                row[name] = {'median_ms': statistics.median(runs) * 1000, 'min_ms': min(runs) * 1000}
+            results[' '.join(command)] = row
+            print(f"{' '.join(command):<24} " + ' '.join(f"{row[n]['median_ms']:>18.1f}ms" for n in entries))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'python': sys.version, 'repeat': args.repeat, 'tasks': args.tasks, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
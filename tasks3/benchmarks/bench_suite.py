@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the core TodoApp operations on synthetic stores.
+
+For every store size each operation is timed in-process ("api": one
+TodoApp method call, with the app already loaded unless the operation is
+the load itself) and through the command line ("cli": a fresh `task.py`
+process, as a shell runs it). Every run starts from a fresh copy of the
+same store, so operations that write do not affect the next run.
+
+Results are printed as a table and, with --json, written as JSON that a
+later run can be compared against with --compare. The comparison lists
+each timing that is more than --threshold times slower than the baseline
+and exits with status 1 if there are any.
+
+Usage:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --sizes 1000 1000000 --json after.json
+    python benchmarks/bench_suite.py --storage journal --mode api --compare before.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT = Path(__file__).resolve().parents[1]
+TASK_PY = PROJECT / "task.py"
+
+OPERATIONS = ['load_todos', 'save_todos', 'add_todo', 'list_todos', 'search_todos',
+              'complete_todos', 'delete_todos', 'reindex']
+# The command each operation corresponds to ('{id}': a display ID in the
+# middle of the list); load, save and reindex have no command of their own
+CLI_COMMANDS = {
+    'add_todo': ['add', 'Benchmark', 'task', '-d', 'added by the suite'],
+    'list_todos': ['list', '--all'],
+    'search_todos': ['search', 'report'],
+    'complete_todos': ['complete', '{id}'],
+    'delete_todos': ['delete', '{id}'],
+}
+DATA_FILES = {'sqlite': 'tasks.db'}
+
+
+def load_task_module():
+    """Load tasks3/task.py as a module."""
+    spec = importlib.util.spec_from_file_location("task_cli", TASK_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_todos(n: int) -> List[Dict]:
+    """Synthetic store: 1 in 4 tasks completed, 1 in 7 matching 'report'."""
+    base = datetime(2025, 1, 1)
+    todos = []
+    for i in range(n):
+        completed = i % 4 == 0
+        created = base + timedelta(seconds=i)
+        todos.append({
+            'id': i + 1,
+            'title': f"Task {i} report" if i % 7 == 0 else f"Task {i}",
+            'description': f"Synthetic task number {i}",
+            'completed': completed,
+            'created_at': created.isoformat(),
+            'completed_at': (created + timedelta(hours=1)).isoformat() if completed else None,
+        })
+    return todos
+
+
+def write_store(task, directory: Path, storage: str, n: int) -> Path:
+    """Create a store of n tasks with the given backend; return its data file."""
+    path = directory / DATA_FILES.get(storage, 'tasks.json')
+    app = task.TodoApp(str(path), storage=storage)
+    app.todos = make_todos(n)
+    app.save_todos()
+    return path
+
+
+@contextlib.contextmanager
+def fresh_copy(pristine: Path):
+    """Yield the data file of a throwaway copy of the store in pristine's directory."""
+    with tempfile.TemporaryDirectory(dir=pristine.parent.parent) as tmp:
+        work = Path(tmp) / 'store'
+        shutil.copytree(pristine.parent, work)
+        yield work / pristine.name
+
+
+def api_operation(task, app, op: str, n: int) -> Callable[[], object]:
+    """Return the call that performs op on a loaded app."""
+    middle = max(1, n // 2)
+    if op == 'load_todos':
+        def load():
+            app.scope = 'all'
+            app.load_todos()
+            return app.todos
+        return load
+    return {
+        'save_todos': app.save_todos,
+        'add_todo': lambda: app.add_todo("Benchmark task", "added by the suite"),
+        'list_todos': lambda: app.list_todos(show_all=True),
+        'search_todos': lambda: app.search_todos("report"),
+        'complete_todos': lambda: app.complete_todos([middle]),
+        'delete_todos': lambda: app.delete_todos([middle]),
+        'reindex': app.reindex,
+    }[op]
+
+
+def time_api(task, pristine: Path, storage: str, op: str, n: int, repeat: int) -> List[float]:
+    times = []
+    with open(os.devnull, 'w') as devnull:
+        for _ in range(repeat):
+            with fresh_copy(pristine) as path:
+                with contextlib.redirect_stdout(devnull):
+                    if op == 'load_todos':
+                        app = task.TodoApp(str(path), storage=storage, scope='none')
+                    else:
+                        app = task.TodoApp(str(path), storage=storage)
+                        app.todos
+                    call = api_operation(task, app, op, n)
+                    start = time.perf_counter()
+                    call()
+                    times.append(time.perf_counter() - start)
+    return times
+
+
+def time_cli(pristine: Path, storage: str, op: str, n: int, repeat: int) -> List[float]:
+    # --storage also keeps the command from being sent to a running daemon
+    command = [arg.replace('{id}', str(max(1, n // 2))) for arg in CLI_COMMANDS[op]]
+    times = []
+    for _ in range(repeat):
+        with fresh_copy(pristine) as path:
+            argv = [sys.executable, str(TASK_PY), '--file', str(path), '--storage', storage] + command
+            start = time.perf_counter()
+            result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            times.append(time.perf_counter() - start)
+            if result.returncode:
+                raise RuntimeError(f"{' '.join(command)} failed: {result.stderr.decode(errors='replace')}")
+    return times
+
+
+def run_suite(sizes: List[int], storage: str, modes: List[str], ops: List[str], repeat: int) -> List[Dict]:
+    task = load_task_module()
+    results = []
+    print(f"{'tasks':>9} {'mode':<4} {'operation':<15} {'min (ms)':>10} {'median (ms)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            store_dir = Path(tmp) / f"n{n}" / 'store'
+            store_dir.mkdir(parents=True)
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                pristine = write_store(task, store_dir, storage, n)
+            for mode in modes:
+                for op in ops:
+                    if mode == 'cli' and op not in CLI_COMMANDS:
+                        continue
+                    if mode == 'api':
+                        runs = time_api(task, pristine, storage, op, n, repeat)
+                    else:
+                        runs = time_cli(pristine, storage, op, n, repeat)
+                    entry = {
+                        'tasks': n, 'mode': mode, 'operation': op,
+                        'min_s': min(runs), 'median_s': statistics.median(runs), 'runs_s': runs,
+                    }
+                    results.append(entry)
+                    print(f"{n:>9} {mode:<4} {op:<15} {entry['min_s'] * 1000:>10.2f} {entry['median_s'] * 1000:>12.2f}")
+                    sys.stdout.flush()
+            shutil.rmtree(store_dir.parent)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Tuple[Tuple, float, float]]:
+    """Print current timings against baseline; return the (key, old, new) regressions.
+
+    Timings are matched by (tasks, mode, operation) and compared by their
+    minimum, the least noisy of the runs.
+    """
+    if baseline.get('storage') != current['storage']:
+        print(f"Warning: baseline used {baseline.get('storage')} storage, this run {current['storage']}")
+    old = {(r['tasks'], r['mode'], r['operation']): r['min_s'] for r in baseline.get('results', [])}
+    regressions = []
+    print(f"\n{'tasks':>9} {'mode':<4} {'operation':<15} {'baseline (ms)':>14} {'now (ms)':>10} {'ratio':>7}")
+    for r in current['results']:
+        key = (r['tasks'], r['mode'], r['operation'])
+        if key not in old:
+            continue
+        ratio = r['min_s'] / old[key] if old[key] else float('inf')
+        flag = '  slower' if ratio > threshold else ''
+        print(f"{key[0]:>9} {key[1]:<4} {key[2]:<15} {old[key] * 1000:>14.2f} {r['min_s'] * 1000:>10.2f} {ratio:>6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append((key, old[key], r['min_s']))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Store sizes to test (default: 1000 10000 100000)')
+    parser.add_argument('--storage', default='json', choices=['json', 'journal', 'sqlite', 'binary'],
+                        help='Storage backend (default: json)')
+    parser.add_argument('--mode', choices=['api', 'cli', 'both'], default='both',
+                        help='Time in-process calls, CLI processes or both (default: both)')
+    parser.add_argument('--ops', nargs='+', choices=OPERATIONS, default=OPERATIONS, metavar='OP',
+                        help=f"Operations to time (default: all of {', '.join(OPERATIONS)})")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per timing (default: 3)')
+    parser.add_argument('--json', metavar='PATH', help='Write the results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='Compare with the JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Ratio to the baseline reported as a regression (default: 1.25)')
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    modes = ['api', 'cli'] if args.mode == 'both' else [args.mode]
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'revision': git_revision(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'storage': args.storage,
+        'repeat': args.repeat,
+        'results': run_suite(args.sizes, args.storage, modes, args.ops, args.repeat),
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} timing(s) more than {args.threshold}x slower than {args.compare}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from pathlib import Path
-import importlib.util as _import_util
-from typing import Optional as _Optional
+import os as _os
+import sys as _sys
+
+# Module name task.py is loaded under (and kept in sys.modules as)
+_CLI_MODULE = "tasks3_cli"
 
 
 def inc(n: int) -> int:
@@ -14,23 +16,81 @@ def _load_cli_module():
 
     This keeps task.py as the single source of truth for the CLI implementation
     while allowing the package entry point `tasks3:main` to invoke it.
+
+    Startup time matters here, since shell hooks run the CLI many times:
+    pathlib and importlib.util are not imported (they cost more than the
+    rest of startup), compiled bytecode is reused (see _cli_code), and the
+    module is loaded once per process.
     """
+    module = _sys.modules.get(_CLI_MODULE)
+    if module is not None:
+        return module
+    from importlib.machinery import SourceFileLoader
+
     # __file__ = .../tasks3/src/tasks3/__init__.py
-    # project root (containing task.py) is two levels up from 'src/tasks3'
-    # parents[0] = .../src/tasks3, parents[1] = .../src, parents[2] = .../tasks3
-    project_root = Path(__file__).resolve().parents[2]
-    cli_path = project_root / "task.py"
-    if not cli_path.exists():
+    # project root (containing task.py) is two levels above 'src/tasks3'
+    package_dir = _os.path.dirname(_os.path.realpath(__file__))
+    project_root = _os.path.dirname(_os.path.dirname(package_dir))
+    cli_path = _os.path.join(project_root, "task.py")
+    if not _os.path.exists(cli_path):
         raise FileNotFoundError(f"Could not find CLI script at {cli_path}")
 
-    spec = _import_util.spec_from_file_location("tasks3_cli", str(cli_path))
-    if not spec or not spec.loader:
-        raise RuntimeError("Failed to create import spec for CLI module")
-    module = _import_util.module_from_spec(spec)
-    spec.loader.exec_module(module)  # type: ignore[arg-type]
+    loader = SourceFileLoader(_CLI_MODULE, cli_path)
+    module = type(_sys)(_CLI_MODULE)
+    module.__file__ = cli_path
+    module.__loader__ = loader
+    _sys.modules[_CLI_MODULE] = module
+    try:
+        exec(_cli_code(loader, cli_path), module.__dict__)
+    except BaseException:
+        del _sys.modules[_CLI_MODULE]
+        raise
     return module
 
 
+def _bytecode_cache_path(cli_path: str) -> str:
+    """Where _cli_code keeps task.py's bytecode when __pycache__ is not written."""
+    root = _os.environ.get("XDG_CACHE_HOME") or _os.path.join(_os.path.expanduser("~"), ".cache")
+    name = cli_path.strip(_os.sep).replace(_os.sep, "%").replace(":", "%")
+    return _os.path.join(root, "tasks3", f"{name}.{_sys.implementation.cache_tag}.pyc")
+
+
+def _cli_code(loader, cli_path: str):
+    """Return the code object for task.py, compiling it only when it changed.
+
+    Normally SourceFileLoader reads and writes task.py's bytecode in
+    __pycache__. When writing bytecode is disabled (PYTHONDONTWRITEBYTECODE
+    or -B, common in containers) that would mean compiling the whole CLI on
+    every run, so the bytecode is cached under the user cache directory
+    instead, keyed by the source's mtime and size and the Python version.
+    """
+    if not _sys.dont_write_bytecode:
+        return loader.get_code(_CLI_MODULE)
+    import marshal
+
+    st = _os.stat(cli_path)
+    key = f"{st.st_mtime_ns} {st.st_size} {_sys.version}\n".encode()
+    cache_path = _bytecode_cache_path(cli_path)
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        if data.startswith(key):
+            return marshal.loads(memoryview(data)[len(key):])
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+    code = loader.source_to_code(loader.get_data(cli_path), cli_path)
+    try:
+        _os.makedirs(_os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{_os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(key + marshal.dumps(code))
+        _os.replace(tmp_path, cache_path)
+    except OSError:
+        # No usable cache directory: still works, just compiles every time
+        pass
+    return code
+
+
 def main() -> None:
     """Package entry point used by the `tasks3` console script.
 
@@ -42,4 +102,3 @@ def main() -> None:
         cli.main()  # type: ignore[attr-defined]
     else:
         raise AttributeError("Loaded CLI module has no callable 'main' function")
-
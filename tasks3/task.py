@@ -1,32 +1,1887 @@
 #!/usr/bin/env python3
 """
-A simple CLI task application with JSON storage.
-Supports add, list, search, complete, delete, and clean operations.
+A CLI task application.
+Supports add, list, search, complete, delete, clean, import, export and
+convert, as one-shot commands, in an interactive REPL or from a script.
+
+Tasks are kept in one of several storage backends (see STORAGE_BACKENDS):
+a JSON file, JSON with an append-only journal, a binary snapshot or
+SQLite. Changes are recorded as operations, which can be batched and
+saved together, and several processes may write the same store at once.
+`task serve` keeps a store loaded for the commands of other `task`
+processes, AsyncTodoApp offers the same operations to asyncio code, and
+an optional summarizer gives long descriptions a short summary.
 """
 
-import argparse
-import shlex
+from __future__ import annotations
+
+import bisect
 import json
 import os
+import re
+import struct
 import sys
-from datetime import datetime
-from typing import List, Dict, Optional
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import MutableMapping, Sequence
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import accumulate, chain
+from time import perf_counter
+from types import SimpleNamespace
+
+# argparse, shlex, sqlite3 and typing are only imported where they are
+# needed, so that one-shot commands start quickly (see main)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    import sqlite3
+    from typing import Any, Iterable, Iterator, List, Dict, Optional, TextIO, Tuple
+
+# When this module started executing (see the 'startup' phase in main)
+_MODULE_START = perf_counter()
+
+
+TASK_FIELDS = ('id', 'title', 'description', 'completed', 'created_at', 'completed_at')
+# Operations after which tasks are renumbered (see TodoApp._reorder)
+REORDERING_OPS = frozenset({'complete', 'delete', 'clean', 'reindex'})
+# Lock file next to the data file that writers hold (see store_lock)
+LOCK_SUFFIX = '.lock'
+
+
+_TASK_FIELD_SET = frozenset(TASK_FIELDS)
+
+
+def parse_timestamp(ts: Optional[str]) -> float:
+    """Return an ISO timestamp as epoch seconds; missing or invalid sorts last."""
+    try:
+        return datetime.fromisoformat(ts).timestamp() if ts else float('inf')
+    except Exception:
+        return float('inf')
+
+
+class Task(MutableMapping):
+    """A single task, stored in slots rather than a per-task dict.
+
+    Behaves as a mapping with the same keys as the on-disk JSON record, so
+    code written against task dicts keeps working and equals the dict it was
+    made from. Keys beyond TASK_FIELDS are kept in `extra`. `ts` caches
+    created_at as epoch seconds for ordering.
+    """
+
+    __slots__ = TASK_FIELDS + ('extra', 'ts')
+
+    def __init__(self, id: int = 0, title: str = '', description: str = '', completed: bool = False,
+                 created_at: Optional[str] = None, completed_at: Optional[str] = None,
+                 extra: Optional[Dict] = None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.extra = extra
+        self.ts: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Task':
+        """Build a Task from a task record (a copy if it is already a Task)."""
+        if isinstance(data, Task):
+            return data.copy()
+        # Fast path for complete records, which is every task loaded from disk
+        task = object.__new__(cls)
+        try:
+            task.id = data['id']
+            task.title = data['title']
+            task.description = data['description']
+            task.completed = data['completed']
+            task.created_at = data['created_at']
+            task.completed_at = data['completed_at']
+        except KeyError:
+            extra = {k: v for k, v in data.items() if k not in _TASK_FIELD_SET} or None
+            return cls(data.get('id', 0), data.get('title', ''), data.get('description', ''),
+                       data.get('completed', False), data.get('created_at'), data.get('completed_at'), extra)
+        if len(data) == len(TASK_FIELDS):
+            task.extra = None
+        else:
+            task.extra = {k: v for k, v in data.items() if k not in _TASK_FIELD_SET}
+        task.ts = None
+        return task
+
+    def to_dict(self) -> Dict:
+        """Return the task as its on-disk JSON record."""
+        data = {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'completed': self.completed,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self) -> 'Task':
+        task = Task(self.id, self.title, self.description, self.completed,
+                    self.created_at, self.completed_at, dict(self.extra) if self.extra else None)
+        task.ts = self.ts
+        return task
+
+    def timestamp(self) -> float:
+        """created_at as epoch seconds, parsed once."""
+        if self.ts is None:
+            self.ts = parse_timestamp(self.created_at)
+        return self.ts
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _TASK_FIELD_SET:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _TASK_FIELD_SET:
+            return getattr(self, key)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _TASK_FIELD_SET:
+            setattr(self, key, value)
+            if key == 'created_at':
+                self.ts = None
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _TASK_FIELD_SET:
+            raise TypeError(f"Cannot remove task field {key!r}")
+        if not self.extra or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from TASK_FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(TASK_FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Task):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()!r})"
+
+
+def _task_id(task: Task) -> int:
+    return task.id
+
+
+def task_to_json(obj: Any) -> Dict:
+    """json.dump `default` hook that writes Task objects as their records."""
+    if isinstance(obj, Task):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def task_identity(task: Dict) -> tuple:
+    """What identifies a task across processes: IDs are renumbered, these fields are not."""
+    return task.get('created_at'), task.get('title'), task.get('description')
+
+
+def write_atomic(path: str, data: Any, mode: str = 'w') -> None:
+    """Replace the file at path with data, never leaving a partial file.
+
+    data is written to a temporary file next to path, flushed to disk and
+    renamed over path, so readers and a crash at any point see either the
+    old or the new contents. A symlinked path updates the file it points to.
+    """
+    path = os.path.realpath(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def store_lock(path: str):
+    """Hold an exclusive advisory lock for the store at path while writing.
+
+    The lock is taken on ``<path>.lock`` (see LOCK_SUFFIX), which is left in
+    place. Without fcntl (Windows) writers are not serialized.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path + LOCK_SUFFIX, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class StoreConflict(RuntimeError):
+    """Another process changed the store so that an operation no longer applies."""
+
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_NO_TIME = -(1 << 63)
+
+
+def _encode_time(ts: Optional[str]) -> Optional[int]:
+    """Encode a naive ISO timestamp as microseconds since 1970, if that is lossless."""
+    if ts is None:
+        return _NO_TIME
+    try:
+        dt = datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None or dt.isoformat() != ts:
+        return None
+    return (dt - _NAIVE_EPOCH) // timedelta(microseconds=1)
+
+
+def _decode_time(micros: int) -> Optional[str]:
+    if micros == _NO_TIME:
+        return None
+    return (_NAIVE_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+class TaskColumns(Sequence):
+    """Column-oriented, append-only task container.
+
+    Ids, completion flags and timestamps live in typed arrays and text
+    fields are interned strings, which takes a fraction of the memory of one
+    object per task. Items are materialized as Task objects on access.
+    Fields that cannot be encoded losslessly (non-canonical timestamps,
+    extra keys) are kept per task in an overflow dict.
+    """
+
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        self.ids = array('q')
+        self.flags = array('B')
+        self.created = array('q')
+        self.completed_at = array('q')
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.overflow: Dict[int, Dict] = {}
+        for task in tasks:
+            self.append(task)
+
+    def append(self, task: Dict) -> None:
+        idx = len(self.ids)
+        raw = {}
+        created = _encode_time(task.get('created_at'))
+        if created is None:
+            raw['created_at'] = task.get('created_at')
+            created = _NO_TIME
+        completed_at = _encode_time(task.get('completed_at'))
+        if completed_at is None:
+            raw['completed_at'] = task.get('completed_at')
+            completed_at = _NO_TIME
+        for key in task:
+            if key not in _TASK_FIELD_SET:
+                raw[key] = task[key]
+        self.ids.append(task.get('id', 0))
+        self.flags.append(1 if task.get('completed') else 0)
+        self.created.append(created)
+        self.completed_at.append(completed_at)
+        self.titles.append(sys.intern(task.get('title', '')))
+        self.descriptions.append(sys.intern(task.get('description', '')))
+        if raw:
+            self.overflow[idx] = raw
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        task = Task(self.ids[idx], self.titles[idx], self.descriptions[idx], bool(self.flags[idx]),
+                    _decode_time(self.created[idx]), _decode_time(self.completed_at[idx]))
+        raw = self.overflow.get(idx)
+        if raw:
+            for key, value in raw.items():
+                task[key] = value
+        return task
+
+
+_JSON_SPACE = re.compile(r'[ \t\r\n]*')
+_JSON_SEPARATOR = re.compile(r'[ \t\r\n,]*')
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Yield the elements of a JSON array from a file one at a time.
+
+    Reads `chunk_size` characters at a time and decodes each element as soon
+    as it is complete, so memory is bounded by the largest element rather
+    than the file. Callers may stop iterating early.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = 0
+    eof = not buf
+
+    def skip(pattern: re.Pattern) -> None:
+        nonlocal buf, pos, eof
+        while True:
+            pos = pattern.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+
+    skip(_JSON_SPACE)
+    if eof:
+        return
+    if buf[pos] != '[':
+        raise json.JSONDecodeError("Expected a JSON array", buf, pos)
+    pos += 1
+    while True:
+        skip(_JSON_SEPARATOR)
+        if eof:
+            raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+        if buf[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+        if pos >= chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def trigrams(text: str) -> set:
+    """Return the set of three-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index from lowercase trigrams to tasks, for substring search.
+
+    Every trigram of a query must occur in a matching task's lowercased
+    title or description, so intersecting the query's postings gives a
+    candidate set that contains every match. Candidates are then checked
+    with the same substring test as a full scan, so results are identical.
+    Queries shorter than three characters have no trigrams; candidates()
+    returns None for them and the caller scans.
+
+    Building costs about 100 plain scans in CPython (95-140 measured on
+    CPython 3.13 over 1,000-50,000 tasks), so TodoApp only builds one for
+    a session that has already scanned that many times (BUILD_AFTER_SCANS).
+    Waiting until the scans cost as much as the build never spends more
+    than twice what the best choice in hindsight would.
+    """
+
+    BUILD_AFTER_SCANS = 100
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        # Keyed by object identity: tasks are mutable (and unhashable) and
+        # display ids change on every reorder
+        self._tasks: Dict[int, Task] = {}
+        self._postings: Dict[str, set] = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    @staticmethod
+    def _grams(task: Task) -> set:
+        return trigrams(task.title.lower()) | trigrams(task.description.lower())
+
+    def add(self, task: Task) -> None:
+        key = id(task)
+        self._tasks[key] = task
+        postings = self._postings
+        for gram in self._grams(task):
+            bucket = postings.get(gram)
+            if bucket is None:
+                postings[gram] = {key}
+            else:
+                bucket.add(key)
+
+    def remove(self, task: Task) -> None:
+        key = id(task)
+        if self._tasks.pop(key, None) is None:
+            return
+        for gram in self._grams(task):
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._postings[gram]
+
+    def candidates(self, query_lower: str) -> Optional[List[Task]]:
+        """Tasks that may contain query_lower, or None if it is too short to narrow."""
+        grams = trigrams(query_lower)
+        if not grams:
+            return None
+        buckets = []
+        for gram in grams:
+            bucket = self._postings.get(gram)
+            if not bucket:
+                return []
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        keys = buckets[0].intersection(*buckets[1:])
+        return [self._tasks[k] for k in keys]
+
+
+class StoreStats:
+    """Cheap aggregates of a task list: the highest ID and task counts.
+
+    TodoApp keeps one up to date as operations are applied, so the next ID
+    and the list footer need no scan, and JournalStorage persists it so an
+    add can run without reading the store at all. Also serves as the query
+    object for such a command (see TodoApp._stream_scope).
+
+    high_water is None when removing tasks may have lowered it and it has
+    not been found again yet.
+    """
+
+    __slots__ = ('high_water', 'total', 'completed')
+
+    def __init__(self, high_water: Optional[int] = 0, total: int = 0, completed: int = 0):
+        self.high_water = high_water
+        self.total = total
+        self.completed = completed
+
+    @classmethod
+    def of(cls, todos: Iterable[Dict]) -> 'StoreStats':
+        """Compute the aggregates with one pass over todos."""
+        stats = cls()
+        for todo in todos:
+            stats.note_added(todo)
+        return stats
+
+    @classmethod
+    def from_list(cls, values: Any) -> Optional['StoreStats']:
+        """Inverse of to_list; None unless values is a valid [high_water, total, completed]."""
+        if (isinstance(values, list) and len(values) == 3
+                and all(isinstance(v, int) and v >= 0 for v in values)):
+            return cls(*values)
+        return None
+
+    def to_list(self) -> List[int]:
+        return [self.high_water, self.total, self.completed]
+
+    def note_added(self, todo: Dict) -> None:
+        """Account for a task added to the list."""
+        self.total += 1
+        if todo.get('completed'):
+            self.completed += 1
+        if self.high_water is not None and todo.get('id', 0) > self.high_water:
+            self.high_water = todo['id']
+
+    def counts(self) -> Tuple[int, int]:
+        return self.total, self.completed
+
+    def max_id(self) -> int:
+        return self.high_water
+
+
+class JsonStorage:
+    """Whole-file JSON storage: the original indent-formatted tasks.json."""
+
+    name = 'json'
+    # Backends that can answer list/search/lookup queries without loading
+    # every task set this and implement the query methods (see SqliteStorage)
+    queryable = False
+    # Backends whose record() can append an operation without the task list
+    appends = False
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def files(self) -> List[str]:
+        """Return the paths this storage reads and writes."""
+        return [self.path]
+
+    def exists(self) -> bool:
+        """Return True if there is stored data to load."""
+        return os.path.exists(self.path)
+
+    def version(self) -> Any:
+        """Return a stamp that changes whenever another process writes the store.
+
+        Every write replaces or appends to a file, so the inode, size and
+        mtime of each file are enough.
+        """
+        stamp = []
+        for path in self.files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return stamp
+
+    def load(self) -> List[Dict]:
+        """Read and return the stored task list."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def iter_tasks(self) -> Iterator[Dict]:
+        """Yield stored tasks one at a time without loading the whole file."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            yield from iter_json_array(f)
+
+    def journal(self) -> List[Dict]:
+        """Return operations recorded since the last full save."""
+        return []
+
+    def save(self, todos: List[Dict]) -> None:
+        """Write the complete task list."""
+        # One-shot dumps uses the C encoder; json.dump to a file does not
+        write_atomic(self.path, json.dumps(todos, indent=2, default=task_to_json))
+
+    def stats(self) -> Optional[StoreStats]:
+        """Return persisted aggregates of the stored tasks, if this backend keeps them."""
+        return None
+
+    def record(self, op: Dict, todos: List[Dict], stats: Optional[StoreStats] = None) -> None:
+        """Persist a single operation that has already been applied to todos.
+
+        stats, the aggregates after the operation, is given to backends that
+        persist them (see JournalStorage).
+        """
+        self.save(todos)
+
+
+class JournalStorage(JsonStorage):
+    """JSON snapshot plus an append-only journal of operations.
+
+    Each mutation appends one JSON line to ``<data_file>.journal`` instead of
+    rewriting the snapshot, so write cost follows the size of the change.
+    Loading replays the journal on top of the snapshot. Once the journal holds
+    ``checkpoint_every`` records it is folded into a fresh snapshot.
+
+    The first journal line records the snapshot it applies to: its size and
+    mtime, checked first because a stat is cheap, and a hash of its contents,
+    checked when those differ. A snapshot that was only touched or copied
+    without its timestamps still matches; one with other contents (e.g. a
+    crash after writing a checkpoint but before truncating the journal) makes
+    the journal stale, and it is ignored rather than replayed twice. The next
+    write replaces a stale journal instead of appending to it.
+
+    The header and every operation line also carry the StoreStats after it,
+    so stats() reads the current highest ID and counts from the end of the
+    journal without touching the snapshot.
+    """
+
+    name = 'journal'
+    appends = True
+    SUFFIX = '.journal'
+
+    def __init__(self, path: str, checkpoint_every: int = 1000):
+        super().__init__(path)
+        self.journal_path = path + self.SUFFIX
+        self.checkpoint_every = checkpoint_every
+        self._pending = 0
+
+    def files(self) -> List[str]:
+        return [self.path, self.journal_path]
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) or os.path.exists(self.journal_path)
+
+    def _fingerprint(self) -> Optional[List[int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        import hashlib
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _digest(self) -> Optional[str]:
+        """Hash of the snapshot's contents (None if there is none)."""
+        try:
+            with open(self.path, 'rb') as f:
+                return self._hash(f.read())
+        except OSError:
+            return None
+
+    def _applies(self, header: Any) -> bool:
+        """Whether a journal header belongs to the current snapshot."""
+        if not isinstance(header, dict):
+            return False
+        if header.get('base') == self._fingerprint():
+            return True
+        # Same contents with another mtime (touch, cp without -p); headers
+        # written before the hash was recorded only have the fingerprint
+        digest = header.get('digest')
+        return digest is not None and digest == self._digest()
+
+    def _header(self) -> Optional[Dict]:
+        """The journal's header, or None if the journal is missing, unreadable or stale."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        return header if self._applies(header) else None
+
+    def journal(self) -> List[Dict]:
+        ops: List[Dict] = []
+        self._pending = 0
+        if not os.path.exists(self.journal_path):
+            return ops
+        with open(self.journal_path, 'r') as f:
+            header = f.readline()
+            try:
+                header = json.loads(header) if header else None
+            except json.JSONDecodeError:
+                return ops
+            if not self._applies(header):
+                return ops
+            for line in f:
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append; stop here
+                    break
+        self._pending = len(ops)
+        return ops
+
+    def stats(self) -> Optional[StoreStats]:
+        """Return the aggregates stored on the last journal line, or None if unusable."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                if not self._applies(json.loads(f.readline())):
+                    return None
+                size = f.seek(0, os.SEEK_END)
+                # Lines are short; one block from the end holds the last one
+                tail = b''
+                start = size
+                while start > 0 and tail.count(b'\n') < 2:
+                    start = max(0, start - 4096)
+                    f.seek(start)
+                    tail = f.read(size - start)
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not tail.endswith(b'\n'):
+            # Torn final line: replay stops before it, so its stats do not apply
+            return None
+        try:
+            last = json.loads(tail.rstrip(b'\n').rsplit(b'\n', 1)[-1])
+        except ValueError:
+            return None
+        return StoreStats.from_list(last.get('stats')) if isinstance(last, dict) else None
+
+    def _reset_journal(self, stats: Optional[StoreStats] = None, digest: Optional[str] = None) -> None:
+        header: Dict[str, Any] = {'base': self._fingerprint(), 'digest': digest or self._digest()}
+        if stats is not None:
+            header['stats'] = stats.to_list()
+        write_atomic(self.journal_path, json.dumps(header) + '\n')
+        self._pending = 0
+
+    def save(self, todos: List[Dict]) -> None:
+        text = json.dumps(todos, indent=2, default=task_to_json)
+        write_atomic(self.path, text)
+        # json.dumps escapes non-ASCII, so these are the bytes written
+        self._reset_journal(StoreStats.of(todos), self._hash(text.encode()))
+
+    def record(self, op: Dict, todos: Optional[List[Dict]], stats: Optional[StoreStats] = None) -> None:
+        # Without the task list (a partially loaded app) the checkpoint waits
+        if self._pending + 1 >= self.checkpoint_every and todos is not None:
+            self.save(todos)
+            return
+        if os.path.exists(self.journal_path):
+            header = self._header()
+            if header is None:
+                # Left over from another snapshot: nothing would replay an
+                # append, so start over from the tasks as they are now
+                if todos is not None:
+                    self.save(todos)
+                    return
+                self._reset_journal()
+            elif header.get('base') != self._fingerprint():
+                # Matched by contents only; record the new mtime so later
+                # checks need no hash
+                with open(self.journal_path, 'r') as f:
+                    f.readline()
+                    rest = f.read()
+                header['base'] = self._fingerprint()
+                write_atomic(self.journal_path, json.dumps(header) + '\n' + rest)
+        else:
+            self._reset_journal()
+        if stats is not None:
+            op = dict(op, stats=stats.to_list())
+        with open(self.journal_path, 'a') as f:
+            f.write(json.dumps(op, separators=(',', ':')) + '\n')
+        self._pending += 1
+
+
+class BinaryStorage(JsonStorage):
+    """Compact binary snapshot that loads several times faster than indented JSON.
+
+    The file starts with MAGIC and a (format version, task count) header,
+    followed by one section per column rather than one record per task, so
+    each column is decoded by a few C-level calls:
+
+        ids          int64 per task
+        flags        one byte per task (FLAG_*)
+        title, description, created_at, completed_at, extra
+                     two sections each: an index, then the UTF-8 text of
+                     all the values. The index is a uint32 separator code
+                     point that occurs in no value, with the text being the
+                     values joined by it; or NO_SEPARATOR followed by a
+                     uint32 length in characters per value, with the text
+                     being the values concatenated.
+
+    All integers are little-endian and every section is prefixed with its
+    uint64 byte length. `extra` holds a task's keys beyond TASK_FIELDS as a
+    JSON object. A record the columns cannot represent exactly (missing
+    fields or unexpected types, e.g. a numeric `completed`) is stored whole
+    as JSON in `extra` with FLAG_RAW, so any task list round-trips losslessly.
+    The format is detected from the file's contents, whatever its name.
+    """
+
+    name = 'binary'
+    MAGIC = b'TASKBIN\x00'
+    VERSION = 1
+    FLAG_COMPLETED = 1
+    FLAG_CREATED = 2
+    FLAG_COMPLETED_AT = 4
+    FLAG_EXTRA = 8
+    FLAG_RAW = 16
+    SEPARATORS = ('\x00', '\x1f', '\x1e', '\ufdd0')
+    NO_SEPARATOR = 0xFFFFFFFF
+    _HEADER = struct.Struct('<HQ')
+    _SECTION = struct.Struct('<Q')
+    _UINT32 = struct.Struct('<I')
+
+    @classmethod
+    def sniff(cls, path: str) -> bool:
+        """Return True if path holds a binary snapshot."""
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def _little_endian(values: array) -> array:
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    @classmethod
+    def _array(cls, typecode: str, data: memoryview) -> array:
+        values = array(typecode)
+        values.frombytes(data)
+        return cls._little_endian(values)
+
+    def _record_columns(self, todo: Dict) -> tuple:
+        """Return (id, flags, title, description, created_at, completed_at, extra) for one task."""
+        if isinstance(todo, Task):
+            values = (todo.id, todo.title, todo.description, todo.completed,
+                      todo.created_at, todo.completed_at, todo.extra)
+        elif _TASK_FIELD_SET <= todo.keys():
+            extra = {k: v for k, v in todo.items() if k not in _TASK_FIELD_SET}
+            values = tuple(todo[k] for k in TASK_FIELDS) + (extra,)
+        else:
+            values = None
+        if values is not None:
+            todo_id, title, description, completed, created_at, completed_at, extra = values
+            if (type(todo_id) is int and -(1 << 63) <= todo_id < (1 << 63)
+                    and type(title) is str and type(description) is str and type(completed) is bool
+                    and (created_at is None or type(created_at) is str)
+                    and (completed_at is None or type(completed_at) is str)):
+                flags = ((self.FLAG_COMPLETED if completed else 0)
+                         | (self.FLAG_CREATED if created_at is not None else 0)
+                         | (self.FLAG_COMPLETED_AT if completed_at is not None else 0)
+                         | (self.FLAG_EXTRA if extra else 0))
+                return (todo_id, flags, title, description, created_at or '', completed_at or '',
+                        json.dumps(extra) if extra else '')
+        record = todo.to_dict() if isinstance(todo, Task) else todo
+        return (0, self.FLAG_RAW, '', '', '', '', json.dumps(record))
+
+    def _columns(self, todos: List[Dict]) -> tuple:
+        """Split todos into (ids, flags, text columns)."""
+        if all(type(t) is Task for t in todos):
+            # Column at a time; any value the fast path cannot take sends
+            # the whole list through _record_columns
+            ids = [t.id for t in todos]
+            texts = [[t.title for t in todos], [t.description for t in todos]]
+            created = [t.created_at for t in todos]
+            completed_at = [t.completed_at for t in todos]
+            completed = [t.completed for t in todos]
+            if (set(map(type, ids)) <= {int}
+                    and set(map(type, texts[0])) | set(map(type, texts[1])) <= {str}
+                    and set(map(type, created)) | set(map(type, completed_at)) <= {str, type(None)}
+                    and set(map(type, completed)) <= {bool}):
+                try:
+                    id_array = array('q', ids)
+                except OverflowError:
+                    pass
+                else:
+                    extras = [json.dumps(t.extra) if t.extra else '' for t in todos]
+                    flags = bytes([
+                        (self.FLAG_COMPLETED if c else 0) | (self.FLAG_CREATED if a is not None else 0)
+                        | (self.FLAG_COMPLETED_AT if d is not None else 0) | (self.FLAG_EXTRA if e else 0)
+                        for c, a, d, e in zip(completed, created, completed_at, extras)
+                    ])
+                    texts.append([a or '' for a in created])
+                    texts.append([d or '' for d in completed_at])
+                    texts.append(extras)
+                    return id_array, flags, texts
+        rows = [self._record_columns(t) for t in todos]
+        columns = list(zip(*rows)) or [()] * 7
+        return array('q', columns[0]), bytes(columns[1]), [list(c) for c in columns[2:]]
+
+    def _encode_text(self, values: List[str]) -> List[bytes]:
+        """Return the index and text sections for one text column."""
+        for sep in self.SEPARATORS:
+            text = sep.join(values)
+            if text.count(sep) == max(len(values) - 1, 0):
+                return [self._UINT32.pack(ord(sep)), text.encode('utf-8', 'surrogatepass')]
+        lengths = self._little_endian(array('I', map(len, values)))
+        return [self._UINT32.pack(self.NO_SEPARATOR) + lengths.tobytes(),
+                ''.join(values).encode('utf-8', 'surrogatepass')]
+
+    def save(self, todos: List[Dict]) -> None:
+        ids, flags, texts = self._columns(todos)
+        sections = [self._little_endian(ids).tobytes(), flags]
+        for column in texts:
+            sections.extend(self._encode_text(column))
+        parts = [self.MAGIC, self._HEADER.pack(self.VERSION, len(ids))]
+        for section in sections:
+            parts.append(self._SECTION.pack(len(section)))
+            parts.append(section)
+        write_atomic(self.path, b''.join(parts), 'wb')
+
+    def _decode(self, data: bytes) -> Iterator[Task]:
+        """Decode a snapshot's columns and return an iterator building its tasks."""
+        try:
+            ids, flags, texts = self._decode_columns(data)
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"{self.path} is corrupt: {e}") from None
+        return self._build_tasks(ids, flags, texts)
+
+    def _decode_columns(self, data: bytes) -> tuple:
+        view = memoryview(data)
+        if bytes(view[:len(self.MAGIC)]) != self.MAGIC:
+            raise ValueError(f"{self.path} is not a binary task snapshot")
+        version, count = self._HEADER.unpack_from(view, len(self.MAGIC))
+        if version != self.VERSION:
+            raise ValueError(f"{self.path} uses binary format version {version}; this version of task reads {self.VERSION}")
+        pos = len(self.MAGIC) + self._HEADER.size
+
+        def section() -> memoryview:
+            nonlocal pos
+            (size,) = self._SECTION.unpack_from(view, pos)
+            start = pos + self._SECTION.size
+            pos = start + size
+            if pos > len(view):
+                raise ValueError(f"{self.path} is truncated")
+            return view[start:pos]
+
+        ids = self._array('q', section())
+        flags = section()
+        texts = []
+        for _ in range(5):
+            index = section()
+            (sep,) = self._UINT32.unpack_from(index)
+            text = str(section(), 'utf-8', 'surrogatepass')
+            if sep != self.NO_SEPARATOR:
+                texts.append(text.split(chr(sep)) if count else [])
+                continue
+            ends = list(accumulate(self._array('I', index[self._UINT32.size:])))
+            if ends and ends[-1] != len(text):
+                raise ValueError(f"{self.path} is corrupt: text lengths do not match")
+            texts.append([text[start:end] for start, end in zip([0] + ends, ends)])
+        if not len(ids) == len(flags) == count or any(len(column) != count for column in texts):
+            raise ValueError(f"{self.path} is corrupt: column lengths do not match the header")
+        return ids, flags, texts
+
+    def _build_tasks(self, ids: array, flags: memoryview, texts: List[List[str]]) -> Iterator[Task]:
+        new = object.__new__
+        # Locals: this loop runs once per task
+        raw, done, created, done_at, has_extra = (
+            self.FLAG_RAW, self.FLAG_COMPLETED, self.FLAG_CREATED, self.FLAG_COMPLETED_AT, self.FLAG_EXTRA)
+        for todo_id, flag, title, description, created_at, completed_at, extra in zip(ids, flags, *texts):
+            if flag & raw:
+                yield Task.from_dict(json.loads(extra))
+                continue
+            task = new(Task)
+            task.id = todo_id
+            task.title = title
+            task.description = description
+            task.completed = flag & done == done
+            task.created_at = created_at if flag & created else None
+            task.completed_at = completed_at if flag & done_at else None
+            task.extra = json.loads(extra) if flag & has_extra else None
+            task.ts = None
+            yield task
+
+    def _read(self) -> Iterator[Task]:
+        if not os.path.exists(self.path):
+            return iter(())
+        with open(self.path, 'rb') as f:
+            return self._decode(f.read())
+
+    def load(self) -> List[Dict]:
+        return list(self._read())
+
+    def iter_tasks(self) -> Iterator[Dict]:
+        # The columns are decoded up front; tasks are built as they are consumed
+        return self._read()
+
+
+class SqliteStorage(JsonStorage):
+    """SQLite database storage with indexed queries.
+
+    Tasks live in one table keyed by rowid so the display-oriented `id`
+    column can be renumbered in place. Indexes on (completed, id) and
+    (completed, created_ts) let list, lookup-by-display-ID and reindexing
+    touch only the rows they need; the app never has to load the whole
+    store. Fields beyond TASK_FIELDS are kept as JSON in `extra`.
+
+    Search uses `tasks_fts`, an FTS5 trigram index over the lowercased title
+    and description keyed by rowid, when the SQLite build provides FTS5; it
+    is written alongside every row change and candidates are re-checked with
+    task_matches, so results match a full scan exactly.
+    """
+
+    name = 'sqlite'
+    queryable = True
+    EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            rowid INTEGER PRIMARY KEY,
+            id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            completed INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT,
+            created_ts REAL NOT NULL,
+            completed_at TEXT,
+            extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (completed, created_ts);
+        CREATE INDEX IF NOT EXISTS idx_tasks_id ON tasks (id);
+        -- One row of task counts, kept current by triggers (COUNT(*) scans)
+        CREATE TABLE IF NOT EXISTS task_counts (
+            total INTEGER NOT NULL,
+            completed INTEGER NOT NULL
+        );
+        INSERT INTO task_counts
+            SELECT COUNT(*), COALESCE(SUM(completed), 0) FROM tasks
+            WHERE NOT EXISTS (SELECT 1 FROM task_counts);
+        CREATE TRIGGER IF NOT EXISTS tasks_count_insert AFTER INSERT ON tasks BEGIN
+            UPDATE task_counts SET total = total + 1, completed = completed + NEW.completed;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_count_delete AFTER DELETE ON tasks BEGIN
+            UPDATE task_counts SET total = total - 1, completed = completed - OLD.completed;
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_count_complete AFTER UPDATE OF completed ON tasks BEGIN
+            UPDATE task_counts SET completed = completed + NEW.completed - OLD.completed;
+        END;
+    """
+    COLUMNS = 'id, title, description, completed, created_at, completed_at, extra'
+    # Text is lowercased with Python's str.lower before indexing, so the
+    # tokenizer itself stays case-sensitive
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+        USING fts5(title, description, tokenize = 'trigram case_sensitive 1')
+    """
+    # PRAGMA user_version: 0 for a new database, 1 for one from before the
+    # schema was versioned (tasks_fts filled, task_counts maybe missing),
+    # SCHEMA_VERSION once SCHEMA is in place but FTS5 was not available, and
+    # FTS_VERSION once tasks_fts has been filled from existing rows too. A
+    # database at FTS_VERSION is opened without writing anything, so a
+    # reader does not change version() for other processes.
+    SCHEMA_VERSION = 2
+    FTS_VERSION = 3
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self.fts = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            import sqlite3
+            self._conn = sqlite3.connect(self.path)
+            # Python's str.lower, so search matches the in-memory semantics exactly
+            self._conn.create_function(
+                'task_matches', 3,
+                lambda title, desc, q: q in title.lower() or q in (desc or '').lower(),
+                deterministic=True,
+            )
+            self._conn.create_function('py_lower', 1, lambda text: (text or '').lower(), deterministic=True)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.FTS_VERSION:
+                self.fts = True
+            else:
+                self._migrate(version)
+        return self._conn
+
+    def _migrate(self, version: int) -> None:
+        """Bring a database below FTS_VERSION up to date, creating the trigram index if FTS5 is available."""
+        import sqlite3
+        conn = self._conn
+        if version < self.SCHEMA_VERSION:
+            conn.executescript(self.SCHEMA)
+        try:
+            conn.execute(self.FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            # No FTS5 in this SQLite build: search scans instead. Failing
+            # to create the table writes nothing, so later opens stay read-only
+            if version < self.SCHEMA_VERSION:
+                with conn:
+                    conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            return
+        self.fts = True
+        with conn:
+            if version != 1:
+                # Version 1 databases already filled tasks_fts
+                conn.execute("DELETE FROM tasks_fts")
+                self._index_rows()
+            conn.execute(f"PRAGMA user_version = {self.FTS_VERSION}")
+
+    def _index_rows(self, where: str = '', params: tuple = ()) -> None:
+        """Add the matching task rows to tasks_fts."""
+        self.conn.execute(
+            "INSERT INTO tasks_fts (rowid, title, description)"
+            f" SELECT rowid, py_lower(title), py_lower(description) FROM tasks {where}",
+            params,
+        )
+
+    def _unindex_rows(self, where: str = '', params: tuple = ()) -> None:
+        """Remove the matching task rows from tasks_fts; call before deleting them."""
+        if self.fts:
+            self.conn.execute(f"DELETE FROM tasks_fts WHERE rowid IN (SELECT rowid FROM tasks {where})", params)
+
+    @staticmethod
+    def _to_row(todo: Dict) -> tuple:
+        extra = {k: v for k, v in todo.items() if k not in TASK_FIELDS}
+        return (
+            todo.get('id', 0), todo.get('title', ''), todo.get('description', ''),
+            1 if todo.get('completed') else 0, todo.get('created_at'),
+            parse_timestamp(todo.get('created_at')), todo.get('completed_at'),
+            json.dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def _to_todo(row: tuple) -> Dict:
+        todo = {
+            'id': row[0], 'title': row[1], 'description': row[2],
+            'completed': bool(row[3]), 'created_at': row[4], 'completed_at': row[5],
+        }
+        if row[6]:
+            todo.update(json.loads(row[6]))
+        return todo
+
+    def _select(self, where: str = '', params: tuple = (), tail: str = '') -> List[Dict]:
+        sql = f"SELECT {self.COLUMNS} FROM tasks {where} ORDER BY id {tail}"
+        return [self._to_todo(row) for row in self.conn.execute(sql, params)]
+
+    def load(self) -> List[Dict]:
+        return self._select()
+
+    def version(self) -> Any:
+        # Changes only when another connection commits; SQLite itself keeps
+        # each write atomic
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def iter_tasks(self) -> Iterator[Dict]:
+        sql = f"SELECT {self.COLUMNS} FROM tasks ORDER BY id"
+        for row in self.conn.execute(sql):
+            yield self._to_todo(row)
+
+    def save(self, todos: List[Dict]) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.executemany(
+                "INSERT INTO tasks (id, title, description, completed, created_at, created_ts, completed_at, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._to_row(t) for t in todos),
+            )
+            if self.fts:
+                self.conn.execute("DELETE FROM tasks_fts")
+                self._index_rows()
+
+    def _renumber(self) -> None:
+        """SQL equivalent of TodoApp._reorder; only rewrites rows whose id changes."""
+        self.conn.execute("""
+            UPDATE tasks SET id = ordered.rn
+            FROM (SELECT rowid AS rid,
+                         ROW_NUMBER() OVER (ORDER BY completed, created_ts, id) AS rn
+                  FROM tasks) AS ordered
+            WHERE tasks.rowid = ordered.rid AND tasks.id != ordered.rn
+        """)
+
+    def _execute(self, op: Dict) -> None:
+        """Apply one operation's row changes, without renumbering."""
+        kind = op['op']
+        if kind == 'add':
+            cursor = self.conn.execute(
+                "INSERT INTO tasks (id, title, description, completed, created_at, created_ts, completed_at, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._to_row(op['task']),
+            )
+            if self.fts:
+                self._index_rows("WHERE rowid = ?", (cursor.lastrowid,))
+        elif kind == 'complete':
+            self.conn.executemany(
+                "UPDATE tasks SET completed = 1, completed_at = ? WHERE id = ?",
+                ((op['completed_at'], i) for i in op['ids']),
+            )
+        elif kind == 'delete':
+            for i in op['ids']:
+                self._unindex_rows("WHERE id = ?", (i,))
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", ((i,) for i in op['ids']))
+        elif kind == 'clean':
+            self._unindex_rows("WHERE completed = 1")
+            self.conn.execute("DELETE FROM tasks WHERE completed = 1")
+        elif kind == 'clear':
+            if self.fts:
+                self.conn.execute("DELETE FROM tasks_fts")
+            self.conn.execute("DELETE FROM tasks")
+        elif kind == 'summary':
+            # Found by identity, like TodoApp._summary_targets; id is only a hint
+            match = "WHERE created_at IS ? AND title = ? AND description = ?"
+            identity = tuple(op['identity'])
+            rows = (self.conn.execute(f"SELECT rowid, extra FROM tasks {match} AND id = ?",
+                                      identity + (op.get('id', 0),)).fetchall()
+                    or self.conn.execute(f"SELECT rowid, extra FROM tasks {match}", identity).fetchall())
+            for rowid, extra in rows:
+                extra = json.loads(extra) if extra else {}
+                extra.update(summary=op['summary'], summary_of=op['summary_of'])
+                self.conn.execute("UPDATE tasks SET extra = ? WHERE rowid = ?", (json.dumps(extra), rowid))
+        elif kind == 'batch':
+            for sub in op['ops']:
+                self._execute(sub)
+        elif kind != 'reindex':
+            raise ValueError(f"Unknown operation: {kind}")
+
+    def record(self, op: Dict, todos: Optional[List[Dict]], stats: Optional[StoreStats] = None) -> None:
+        """Apply the operation directly in the database; `todos` and `stats` are not needed."""
+        ops = op['ops'] if op['op'] == 'batch' else [op]
+        # One transaction, renumbering at most once
+        with self.conn:
+            self._execute(op)
+            if any(sub['op'] in REORDERING_OPS for sub in ops):
+                self._renumber()
+
+    # Query interface used by TodoApp when the tasks are not loaded
+
+    def select(self, completed: Optional[bool] = None) -> List[Dict]:
+        """Return tasks ordered by id, optionally filtered by completion."""
+        if completed is None:
+            return self._select()
+        return self._select("WHERE completed = ?", (int(completed),))
+
+    def select_at(self, position: int, completed: Optional[bool] = None) -> Optional[Dict]:
+        """Return the task at 1-based `position` of select(completed)."""
+        if position < 1:
+            return None
+        where, params = ("WHERE completed = ?", (int(completed),)) if completed is not None else ('', ())
+        rows = self._select(where, params + (position - 1,), "LIMIT 1 OFFSET ?")
+        return rows[0] if rows else None
+
+    def select_positions(self, positions: List[int], completed: Optional[bool] = None) -> Dict[int, Dict]:
+        """Return {position: task} for 1-based positions of select(completed), in one query."""
+        wanted = sorted({p for p in positions if p >= 1})
+        if not wanted:
+            return {}
+        where, params = ("WHERE completed = ?", (int(completed),)) if completed is not None else ('', ())
+        sql = (
+            f"SELECT rn, {self.COLUMNS} FROM ("
+            f"SELECT ROW_NUMBER() OVER (ORDER BY id) AS rn, {self.COLUMNS} FROM tasks {where}"
+            f") WHERE rn IN ({', '.join('?' * len(wanted))})"
+        )
+        return {row[0]: self._to_todo(row[1:]) for row in self.conn.execute(sql, params + tuple(wanted))}
+
+    def search(self, query: str) -> List[Dict]:
+        """Return tasks whose title or description contains query (case-insensitive)."""
+        query_lower = query.lower()
+        if self.fts and len(query_lower) >= 3:
+            # Quoted as an FTS5 string: the trigrams of the whole query, in order
+            phrase = '"' + query_lower.replace('"', '""') + '"'
+            return self._select(
+                "WHERE rowid IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)"
+                " AND task_matches(title, description, ?)",
+                (phrase, query_lower),
+            )
+        return self._select("WHERE task_matches(title, description, ?)", (query_lower,))
+
+    def counts(self) -> Tuple[int, int]:
+        """Return (total, completed) task counts."""
+        total, completed = self.conn.execute("SELECT total, completed FROM task_counts").fetchone()
+        return total, completed
+
+    def max_id(self) -> int:
+        # The last entry of idx_tasks_id; no scan
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+
+
+class StreamedTasks:
+    """Read-only query interface over a JSON store that is read incrementally.
+
+    One streaming pass at construction keeps only the tasks in scope (the
+    incomplete ones, or none) together with the counts and highest ID. Other
+    queries stream the file again, so memory is bounded by what the command
+    needs rather than by the size of the store. Provides the same query
+    methods as SqliteStorage.
+    """
+
+    def __init__(self, storage: JsonStorage, keep_incomplete: bool):
+        self.storage = storage
+        # Kept tasks are stored column-wise; _sorted tracks whether they
+        # arrived in id order and can be served without sorting
+        self._incomplete: Optional[TaskColumns] = TaskColumns() if keep_incomplete else None
+        self._sorted = True
+        self._total = self._completed = self._max_id = 0
+        for todo in storage.iter_tasks():
+            self._total += 1
+            if todo.get('completed'):
+                self._completed += 1
+            elif self._incomplete is not None:
+                self._keep(todo)
+            if todo.get('id', 0) > self._max_id:
+                self._max_id = todo['id']
+
+    def _keep(self, todo: Dict) -> None:
+        ids = self._incomplete.ids
+        if ids and ids[-1] > todo.get('id', 0):
+            self._sorted = False
+        self._incomplete.append(todo)
+
+    def select(self, completed: Optional[bool] = None) -> Sequence:
+        if completed is False and self._incomplete is not None:
+            if self._sorted:
+                return self._incomplete
+            todos = self._incomplete
+        else:
+            todos = [
+                t for t in self.storage.iter_tasks()
+                if completed is None or bool(t.get('completed')) == completed
+            ]
+        return sorted(todos, key=lambda t: t['id'])
+
+    def select_at(self, position: int, completed: Optional[bool] = None) -> Optional[Dict]:
+        return self.select_positions([position], completed).get(position)
+
+    def select_positions(self, positions: List[int], completed: Optional[bool] = None) -> Dict[int, Dict]:
+        todos = self.select(completed)
+        return {p: todos[p - 1] for p in positions if 1 <= p <= len(todos)}
+
+    def search(self, query: str) -> List[Dict]:
+        query_lower = query.lower()
+        return [
+            t for t in self.storage.iter_tasks()
+            if query_lower in t['title'].lower() or query_lower in t['description'].lower()
+        ]
+
+    def counts(self) -> Tuple[int, int]:
+        return self._total, self._completed
+
+    def note_added(self, todo: Dict) -> None:
+        """Account for a task appended to the store since it was read."""
+        self._total += 1
+        if todo.get('completed'):
+            self._completed += 1
+        elif self._incomplete is not None:
+            self._keep(todo)
+        self._max_id = max(self._max_id, todo.get('id', 0))
+
+    def max_id(self) -> int:
+        return self._max_id
+
+
+# How much of the store a command needs (see TodoApp):
+#   all         every task
+#   incomplete  incomplete tasks plus counts
+#   none        only counts and the highest ID; other queries stream the file
+#   append      like none, for commands that add tasks, if the storage can
+#               append without the task list
+#   stream      nothing; the command reads the store once itself with
+#               iter_tasks (see TodoApp.export_tasks)
+LOAD_SCOPES = ('all', 'incomplete', 'none', 'append', 'stream')
+
+
+# `task serve` (see serve and forward_to_daemon): socket name suffix, longest
+# socket path used next to the data file, listen backlog and client connect timeout
+DAEMON_SUFFIX = '.sock'
+DAEMON_PATH_MAX = 100
+DAEMON_BACKLOG = 64
+DAEMON_CONNECT_TIMEOUT = 1.0
+# Seconds a connected client has to send its request before the daemon
+# drops it and serves the next one
+DAEMON_REQUEST_TIMEOUT = 2.0
+
+
+STORAGE_BACKENDS = {
+    JsonStorage.name: JsonStorage,
+    JournalStorage.name: JournalStorage,
+    BinaryStorage.name: BinaryStorage,
+    SqliteStorage.name: SqliteStorage,
+}
+
+
+def convert_format(path: str) -> str:
+    """Default storage format for `task convert` to write to path, from its extension."""
+    lowered = path.lower()
+    if lowered.endswith(SqliteStorage.EXTENSIONS):
+        return SqliteStorage.name
+    if lowered.endswith('.json'):
+        return JsonStorage.name
+    return BinaryStorage.name
+
+
+# `task export` (see TodoApp.export_tasks): formats, CSV columns, and the
+# `completed` value each --status selects
+EXPORT_FORMATS = ('jsonl', 'ndjson', 'csv')
+EXPORT_COLUMNS = ('id', 'title', 'description', 'completed', 'created_at', 'completed_at')
+EXPORT_STATUSES = {'all': None, 'incomplete': False, 'completed': True}
+
+
+# `task import` (see read_import_rows and TodoApp.import_tasks): formats by
+# file extension, accepted spellings of `completed`, and errors listed in full
+IMPORT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+IMPORT_TRUE = frozenset({'true', 'yes', 'y', '1'})
+IMPORT_FALSE = frozenset({'false', 'no', 'n', '0', ''})
+IMPORT_MAX_ERRORS = 20
+
+
+def read_import_rows(f: TextIO, fmt: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, row) for each record of a CSV or JSON Lines stream.
+
+    CSV needs a header row; its rows are yielded as dicts keyed by the
+    lowercased column names. JSON Lines yields each line's value, or the
+    parse error message (a str) for a line that is not valid JSON. Without
+    `fmt` the format is guessed from the first line: JSON objects start
+    with '{'. Blank lines are skipped.
+    """
+    first = f.readline()
+    skipped = 0
+    while first and not first.strip():
+        first = f.readline()
+        skipped += 1
+    if not first:
+        return
+    if fmt is None:
+        fmt = 'jsonl' if first.lstrip().startswith('{') else 'csv'
+    lines = chain([first], f)
+    if fmt == 'jsonl':
+        for number, line in enumerate(lines, skipped + 1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    yield number, f"invalid JSON ({e})"
+        return
+    import csv
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader)]
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            # line_num counts physical lines, so quoted newlines stay accurate
+            yield skipped + reader.line_num, dict(zip(header, row))
+
+
+def _import_time(row: Dict, key: str) -> Optional[str]:
+    """Validate an optional ISO timestamp field of an imported row."""
+    value = row.get(key)
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be an ISO timestamp")
+    try:
+        datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"{key} is not an ISO timestamp: {value!r}") from None
+    return value.strip()
+
+
+def import_record(row: Any, now: str) -> Dict:
+    """Validate one imported row and return it as a task record without an id.
+
+    Only the task fields are read; `id` and other columns are ignored.
+    Defaults follow add_todo: no description, incomplete, created `now`.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(row if isinstance(row, str) else "expected an object with a title")
+    title = row.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("missing title")
+    description = row.get('description')
+    if description is None:
+        description = ''
+    elif not isinstance(description, str):
+        raise ValueError("description must be text")
+    completed = row.get('completed', False)
+    if isinstance(completed, str):
+        flag = completed.strip().lower()
+        if flag not in IMPORT_TRUE and flag not in IMPORT_FALSE:
+            raise ValueError(f"completed must be true or false, not {completed!r}")
+        completed = flag in IMPORT_TRUE
+    elif completed is None:
+        completed = False
+    elif not isinstance(completed, bool):
+        raise ValueError("completed must be true or false")
+    created_at = _import_time(row, 'created_at') or now
+    completed_at = _import_time(row, 'completed_at')
+    return {
+        'title': title.strip(),
+        'description': description.strip(),
+        'completed': completed,
+        'created_at': created_at,
+        'completed_at': (completed_at or now) if completed else None,
+    }
+
+
+def detect_storage(path: str) -> str:
+    """Return the storage backend name already in use for path."""
+    if path.lower().endswith(SqliteStorage.EXTENSIONS):
+        return SqliteStorage.name
+    if BinaryStorage.sniff(path):
+        return BinaryStorage.name
+    if os.path.exists(path + JournalStorage.SUFFIX):
+        return JournalStorage.name
+    return JsonStorage.name
+
+
+def open_storage(path: str, kind: Optional[str] = None) -> JsonStorage:
+    """Create the storage backend `kind` (or the detected one) for path."""
+    kind = kind or detect_storage(path)
+    if kind not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {kind}")
+    # A database and a JSON file cannot share a path; the extension decides
+    if (kind == SqliteStorage.name) != (detect_storage(path) == SqliteStorage.name):
+        raise ValueError(f"{kind} storage cannot use {path}; SQLite files end in {', '.join(SqliteStorage.EXTENSIONS)}")
+    return STORAGE_BACKENDS[kind](path)
+
+
+# Table written by list and search (see render_table); rows are buffered and
+# written RENDER_CHUNK at a time
+TABLE_HEADER = f"{'ID':<5} {'Status':<12} {'Title':<40} {'Description':<30}\n" + "-" * 90 + "\n"
+RENDER_CHUNK = 1024
+# Used by --pager when $PAGER is not set; -F exits if the output fits on screen
+DEFAULT_PAGER = 'less -FRX'
+
+
+def render_table(rows: Iterable[Tuple[int, Dict]], out: TextIO) -> int:
+    """Write (shown ID, task) rows as the list/search table to out.
+
+    Only the rows given are formatted, so callers pass just the page they
+    want. Lines are joined and written in chunks instead of one print() per
+    row. Returns the number of rows written.
+    """
+    with phase('render'):
+        out.write(TABLE_HEADER)
+        written = 0
+        chunk: List[str] = []
+        add = chunk.append
+        for shown_id, todo in rows:
+            # Task attributes are read directly, skipping the mapping interface;
+            # titles are cut to 40 characters and descriptions to 30
+            if type(todo) is Task:
+                title, desc, completed = todo.title, todo.description, todo.completed
+            else:
+                title, desc, completed = todo['title'], todo['description'], todo['completed']
+            if len(desc) > 30 and todo.get('summary'):
+                # A long description is shown as its summary, if that is current
+                desc = task_summary(todo) or desc
+            add(f"{shown_id:<5} {'✓ Completed ' if completed else '○ Incomplete'} "
+                f"{title if len(title) <= 40 else title[:37] + '...':<40} "
+                f"{desc if len(desc) <= 30 else desc[:27] + '...':<30}\n")
+            if len(chunk) == RENDER_CHUNK:
+                out.write(''.join(chunk))
+                written += RENDER_CHUNK
+                chunk.clear()
+        out.write(''.join(chunk))
+        return written + len(chunk)
+
+
+def page_bounds(total: int, limit: Optional[int], offset: int) -> Tuple[int, int]:
+    """Return the [start, stop) slice of `total` rows that --limit/--offset select."""
+    start = min(max(offset, 0), total)
+    stop = total if limit is None else min(total, start + max(limit, 0))
+    return start, stop
+
+
+def render_page_note(total: int, start: int, stop: int, out: TextIO) -> None:
+    """Say which rows a partial page showed, and how to get the next one."""
+    if start == 0 and stop == total:
+        return
+    if start == stop:
+        out.write(f"\nNo rows at offset {start} ({total} in total)\n")
+    elif stop < total:
+        out.write(f"\nShowing {start + 1}-{stop} of {total}. Use --offset {stop} for more.\n")
+    else:
+        out.write(f"\nShowing {start + 1}-{stop} of {total}.\n")
+
+
+@contextmanager
+def paged_output(enabled: bool = True):
+    """Yield the stream list and search write to: a pager's input, or stdout.
+
+    The pager ($PAGER, else DEFAULT_PAGER) is only used when enabled and
+    stdout is a terminal, so piped output is unchanged. Quitting the pager
+    early stops the writer instead of raising.
+    """
+    if not enabled or not sys.stdout.isatty():
+        yield sys.stdout
+        return
+    import shlex
+    import subprocess
+    try:
+        pager = subprocess.Popen(shlex.split(os.environ.get('PAGER') or DEFAULT_PAGER),
+                                 stdin=subprocess.PIPE, text=True, encoding='utf-8')
+    except (OSError, ValueError):
+        yield sys.stdout
+        return
+    try:
+        yield pager.stdin
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        pager.wait()
+
+
+# Environment variable that turns profiling on, e.g. for the REPL (see main):
+# '1' prints a summary of each command, any other path gets a JSON trace
+PROFILE_ENV = 'TASKS3_PROFILE'
+# Subscribers called with every finished phase (see phase), and the phases
+# open right now, innermost last: [start time, traced bytes, peak bytes]
+_PROFILE_HOOKS: List = []
+_OPEN_PHASES: List[list] = []
+
+
+def add_profile_hook(hook) -> None:
+    """Call hook(event) whenever a phase (load, reindex, save, ...) ends.
+
+    The event is a dict with the phase `name`, its `start` (perf_counter
+    seconds) and `duration`, its nesting `depth`, and `alloc` and `peak`:
+    bytes allocated in the phase and net of what was freed, and the highest
+    extra memory in use during it. Both are None unless tracemalloc is
+    tracing. Any keyword arguments the phase was given are included too.
+    """
+    _PROFILE_HOOKS.append(hook)
+
+
+def remove_profile_hook(hook) -> None:
+    """Stop calling a hook added with add_profile_hook."""
+    _PROFILE_HOOKS.remove(hook)
+
+
+@contextmanager
+def phase(name: str, **meta):
+    """Time the enclosed block as one phase and pass it to the profile hooks.
+
+    Phases nest; a phase's allocations include those of the phases inside
+    it. With no hooks registered this only costs the `with` statement.
+    """
+    if not _PROFILE_HOOKS:
+        yield
+        return
+    # Only consulted if someone already imported it; otherwise nothing traces
+    tracemalloc = sys.modules.get('tracemalloc')
+    tracing = tracemalloc is not None and tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if _OPEN_PHASES:
+            # The peak is reset for this phase, so hand the outer one its own first
+            _OPEN_PHASES[-1][2] = max(_OPEN_PHASES[-1][2], peak)
+        tracemalloc.reset_peak()
+        frame = [perf_counter(), current, current]
+    else:
+        frame = [perf_counter(), None, None]
+    _OPEN_PHASES.append(frame)
+    try:
+        yield
+    finally:
+        end = perf_counter()
+        _OPEN_PHASES.pop()
+        alloc = peak = None
+        if tracing:
+            current, top = tracemalloc.get_traced_memory()
+            top = max(frame[2], top)
+            alloc, peak = current - frame[1], top - frame[1]
+            if _OPEN_PHASES:
+                _OPEN_PHASES[-1][2] = max(_OPEN_PHASES[-1][2], top)
+        event = {'name': name, 'start': frame[0], 'duration': end - frame[0],
+                 'depth': len(_OPEN_PHASES), 'alloc': alloc, 'peak': peak, **meta}
+        for hook in list(_PROFILE_HOOKS):
+            hook(event)
+
+
+class Profiler:
+    """Collect the phases of a command (see phase) and report them.
+
+    Used as a context manager: on entry it subscribes to the profile hooks
+    and starts tracemalloc, on exit it stops both and either writes the
+    events to `trace_path` as a Chrome trace (open it in chrome://tracing
+    or Perfetto) or prints a summary table to stderr. Tracing allocations
+    slows Python code down, so compare phases with each other rather than
+    with unprofiled runs.
+    """
+
+    def __init__(self, trace_path: Optional[str] = None):
+        self.trace_path = trace_path
+        self.events: List[Dict] = []
+        self._reported = 0
+        self._started_tracing = False
+
+    def __call__(self, event: Dict) -> None:
+        self.events.append(event)
+
+    def __enter__(self) -> 'Profiler':
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        add_profile_hook(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_profile_hook(self)
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+        if self.trace_path:
+            self.write_trace(self.trace_path)
+        else:
+            self.report()
+
+    def record(self, name: str, start: float, end: float, **meta) -> None:
+        """Add a phase measured elsewhere, such as module loading before profiling began."""
+        self(dict({'name': name, 'start': start, 'duration': end - start, 'depth': 0,
+                   'alloc': None, 'peak': None}, **meta))
+
+    def report(self, title: Optional[str] = None, out: Optional[TextIO] = None) -> None:
+        """Print the phases recorded since the last report as a table, in start order."""
+        out = out or sys.stderr
+        events = sorted(self.events[self._reported:], key=lambda e: (e['start'], e['depth']))
+        self._reported = len(self.events)
+        if not events:
+            return
+
+        def kib(size: Optional[int]) -> str:
+            return '-' if size is None else f"{size / 1024:.1f}"
+        lines = [f"\nProfile{f' ({title})' if title else ''}:\n",
+                 f"{'phase':<24} {'time (ms)':>10} {'alloc (KiB)':>12} {'peak (KiB)':>11}\n"]
+        for e in events:
+            label = '  ' * e['depth'] + e['name']
+            lines.append(f"{label:<24} {e['duration'] * 1000:>10.2f} {kib(e['alloc']):>12} {kib(e['peak']):>11}\n")
+        total = sum(e['duration'] for e in events if e['depth'] == 0)
+        lines.append(f"{'total':<24} {total * 1000:>10.2f}\n")
+        out.write(''.join(lines))
+        out.flush()
+
+    def write_trace(self, path: str) -> None:
+        """Write every recorded phase to path in the Chrome trace event format."""
+        origin = min((e['start'] for e in self.events), default=0.0)
+        trace = [{
+            'name': e['name'], 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+            'ts': round((e['start'] - origin) * 1e6, 3), 'dur': round(e['duration'] * 1e6, 3),
+            'args': {k: v for k, v in e.items() if k not in ('name', 'start', 'duration', 'depth')},
+        } for e in sorted(self.events, key=lambda e: (e['start'], e['depth']))]
+        try:
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f, indent=1)
+        except OSError as e:
+            print(f"Error: could not write profile trace {path}: {e}", file=sys.stderr)
+            return
+        print(f"Profile trace written to {path}", file=sys.stderr)
+
+
+# Environment variable naming the summarizer to use when --summarizer is not
+# given (see SUMMARIZERS); empty or '0' turns summaries off
+SUMMARIZER_ENV = 'TASKS3_SUMMARIZER'
+# Only descriptions the table would cut are summarized (see render_table)
+SUMMARY_MIN_LENGTH = 31
+# Seconds the REPL, a script or the daemon waits when it stops for summaries
+# still being made, and the shorter wait of a one-shot command at exit
+SUMMARY_WAIT = 30.0
+ONE_SHOT_SUMMARY_WAIT = 5.0
+
+
+def description_digest(description: str) -> str:
+    """Short hash of a description, stored with its summary to tell when it is out of date."""
+    import hashlib
+    return hashlib.blake2b(description.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+def needs_summary(todo: Dict) -> bool:
+    """True if todo's description is long enough to summarize and has no current summary."""
+    description = todo.get('description') or ''
+    return len(description) >= SUMMARY_MIN_LENGTH and task_summary(todo) is None
+
+
+def task_summary(todo: Dict) -> Optional[str]:
+    """The stored summary of todo's description, or None if it has none or it is out of date."""
+    summary = todo.get('summary')
+    if summary and todo.get('summary_of') == description_digest(todo.get('description') or ''):
+        return summary
+    return None
+
+
+class Summarizer(ABC):
+    """Turns a long task description into the short summary `list` shows.
+
+    Subclasses implement summarize(). It runs on a background thread (see
+    TodoApp.apply_summaries), so it may be slow, e.g. call a model, but
+    must not touch the app; an exception only leaves that task without a
+    summary.
+    """
+
+    name = ''
+
+    @abstractmethod
+    def summarize(self, description: str) -> str:
+        """Return a short summary of description."""
+
+
+class LocalSummarizer(Summarizer):
+    """Deterministic offline summarizer: the first few words of the first sentence that are not filler."""
+
+    name = 'local'
+    FILLER = frozenset({
+        'a', 'an', 'the', 'i', 'we', 'my', 'our', 'to', 'of', 'and', 'or', 'for', 'in', 'on', 'at',
+        'is', 'are', 'be', 'been', 'has', 'have', 'had', 'need', 'needs', 'should', 'must', 'will',
+        'it', 'this', 'that', 'some', 'please', 'also', 'just',
+    })
+
+    def __init__(self, max_words: int = 5):
+        self.max_words = max_words
+
+    def summarize(self, description: str) -> str:
+        sentence = re.split(r'(?<=[.!?])\s', description.strip(), maxsplit=1)[0]
+        words = re.findall(r"[\w][\w'-]*", sentence)
+        kept = [w for w in words if w.lower() not in self.FILLER] or words
+        summary = ' '.join(kept[:self.max_words])
+        return summary[:1].upper() + summary[1:]
+
+
+class ModelSummarizer(Summarizer):
+    """The tasks4 summarizer: asks an OpenAI chat model for five words or less.
+
+    Needs the tasks4 package (the `openai` extra) and OPENAI_API_KEY;
+    OPENAI_BASE_URL points it at another endpoint, such as the tasks4 stub
+    server. Requests share one client and are retried with backoff.
+    """
+
+    name = 'openai'
+
+    def __init__(self, model: Optional[str] = None):
+        try:
+            import tasks4
+            from tasks4.ratelimit import RetryingClient
+        except ImportError as e:
+            raise ImportError(f"The openai summarizer needs the tasks4 package, which could not be imported ({e}). "
+                              "Install it with `uv sync --extra openai` or `pip install -e ../tasks4`.",
+                              name=e.name) from None
+        self._summarize = tasks4.summarize
+        self._client = RetryingClient(tasks4.shared_client())
+        self.model = model or tasks4.MODEL
+
+    def summarize(self, description: str) -> str:
+        return self._summarize(self._client, description, self.model).strip()
+
+
+SUMMARIZERS = {
+    LocalSummarizer.name: LocalSummarizer,
+    ModelSummarizer.name: ModelSummarizer,
+}
+
+
+def make_summarizer(name: Optional[str]) -> Optional[Summarizer]:
+    """Return the summarizer called name (see SUMMARIZERS), or None if name is empty or '0'."""
+    if not name or name == '0':
+        return None
+    if name not in SUMMARIZERS:
+        raise ValueError(f"Unknown summarizer: {name} (choose from {', '.join(sorted(SUMMARIZERS))})")
+    return SUMMARIZERS[name]()
 
 
 class TodoApp:
     """Main task application class."""
     
-    def __init__(self, data_file: Optional[str] = None):
+    def __init__(self, data_file: Optional[str] = None, storage: Optional[str] = None,
+                 scope: str = 'all', summarizer: Optional[Summarizer] = None):
         """Initialize the task app with a data file.
 
-        Uses tasks.json stored next to this script for consistency.
+        Uses tasks.json stored next to this script for consistency
+        (tasks.db for SQLite storage, imported from tasks.json on first use).
         Automatically migrates from todos.json if present.
+        `storage` selects a backend from STORAGE_BACKENDS; by default the one
+        already in use for the data file is detected. Requesting a different
+        backend converts the existing data to it.
+        `scope` (one of LOAD_SCOPES) declares how much of a JSON store the
+        caller needs; anything else is loaded on first access to `todos`.
+        With a `summarizer`, added tasks with long descriptions get a short
+        summary in the background (see apply_summaries).
         """
+        if scope not in LOAD_SCOPES:
+            raise ValueError(f"Unknown load scope: {scope}")
+        self.scope = scope
         base_dir = os.path.dirname(os.path.abspath(__file__))
         # Preferred new location
         default_tasks = os.path.join(base_dir, 'tasks.json')
         # Legacy filename we may migrate from
         legacy_todos = os.path.join(base_dir, 'todos.json')
+        import_from = None
+        if data_file is None and storage == SqliteStorage.name:
+            data_file = os.path.join(base_dir, 'tasks.db')
+            if not os.path.exists(data_file) and os.path.exists(default_tasks):
+                import_from = default_tasks
         # Allow explicit override but default to script-local file
         self.data_file = data_file or default_tasks
         # If using default path and legacy exists but new doesn't, migrate
@@ -36,55 +1891,664 @@ class TodoApp:
             except OSError:
                 # Fallback: leave legacy in place; we'll read from legacy path during load
                 pass
-        self.todos: List[Dict] = []
+        # None while the store has not been fully loaded (see todos); queries
+        # then go to _query, the queryable storage or a StreamedTasks
+        self._todos: Optional[List[Task]] = []
+        self._query = None
+        # Incomplete and completed tasks, each kept sorted by _sort_key so
+        # reordering after a change does not re-sort (None: rebuild on demand)
+        self._parts: Optional[Tuple[List[Task], List[Task]]] = None
+        # Lowest position in the reordered list whose ID may have changed
+        self._renumber_from = 0
+        # Display-ID views (see _view): tasks in id order, all (True) or
+        # incomplete only (False), so a display ID is a list index
+        self._views: Dict[bool, List[Task]] = {}
+        # Trigram index over the loaded tasks, built once this session has
+        # searched often enough and kept up to date by _apply (None: not built)
+        self._search_index: Optional[TrigramIndex] = None
+        self._search_scans = 0
+        # Highest ID and counts of the loaded tasks, kept up to date by _apply
+        # (None: compute on demand)
+        self._stats: Optional[StoreStats] = None
+        # Operations queued by an open batch (see begin), the identities of
+        # the tasks each one targets, and the state to roll back to
+        self._batch: Optional[List[Dict]] = None
+        self._batch_targets: Optional[List[Optional[List[tuple]]]] = None
+        self._batch_snapshot: Optional[List[Task]] = None
+        # storage.version() as of the last load or write by this app; a
+        # different stamp means another process wrote the store (see _perform)
+        self._version: Any = None
+        self._lock_depth = 0
+        # Summaries being made on a background thread (started on first
+        # use): (task identity, id when added, description digest, future)
+        self.summarizer = summarizer
+        self._summary_pool = None
+        self._summary_jobs: List[Tuple[tuple, int, str, Any]] = []
+        self.storage = open_storage(self.data_file)
         self.load_todos()
+        if storage and storage != self.storage.name:
+            self.set_storage(storage)
+        if import_from:
+            self.import_json(import_from)
     
-    def load_todos(self) -> None:
-        """Load tasks from JSON file."""
-        # Try primary file first
-        if os.path.exists(self.data_file):
+    @property
+    def todos(self) -> List[Task]:
+        """All tasks as dicts; loaded on first use if the app started partially loaded."""
+        if self._todos is None:
+            if self.storage.queryable:
+                with phase('load', storage=self.storage.name):
+                    self.todos = self.storage.load()
+            else:
+                self.scope = 'all'
+                self.load_todos()
+        return self._todos
+    
+    @todos.setter
+    def todos(self, value: List[Dict]) -> None:
+        # Held internally as Task objects; plain dicts are converted
+        self._todos = [t if isinstance(t, Task) else Task.from_dict(t) for t in value]
+        self._parts = None
+        self._views = {}
+        self._search_index = None
+        self._stats = None
+    
+    def import_json(self, path: str) -> None:
+        """Replace all tasks with those in a tasks.json-format file and save."""
+        with open(path, 'r') as f:
+            self.todos = json.load(f)
+        self.save_todos()
+    
+    def import_tasks(self, path: str, fmt: Optional[str] = None) -> Optional[int]:
+        """Add every row of a CSV or JSON Lines file ('-': stdin) as a new task.
+
+        Rows are validated as they are read (see import_record). If any row
+        is invalid the errors are printed and nothing is added; otherwise all
+        tasks are added in one batch, so IDs are assigned from the running
+        highest ID and the store is written once. Returns the number added,
+        or None if the file could not be read or had invalid rows.
+        """
+        import csv
+        import time
+        start = time.perf_counter()
+        fmt = fmt or IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+        now = datetime.now().isoformat()
+        records: List[Dict] = []
+        errors: List[str] = []
+        try:
+            f = sys.stdin if path == '-' else open(path, 'r', newline='', encoding='utf-8-sig')
             try:
-                with open(self.data_file, 'r') as f:
-                    self.todos = json.load(f)
-            except json.JSONDecodeError:
-                print(f"Error: Could not parse {self.data_file}. Starting with empty todo list.")
-                self.todos = []
+                for line, row in read_import_rows(f, fmt):
+                    try:
+                        records.append(import_record(row, now))
+                    except ValueError as e:
+                        errors.append(f"line {line}: {e}")
+            finally:
+                if f is not sys.stdin:
+                    f.close()
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"Error: Could not read {path}: {e}")
+            return None
+        if errors:
+            for error in errors[:IMPORT_MAX_ERRORS]:
+                print(f"Error: {error}")
+            if len(errors) > IMPORT_MAX_ERRORS:
+                print(f"... and {len(errors) - IMPORT_MAX_ERRORS} more")
+            print(f"Nothing imported: {len(errors)} invalid row(s)")
+            return None
+        with self.batch():
+            for record in records:
+                record['id'] = self.get_next_id()
+                self._perform({'op': 'add', 'task': record})
+            # Completed or back-dated tasks belong earlier in the ID order
+            if any(r['completed'] or r['created_at'] != now for r in records):
+                self._perform({'op': 'reindex'})
+        elapsed = time.perf_counter() - start
+        rate = f" ({len(records) / elapsed:,.0f} tasks/s)" if records and elapsed > 0 else ''
+        print(f"✓ Imported {len(records)} task(s) in {elapsed:.2f}s{rate}")
+        return len(records)
+    
+    def export_tasks(self, path: str = '-', fmt: str = 'jsonl', status: str = 'all') -> int:
+        """Write tasks one record at a time as JSON Lines or CSV to path ('-': stdout).
+
+        When the tasks are not loaded they are streamed from the store, so
+        memory stays constant however large it is. JSON Lines records are
+        the tasks.json records; CSV has EXPORT_COLUMNS, with `completed` as
+        true/false, and can be read back by import_tasks. `status` is a key
+        of EXPORT_STATUSES. Returns the number of tasks written.
+        """
+        import csv
+        if self._todos is None and not isinstance(self._query, StoreStats):
+            # No journal operations pending on top of the stored tasks (see _stream_scope)
+            tasks = self.storage.iter_tasks()
         else:
-            # Attempt to read legacy todos.json next to the script if present
-            legacy_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'todos.json')
-            if os.path.exists(legacy_path):
+            tasks = iter(self.todos)
+        completed = EXPORT_STATUSES[status]
+        if completed is not None:
+            tasks = (t for t in tasks if bool(t.get('completed')) == completed)
+        written = 0
+
+        def counted(tasks: Iterator[Dict]) -> Iterator[Dict]:
+            nonlocal written
+            for written, todo in enumerate(tasks, 1):
+                yield todo
+
+        try:
+            out = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+            try:
+                if fmt == 'csv':
+                    writer = csv.writer(out)
+                    writer.writerow(EXPORT_COLUMNS)
+                    writer.writerows(
+                        (t.get('id'), t.get('title'), t.get('description'),
+                         'true' if t.get('completed') else 'false',
+                         t.get('created_at') or '', t.get('completed_at') or '')
+                        for t in counted(tasks)
+                    )
+                else:
+                    out.writelines(
+                        json.dumps(t, default=task_to_json) + '\n' for t in counted(tasks)
+                    )
+                out.flush()
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+        except BrokenPipeError:
+            # The reader went away (e.g. `| head`); exit quietly like other tools
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+        except ValueError:
+            # Kept off stdout, which holds the exported records
+            print(f"Error: Could not parse {self.data_file}", file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error: Could not write {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if path != '-':
+            print(f"✓ Exported {written} task(s) to {path}")
+        return written
+    
+    def export_json(self, path: str) -> None:
+        """Write all tasks to a file in the tasks.json format."""
+        with open(path, 'w') as f:
+            json.dump(self.todos, f, indent=2, default=task_to_json)
+    
+    def convert(self, path: str, kind: Optional[str] = None) -> bool:
+        """Write all tasks to a new data file in storage format `kind`.
+
+        `kind` defaults to the format suggested by the file name (see
+        convert_format). The copy is read back and compared with the tasks,
+        so a format that cannot hold them exactly is reported rather than
+        left behind. Returns True on success.
+        """
+        kind = kind or convert_format(path)
+        if os.path.exists(path):
+            print(f"Error: {path} already exists")
+            return False
+        try:
+            target = open_storage(path, kind)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        import sqlite3
+        todos = self.todos
+        try:
+            target.save(todos)
+            # Compared as JSON so that e.g. 1 and True differ
+            copy = json.dumps([Task.from_dict(t) for t in open_storage(path, kind).load()], default=task_to_json)
+            exact = copy == json.dumps(todos, default=task_to_json)
+        except (sqlite3.Error, OverflowError, ValueError):
+            exact = False
+        if not exact:
+            for written in target.files():
+                if os.path.exists(written):
+                    os.remove(written)
+            print(f"Error: {kind} storage cannot hold these tasks exactly; nothing written")
+            return False
+        print(f"✓ Converted {len(todos)} task(s) to {kind}: {path}")
+        return True
+    
+    def set_storage(self, kind: str) -> None:
+        """Move the loaded tasks to another storage backend and use it from now on."""
+        old = self.storage
+        self.storage = open_storage(self.data_file, kind)
+        self.save_todos()
+        # Drop files only the previous backend used (e.g. a leftover journal)
+        for path in set(old.files()) - set(self.storage.files()):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def load_todos(self) -> None:
+        """Load tasks from the storage backend, replaying any journal."""
+        with phase('load', storage=self.storage.name):
+            # Taken before reading, so a write that lands during the read counts
+            self._version = self.storage.version()
+            # Try primary file first
+            if self.storage.exists():
+                if self.storage.queryable:
+                    # Commands query the backend; everything is loaded only if needed
+                    self._todos, self._query = None, self.storage
+                    return
+                if self._stream_scope():
+                    return
                 try:
-                    with open(legacy_path, 'r') as f:
-                        self.todos = json.load(f)
-                    # Save immediately to migrate to new filename
-                    self.save_todos()
-                    try:
-                        os.remove(legacy_path)
-                    except OSError:
-                        pass
-                except json.JSONDecodeError:
-                    print(f"Error: Could not parse {legacy_path}. Starting with empty task list.")
+                    self.todos = self.storage.load()
+                except ValueError:
+                    # Also covers json.JSONDecodeError
+                    print(f"Error: Could not parse {self.data_file}. Starting with empty todo list.")
                     self.todos = []
+                for op in self.storage.journal():
+                    self._apply(op)
+            else:
+                # Attempt to read legacy todos.json next to the script if present
+                legacy_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'todos.json')
+                if os.path.exists(legacy_path):
+                    try:
+                        with open(legacy_path, 'r') as f:
+                            self.todos = json.load(f)
+                        # Save immediately to migrate to new filename
+                        self.save_todos()
+                        try:
+                            os.remove(legacy_path)
+                        except OSError:
+                            pass
+                    except json.JSONDecodeError:
+                        print(f"Error: Could not parse {legacy_path}. Starting with empty task list.")
+                        self.todos = []
+                else:
+                    self._todos = None if self.storage.queryable else []
+                    self._query = self.storage if self.storage.queryable else None
+    
+    def _stream_scope(self) -> bool:
+        """Read only what self.scope needs from a JSON store; False if it must be fully loaded."""
+        if self.scope == 'all' or (self.scope == 'append' and not self.storage.appends):
+            return False
+        if self.scope == 'append':
+            # Persisted aggregates cover the journal too, so nothing is read
+            stats = self.storage.stats()
+            if stats is not None:
+                self._todos, self._query = None, stats
+                return True
+        if self.storage.journal():
+            # Pending operations can only be replayed onto the full task list
+            return False
+        if self.scope == 'stream':
+            self._todos = self._query = None
+            return True
+        try:
+            self._query = StreamedTasks(self.storage, keep_incomplete=self.scope == 'incomplete')
+        except ValueError:
+            return False
+        self._todos = None
+        return True
+    
+    def save_todos(self) -> None:
+        """Save all tasks through the storage backend."""
+        try:
+            with self._write_lock(), phase('save', storage=self.storage.name):
+                self.storage.save(self.todos)
+                self._version = self.storage.version()
+        except IOError as e:
+            print(f"Error saving todos: {e}")
+            sys.exit(1)
+    
+    def _perform(self, op: Dict, targets: Optional[List[Dict]] = None) -> None:
+        """Apply an operation to the in-memory tasks and persist it.
+
+        `targets` are the tasks a complete or delete operation is meant for
+        (by default the tasks its ids refer to now). The operation is written
+        under the store's write lock, and if another process wrote the store
+        since it was loaded, the operation is first moved onto the current
+        contents (see _rebase) instead of overwriting them.
+
+        Inside a batch the operation is only applied (without reordering)
+        and queued; commit() persists the whole batch at once.
+        """
+        if self._batch is not None:
+            self._batch_targets.append(self._identities(op, targets))
+            self._apply(op, reorder=False)
+            self._batch.append(op)
+            return
+        with self._write_lock():
+            if self.storage.version() != self._version:
+                self._rebase([op], [self._identities(op, targets)])
+            if self._todos is None and self._query is not self.storage:
+                # Partially loaded JSON store (see _stream_scope): only a plain add
+                # to a store that appends can skip loading everything, or a
+                # summary when no tasks are kept in memory
+                if op['op'] == 'add' and self.storage.appends:
+                    self._query.note_added(op['task'])
+                    self._persist(op)
+                    return
+                if op['op'] == 'summary' and self.storage.appends and isinstance(self._query, StoreStats):
+                    self._persist(op)
+                    return
+                self.todos
+            if self._todos is not None:
+                self._apply(op)
+            self._persist(op)
+
+    @contextmanager
+    def _write_lock(self):
+        """Hold the store's write lock (see store_lock); re-entrant."""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        with store_lock(self.data_file):
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+
+    def _identities(self, op: Dict, targets: Optional[List[Dict]]) -> Optional[List[tuple]]:
+        """Return task_identity of each task a complete or delete op targets."""
+        if 'ids' not in op:
+            return None
+        if targets is None:
+            if self._todos is None:
+                return None
+            targets = [todo for _, todo in self._locate(op['ids'])]
+        return [task_identity(t) for t in targets]
+
+    def _rebase(self, ops: List[Dict], targets: List[Optional[List[tuple]]], apply: bool = False) -> None:
+        """Reload a store another process has written and retarget ops to it.
+
+        Called under the write lock. Added tasks get the next free ID, and the
+        tasks to complete or delete are found again by task_identity, since
+        the other writer may have renumbered them. Tasks already deleted by
+        the other writer are dropped from a delete. With `apply` (a batch,
+        already applied to the old contents) each op is applied to the
+        reloaded tasks, without reordering, before the next is retargeted.
+        Raises StoreConflict, with the reloaded store unchanged, if a task to
+        complete is gone.
+        """
+        self.load_todos()
+        if apply:
+            self.todos
+        found: Optional[Dict[tuple, List[Task]]] = None
+        for op, identities in zip(ops, targets):
+            kind = op['op']
+            if kind == 'add':
+                op['task']['id'] = self.get_next_id()
+            elif kind in ('complete', 'delete'):
+                if identities is None:
+                    self.load_todos()
+                    raise StoreConflict("The tasks were changed by another process; nothing saved")
+                if found is None:
+                    found = {}
+                    for todo in self.todos:
+                        found.setdefault(task_identity(todo), []).append(todo)
+                chosen = []
+                for identity in identities:
+                    # Popped so that identical tasks are matched one each
+                    matches = found.get(identity)
+                    if matches:
+                        chosen.append(matches.pop(0))
+                    elif kind == 'complete':
+                        self.load_todos()
+                        raise StoreConflict(f"Task '{identity[1]}' was deleted by another process; nothing saved")
+                op['ids'] = [todo.id for todo in chosen]
+                if kind == 'complete':
+                    # Still there for later operations of the batch
+                    for todo in chosen:
+                        found[task_identity(todo)].append(todo)
+            elif kind in ('clean', 'clear'):
+                found = None
+            if apply:
+                self._apply(op, reorder=False)
+                if kind == 'add' and found is not None:
+                    found.setdefault(task_identity(self.todos[-1]), []).append(self.todos[-1])
+    
+    def _persist(self, op: Dict) -> None:
+        """Record an already-applied operation with the storage backend."""
+        if not self.storage.appends:
+            stats = None
+        elif self._todos is None:
+            # StoreStats or StreamedTasks, both already account for the op
+            stats = StoreStats(self._query.max_id(), *self._query.counts())
+        else:
+            stats = self._store_stats()
+        try:
+            with phase('save', storage=self.storage.name, op=op['op']):
+                self.storage.record(op, self._todos, stats)
+                self._version = self.storage.version()
+        except IOError as e:
+            print(f"Error saving todos: {e}")
+            sys.exit(1)
+    
+    def _apply(self, op: Dict, reorder: bool = True) -> None:
+        """Apply a single operation record to self.todos.
+
+        This is the only place tasks are mutated, so replaying a journal
+        reproduces exactly what the original commands did. A 'batch' record
+        applies its operations in order and reorders once at the end.
+        """
+        kind = op['op']
+        parts = self._parts
+        index = self._search_index
+        stats = self._stats
+        if kind == 'add':
+            todo = Task.from_dict(op['task'])
+            self.todos.append(todo)
+            if parts is not None:
+                self._part_insert(todo)
+            self._view_append(todo)
+            if index is not None:
+                index.add(todo)
+            if stats is not None:
+                stats.note_added(todo)
+        elif kind == 'complete':
+            for _, todo in self._locate(op['ids']):
+                if not todo.completed:
+                    if parts is not None:
+                        self._part_remove(todo)
+                    self._view_remove(False, todo)
+                    if stats is not None:
+                        stats.completed += 1
+                    todo.completed = True
+                    todo.completed_at = op['completed_at']
+                    if parts is not None:
+                        self._part_insert(todo)
+                else:
+                    todo.completed_at = op['completed_at']
+        elif kind == 'delete':
+            found = self._locate(op['ids'])
+            for _, todo in found:
+                if parts is not None:
+                    self._part_remove(todo)
+                self._view_remove(True, todo)
+                self._view_remove(False, todo)
+                if index is not None:
+                    index.remove(todo)
+                if stats is not None:
+                    stats.total -= 1
+                    stats.completed -= todo.completed
+                    if todo.id == stats.high_water:
+                        # Set by the reorder, or found again on demand
+                        stats.high_water = None
+            for idx, _ in reversed(found):
+                del self.todos[idx]
+        elif kind == 'clean':
+            if index is not None:
+                for todo in self.todos:
+                    if todo.completed:
+                        index.remove(todo)
+            self._todos = [t for t in self.todos if not t.completed]
+            self._views.pop(True, None)
+            if stats is not None and stats.completed:
+                stats.total -= stats.completed
+                stats.completed = 0
+                stats.high_water = None
+            if parts is not None:
+                parts[1].clear()
+                self._mark_renumber(len(parts[0]))
+        elif kind == 'clear':
+            self._todos = []
+            self._parts = ([], [])
+            self._views = {True: [], False: []}
+            self._stats = StoreStats()
+            if index is not None:
+                self._search_index = TrigramIndex()
+        elif kind == 'summary':
+            for todo in self._summary_targets(op):
+                todo['summary'] = op['summary']
+                todo['summary_of'] = op['summary_of']
+        elif kind == 'batch':
+            for sub in op['ops']:
+                self._apply(sub, reorder=False)
+            reorder = reorder and any(sub['op'] in REORDERING_OPS for sub in op['ops'])
+        elif kind != 'reindex':
+            raise ValueError(f"Unknown operation: {kind}")
+        if reorder and kind in REORDERING_OPS | {'batch'}:
+            self._reorder()
+    
+    def _summary_targets(self, op: Dict) -> List[Task]:
+        """The tasks a summary op is for: found by task_identity, since IDs change.
+
+        The op's id is tried first; between reorders it points straight at
+        the task. Otherwise every task with that identity is a target.
+        """
+        identity = tuple(op['identity'])
+        todos = self.todos
+        hint = op.get('id', 0)
+        if 1 <= hint <= len(todos) and task_identity(todos[hint - 1]) == identity:
+            return [todos[hint - 1]]
+        return [todo for todo in todos if task_identity(todo) == identity]
+
+    def _locate(self, ids: List[int]) -> List[Tuple[int, Task]]:
+        """Return (index, task) for every task whose id is in ids, in list order.
+
+        Between reorders ids are list positions (id N at index N-1), so this
+        is a direct lookup; otherwise it falls back to a scan.
+        """
+        todos = self.todos
+        wanted = sorted(set(ids))
+        found = []
+        for todo_id in wanted:
+            if not (1 <= todo_id <= len(todos) and todos[todo_id - 1].id == todo_id):
+                break
+            found.append((todo_id - 1, todos[todo_id - 1]))
+        else:
+            return found
+        wanted_set = set(wanted)
+        return [(idx, t) for idx, t in enumerate(todos) if t.id in wanted_set]
+    
+    def _view_append(self, todo: Task) -> None:
+        """Add a new task to the cached display views, or drop a view it does not extend."""
+        for show_all, view in list(self._views.items()):
+            if not show_all and todo.completed:
+                continue
+            if not view or view[-1].id < todo.id:
+                view.append(todo)
             else:
-                self.todos = []
+                del self._views[show_all]
     
-    def save_todos(self) -> None:
-        """Save tasks to JSON file."""
+    def _view_remove(self, show_all: bool, todo: Task) -> None:
+        """Remove a task from a cached display view (views are sorted by id)."""
+        view = self._views.get(show_all)
+        if not view:
+            return
+        idx = bisect.bisect_left(view, todo.id, key=_task_id)
+        while idx < len(view) and view[idx].id == todo.id:
+            if view[idx] is todo:
+                del view[idx]
+                return
+            idx += 1
+    
+    def begin(self, snapshot: bool = True) -> None:
+        """Start a batch: defer reindexing and saving until commit().
+
+        Tasks are loaded into memory for the duration of the batch so that
+        display IDs resolve against the pending changes. Without `snapshot`
+        the tasks are not copied, and the batch cannot be rolled back.
+        """
+        if self._batch is not None:
+            raise RuntimeError("A batch is already in progress")
+        self._batch_snapshot = [t.copy() for t in self.todos] if snapshot else None
+        if not snapshot:
+            self.todos  # loads the tasks, as the copy above does
+        self._batch = []
+        self._batch_targets = []
+    
+    def commit(self) -> int:
+        """Reindex and persist everything done since begin(); return the operation count."""
+        if self._batch is None:
+            raise RuntimeError("No batch in progress")
+        ops, self._batch, self._batch_snapshot = self._batch, None, None
+        targets, self._batch_targets = self._batch_targets, None
+        if ops:
+            with self._write_lock():
+                if self.storage.version() != self._version:
+                    self._rebase(ops, targets, apply=True)
+                # The operations are already applied; only the deferred work remains
+                if any(op['op'] in REORDERING_OPS for op in ops):
+                    self._reorder()
+                self._persist(ops[0] if len(ops) == 1 else {'op': 'batch', 'ops': ops})
+        return len(ops)
+    
+    def rollback(self) -> int:
+        """Discard everything done since begin(); return the operation count."""
+        if self._batch is None:
+            raise RuntimeError("No batch in progress")
+        if self._batch_snapshot is None:
+            raise RuntimeError("This batch was started without a snapshot and cannot be rolled back")
+        ops, self._batch, self._batch_targets = self._batch, None, None
+        self.todos, self._batch_snapshot = self._batch_snapshot, None
+        return len(ops)
+    
+    @property
+    def in_batch(self) -> bool:
+        """True between begin() and commit()/rollback()."""
+        return self._batch is not None
+    
+    @contextmanager
+    def batch(self):
+        """Context manager around begin()/commit(), rolling back on exceptions.
+
+        Nested batches join the outermost one.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self.begin()
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.todos, f, indent=2)
-        except IOError as e:
-            print(f"Error saving todos: {e}")
-            sys.exit(1)
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
     
     def get_next_id(self) -> int:
         """Get the next available ID for a new task."""
-        if not self.todos:
-            return 1
-        return max(todo['id'] for todo in self.todos) + 1
+        if self._todos is None:
+            return self._query.max_id() + 1
+        return self._store_stats().high_water + 1
+    
+    def _store_stats(self) -> StoreStats:
+        """Aggregates of the loaded tasks, computed once and then maintained by _apply."""
+        stats = self._stats
+        if stats is None:
+            stats = self._stats = StoreStats.of(self.todos)
+        elif stats.high_water is None:
+            stats.high_water = max((t.id for t in self.todos), default=0)
+        return stats
     
     def add_todo(self, title: str, description: str = "") -> None:
-        """Add a new task item."""
+        """Add a new task item.
+
+        On a store that is rewritten whole, summaries that are ready by
+        then (see apply_summaries) are saved in the same write as the task.
+        """
+        if self._batch is None and self.rewrites_store() and any(job[3].done() for job in self._summary_jobs):
+            with self.batch():
+                self.add_todo(title, description)
+            return
         todo = {
             'id': self.get_next_id(),
             'title': title,
@@ -93,87 +2557,213 @@ class TodoApp:
             'created_at': datetime.now().isoformat(),
             'completed_at': None
         }
-        self.todos.append(todo)
-        self.save_todos()
+        self.apply_summaries()
+        self._perform({'op': 'add', 'task': todo})
         print(f"✓ Added task #{todo['id']}: {title}")
+        if self.summarizer is not None:
+            self._queue_summary(todo)
+
+    def _queue_summary(self, todo: Dict) -> None:
+        """Start making a summary of todo's description on the background thread, if it needs one."""
+        if not needs_summary(todo):
+            return
+        if self._summary_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._summary_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tasks3-summary')
+        description = todo['description']
+        future = self._summary_pool.submit(self.summarizer.summarize, description)
+        self._summary_jobs.append((task_identity(todo), todo['id'], description_digest(description), future))
+
+    def apply_summaries(self, wait: bool = False, timeout: Optional[float] = None) -> int:
+        """Save the background summaries that are ready; return how many were saved.
+
+        Summaries are made off the calling thread so adding a task never
+        waits for one, and saved here, on the app's own thread, the next
+        time the app adds or lists tasks. With `wait`, first wait up to
+        `timeout` seconds (None: no limit) for the ones still being made.
+        Each is saved as a 'summary' operation, so it is journaled and
+        merged with other writers like any change; on a store that is
+        rewritten whole (see rewrites_store) they are saved in one write.
+        A task deleted or changed in the meantime is left alone, and a
+        summarizer error only prints a warning.
+        """
+        jobs = self._summary_jobs
+        if not jobs:
+            return 0
+        if wait:
+            from concurrent.futures import wait as wait_futures
+            wait_futures([job[3] for job in jobs], timeout)
+        self._summary_jobs = [job for job in jobs if not job[3].done()]
+        ops = []
+        for identity, todo_id, digest, future in jobs:
+            if not future.done():
+                continue
+            try:
+                summary = ' '.join(str(future.result()).split())
+            except Exception as e:
+                print(f"Warning: could not summarize task '{identity[1]}': {e}", file=sys.stderr)
+                continue
+            op = {'op': 'summary', 'id': todo_id, 'identity': list(identity),
+                  'summary': summary, 'summary_of': digest}
+            if not summary or (self._todos is not None and not self._summary_targets(op)):
+                continue
+            ops.append(op)
+        if len(ops) > 1 and self._batch is None and self.rewrites_store():
+            with self.batch():
+                for op in ops:
+                    self._perform(op)
+        else:
+            for op in ops:
+                self._perform(op)
+        return len(ops)
+
+    def rewrites_store(self) -> bool:
+        """Whether every save writes the whole store again (json and binary storage)."""
+        return not (self.storage.appends or self.storage.queryable)
+
+    def wait_summaries(self, timeout: Optional[float] = SUMMARY_WAIT) -> int:
+        """Save the summaries still being made, waiting up to timeout seconds, and stop the background thread."""
+        saved = self.apply_summaries(wait=True, timeout=timeout)
+        if self._summary_pool is not None:
+            # Anything still running after the timeout is abandoned
+            self._summary_pool.shutdown(wait=False, cancel_futures=True)
+            self._summary_pool = None
+            self._summary_jobs = []
+        return saved
+    
+    def _counts(self) -> Tuple[int, int]:
+        """Return (total, completed) task counts."""
+        if self._todos is None:
+            return self._query.counts()
+        return self._store_stats().counts()
+    
+    def _view(self, show_all: bool = False) -> List[Dict]:
+        """Return the tasks numbered by display ID: all, or only incomplete ones.
+
+        The in-memory views are cached and kept up to date by _apply; callers
+        must not modify the returned list.
+        """
+        if self._todos is None:
+            return self._query.select(None if show_all else False)
+        view = self._views.get(show_all)
+        if view is None:
+            todos_to_show = self.todos if show_all else [t for t in self.todos if not t.completed]
+            # Ensure stable, ascending order by ID
+            view = self._views[show_all] = sorted(todos_to_show, key=_task_id)
+        return view
     
-    def list_todos(self, show_all: bool = False) -> None:
-        """List all tasks or only incomplete ones, with sequential display IDs."""
-        if not self.todos:
-            print("No tasks found. Add one with 'task add <title>'")
+    def list_todos(self, show_all: bool = False, limit: Optional[int] = None, offset: int = 0,
+                   out: Optional[TextIO] = None) -> None:
+        """List all tasks or only incomplete ones, with sequential display IDs.
+
+        `limit` and `offset` select a page of the list; only that page is
+        formatted. Output goes to `out` (default: stdout).
+        """
+        out = out or sys.stdout
+        if self._summary_jobs:
+            self.apply_summaries()
+        total_count, completed_count = self._counts()
+        if not total_count:
+            print("No tasks found. Add one with 'task add <title>'", file=out)
             return
         
-        todos_to_show = self.todos if show_all else [t for t in self.todos if not t['completed']]
-        # Ensure stable, ascending order by ID
-        todos_to_show = sorted(todos_to_show, key=lambda t: t['id'])
+        todos_to_show = self._view(show_all)
         
         if not todos_to_show:
-            print("No incomplete tasks. Great job! 🎉")
+            print("No incomplete tasks. Great job! 🎉", file=out)
             return
         
-        print(f"\n{'ID':<5} {'Status':<12} {'Title':<40} {'Description':<30}")
-        print("-" * 90)
-        
+        start, stop = page_bounds(len(todos_to_show), limit, offset)
+        out.write("\n")
         # Display sequential IDs (1, 2, 3...) instead of actual IDs
-        for display_id, todo in enumerate(todos_to_show, 1):
-            status = "✓ Completed" if todo['completed'] else "○ Incomplete"
-            title = todo['title'][:37] + "..." if len(todo['title']) > 40 else todo['title']
-            desc = todo['description'][:27] + "..." if len(todo['description']) > 30 else todo['description']
-            print(f"{display_id:<5} {status:<12} {title:<40} {desc:<30}")
+        render_table(enumerate(todos_to_show[start:stop], start + 1), out)
+        render_page_note(len(todos_to_show), start, stop, out)
         
-        completed_count = sum(1 for t in self.todos if t['completed'])
-        total_count = len(self.todos)
-        print(f"\nTotal: {total_count} ({completed_count} completed, {total_count - completed_count} incomplete)")
+        print(f"\nTotal: {total_count} ({completed_count} completed, {total_count - completed_count} incomplete)", file=out)
     
-    def search_todos(self, query: str) -> None:
-        """Search tasks by title or description."""
-        query_lower = query.lower()
-        matches = [
-            todo for todo in self.todos
-            if query_lower in todo['title'].lower() or query_lower in todo['description'].lower()
-        ]
+    def find_todos(self, query: str) -> List[Dict]:
+        """Return the tasks whose title or description contains query, ignoring case."""
+        with phase('search'):
+            query_lower = query.lower()
+            if self._todos is None:
+                return self._query.search(query)
+            return [
+                todo for todo in self._search_candidates(query_lower)
+                if query_lower in todo.title.lower() or query_lower in todo.description.lower()
+            ]
+    
+    def search_todos(self, query: str, limit: Optional[int] = None, offset: int = 0,
+                     out: Optional[TextIO] = None) -> None:
+        """Search tasks by title or description.
+
+        `limit` and `offset` select a page of the matches; only that page is
+        formatted. Output goes to `out` (default: stdout).
+        """
+        out = out or sys.stdout
+        matches = self.find_todos(query)
         
         if not matches:
-            print(f"No tasks found matching '{query}'")
+            print(f"No tasks found matching '{query}'", file=out)
             return
         
-        print(f"\nFound {len(matches)} task(s) matching '{query}':\n")
-        print(f"{'ID':<5} {'Status':<12} {'Title':<40} {'Description':<30}")
-        print("-" * 90)
-        
-        for todo in matches:
-            status = "✓ Completed" if todo['completed'] else "○ Incomplete"
-            title = todo['title'][:37] + "..." if len(todo['title']) > 40 else todo['title']
-            desc = todo['description'][:27] + "..." if len(todo['description']) > 30 else todo['description']
-            print(f"{todo['id']:<5} {status:<12} {title:<40} {desc:<30}")
-    
-    def complete_todo(self, display_id: int) -> None:
-        """Mark a task as completed using display ID."""
+        print(f"\nFound {len(matches)} task(s) matching '{query}':\n", file=out)
+        start, stop = page_bounds(len(matches), limit, offset)
+        render_table(((todo['id'], todo) for todo in matches[start:stop]), out)
+        render_page_note(len(matches), start, stop, out)
+    
+    def _search_candidates(self, query_lower: str) -> List[Task]:
+        """Tasks that may match a search, in list order.
+
+        A session with everything loaded (scope 'all', e.g. the REPL) scans
+        until it has searched TrigramIndex.BUILD_AFTER_SCANS times, then
+        builds an index so later searches only check candidates. One-shot
+        commands search once and always scan.
+        """
+        todos = self.todos
+        if self._search_index is None:
+            self._search_scans += 1
+            if self.scope != 'all' or self._search_scans < TrigramIndex.BUILD_AFTER_SCANS:
+                return todos
+            self._search_index = TrigramIndex(todos)
+        found = self._search_index.candidates(query_lower)
+        if found is None:
+            return todos
+        # Between reorders id N is at index N-1; otherwise keep list order by scanning
+        if all(1 <= t.id <= len(todos) and todos[t.id - 1] is t for t in found):
+            return sorted(found, key=_task_id)
+        keys = {id(t) for t in found}
+        return [t for t in todos if id(t) in keys]
+    
+    def complete_todo(self, display_id: int) -> bool:
+        """Mark a task as completed using display ID; return False if it was not found."""
         todo = self._get_todo_by_display_id(display_id, show_all=False)
         if not todo:
             print(f"Error: Task #{display_id} not found")
-            return
+            return False
         
         if todo['completed']:
             print(f"Task #{display_id} is already completed")
-            return
+            return True
         
-        todo['completed'] = True
-        todo['completed_at'] = datetime.now().isoformat()
-        # After completion, reindex so oldest incomplete is #1
-        self.reindex()
-        print(f"✓ Completed task #{display_id}: {todo['title']}")
-    
-    def complete_todos(self, display_ids: List[int]) -> None:
-        """Mark multiple tasks as completed using display IDs."""
+        title = todo['title']
+        # Completing reindexes so oldest incomplete is #1
+        self._perform({'op': 'complete', 'ids': [todo['id']], 'completed_at': datetime.now().isoformat()}, [todo])
+        print(f"✓ Completed task #{display_id}: {title}")
+        return True
+    
+    def complete_todos(self, display_ids: List[int]) -> bool:
+        """Mark multiple tasks as completed using display IDs; return False if any was not found."""
         completed_titles = []
         errors = []
         already_completed = []
         
+        # A repeated ID names the same task once
+        display_ids = list(dict.fromkeys(display_ids))
+        
         # First pass: collect all todo objects before making any changes
         todos_to_complete = []
-        for display_id in display_ids:
-            todo = self._get_todo_by_display_id(display_id, show_all=False)
+        resolved = self._get_todos_by_display_ids(display_ids, show_all=False)
+        for display_id, todo in zip(display_ids, resolved):
             if not todo:
                 errors.append(str(display_id))
                 continue
@@ -184,14 +2774,16 @@ class TodoApp:
             
             todos_to_complete.append((todo, display_id))
         
-        # Second pass: mark all collected todos as completed
+        # Second pass: mark all collected todos as completed in one operation
         for todo, display_id in todos_to_complete:
-            todo['completed'] = True
-            todo['completed_at'] = datetime.now().isoformat()
             completed_titles.append(f"#{display_id}")
         
         if completed_titles:
-            self.reindex()
+            self._perform({
+                'op': 'complete',
+                'ids': [todo['id'] for todo, _ in todos_to_complete],
+                'completed_at': datetime.now().isoformat(),
+            }, [todo for todo, _ in todos_to_complete])
             if len(completed_titles) == 1:
                 print(f"✓ Completed task {completed_titles[0]}")
             elif len(completed_titles) == 2:
@@ -207,46 +2799,49 @@ class TodoApp:
                 print(f"Task #{already_completed[0]} was already completed")
             else:
                 print(f"Tasks {', '.join(already_completed)} were already completed")
+        return not errors
     
-    def delete_todo(self, display_id: int, show_all: bool = False) -> None:
-        """Delete a task by display ID."""
+    def delete_todo(self, display_id: int, show_all: bool = False) -> bool:
+        """Delete a task by display ID; return False if it was not found."""
         todo = self._get_todo_by_display_id(display_id, show_all)
         if not todo:
             print(f"Error: Task #{display_id} not found")
-            return
+            return False
         
         title = todo['title']
-        actual_id = todo['id']
-        self.todos = [t for t in self.todos if t['id'] != actual_id]
-        # After deletion, reindex so remaining tasks are compacted
-        self.reindex()
+        # Deleting reindexes so remaining tasks are compacted
+        self._perform({'op': 'delete', 'ids': [todo['id']]}, [todo])
         print(f"✗ Deleted task #{display_id}: {title}")
+        return True
     
-    def delete_todos(self, display_ids: List[int], show_all: bool = False) -> None:
-        """Delete multiple tasks by display ID."""
+    def delete_todos(self, display_ids: List[int], show_all: bool = False) -> bool:
+        """Delete multiple tasks by display ID; return False if any was not found."""
         deleted_ids = []
         errors = []
         
+        # A repeated ID names the same task once
+        display_ids = list(dict.fromkeys(display_ids))
+        
         # First pass: collect all todo objects and their actual IDs before making any changes
         todos_to_delete = []
-        for display_id in display_ids:
-            todo = self._get_todo_by_display_id(display_id, show_all)
+        targets = []
+        resolved = self._get_todos_by_display_ids(display_ids, show_all)
+        for display_id, todo in zip(display_ids, resolved):
             if not todo:
                 errors.append(str(display_id))
                 continue
             
             todos_to_delete.append((todo['id'], display_id))
+            targets.append(todo)
         
         # Second pass: delete all collected todos by their actual IDs
         actual_ids_to_delete = [actual_id for actual_id, _ in todos_to_delete]
         for actual_id, display_id in todos_to_delete:
             deleted_ids.append(f"#{display_id}")
         
-        # Delete all by actual IDs in one pass
-        self.todos = [t for t in self.todos if t['id'] not in actual_ids_to_delete]
-        
         if deleted_ids:
-            self.reindex()
+            # Delete all by actual IDs in one operation
+            self._perform({'op': 'delete', 'ids': actual_ids_to_delete}, targets)
             if len(deleted_ids) == 1:
                 print(f"✗ Deleted task {deleted_ids[0]}")
             elif len(deleted_ids) == 2:
@@ -256,49 +2851,323 @@ class TodoApp:
         
         if errors:
             print(f"Error: Task(s) {', '.join(errors)} not found")
+        return not errors
+    
+    def delete_all(self) -> int:
+        """Delete every task, complete and incomplete; return how many were removed."""
+        removed, _ = self._counts()
+        self._perform({'op': 'clear'})
+        return removed
+    
+    def clean(self) -> int:
+        """Remove all completed tasks and reindex; return how many were removed."""
+        _, removed = self._counts()
+        # After cleaning, reindex automatically
+        self._perform({'op': 'clean'})
+        return removed
     
     def _find_todo(self, todo_id: int) -> Optional[Dict]:
         """Find a task by ID."""
-        for todo in self.todos:
-            if todo['id'] == todo_id:
-                return todo
-        return None
+        found = self._locate([todo_id])
+        return found[0][1] if found else None
     
     def _get_todo_by_display_id(self, display_id: int, show_all: bool = False) -> Optional[Dict]:
         """Get a task by its display ID (position in list)."""
-        todos_to_show = self.todos if show_all else [t for t in self.todos if not t['completed']]
-        todos_to_show = sorted(todos_to_show, key=lambda t: t['id'])
+        if self._todos is None:
+            return self._query.select_at(display_id, None if show_all else False)
+        todos_to_show = self._view(show_all)
         
         if 1 <= display_id <= len(todos_to_show):
             return todos_to_show[display_id - 1]
         return None
+    
+    def _get_todos_by_display_ids(self, display_ids: List[int], show_all: bool = False) -> List[Optional[Dict]]:
+        """Resolve several display IDs at once; None for IDs that are out of range."""
+        if self._todos is None:
+            found = self._query.select_positions(display_ids, None if show_all else False)
+            return [found.get(display_id) for display_id in display_ids]
+        todos_to_show = self._view(show_all)
+        return [
+            todos_to_show[display_id - 1] if 1 <= display_id <= len(todos_to_show) else None
+            for display_id in display_ids
+        ]
 
     def reindex(self) -> None:
+        """Reindex all tasks (see _reorder) and persist the result.
+
+        The sorted partitions are rebuilt first, so this also picks up task
+        dicts that were edited directly.
+        """
+        self._parts = None
+        self._perform({'op': 'reindex'})
+
+    @staticmethod
+    def _sort_key(todo: Task) -> Tuple[float, int]:
+        """Ordering key within a partition: (created_at as epoch seconds, id)."""
+        return todo.timestamp(), todo.id
+
+    def _partitions(self) -> Tuple[List[Task], List[Task]]:
+        """Return (incompletes, completes) sorted by _sort_key, building them if needed."""
+        if self._parts is None:
+            self._renumber_from = 0
+            incompletes = [t for t in self.todos if not t.completed]
+            completes = [t for t in self.todos if t.completed]
+            incompletes.sort(key=self._sort_key)
+            completes.sort(key=self._sort_key)
+            self._parts = (incompletes, completes)
+        return self._parts
+
+    def _part_insert(self, todo: Task) -> None:
+        incompletes, completes = self._parts
+        part = completes if todo.completed else incompletes
+        idx = bisect.bisect_right(part, self._sort_key(todo), key=self._sort_key)
+        part.insert(idx, todo)
+        self._mark_renumber(idx if part is incompletes else len(incompletes) + idx)
+
+    def _part_remove(self, todo: Task) -> None:
+        incompletes, completes = self._parts
+        part = completes if todo.completed else incompletes
+        idx = bisect.bisect_left(part, self._sort_key(todo), key=self._sort_key)
+        while part[idx] is not todo:
+            idx += 1
+        del part[idx]
+        self._mark_renumber(idx if part is incompletes else len(incompletes) + idx)
+
+    def _mark_renumber(self, position: int) -> None:
+        self._renumber_from = min(self._renumber_from, position)
+
+    def _reorder(self) -> None:
         """Reset IDs so that oldest incomplete task has ID=1, then remaining tasks.
 
         Ordering rules:
         - Incomplete tasks first, ascending by created_at (fallback: stable original order)
         - Then completed tasks, ascending by created_at (fallback as above)
+
+        The partitions are maintained incrementally by _apply, so this only
+        concatenates them and rewrites IDs from the first changed position.
         """
-        def safe_parse(ts: Optional[str]) -> float:
+        with phase('reindex'):
+            incompletes, completes = self._partitions()
+            new_list = incompletes + completes
+            for idx in range(self._renumber_from, len(new_list)):
+                new_list[idx].id = idx + 1
+            self._renumber_from = len(new_list)
+            self._todos = new_list
+            if self._stats is not None:
+                # IDs are now 1..n
+                self._stats.high_water = len(new_list)
+            # IDs now follow the partitions, so the display views are copies of them
+            self._views = {True: list(new_list), False: list(incompletes)}
+
+
+def _task_copy(todo: Dict) -> Dict:
+    """A plain dict copy of a task record, safe to hand out of the app."""
+    return todo.to_dict() if isinstance(todo, Task) else dict(todo)
+
+
+class AsyncTodoApp:
+    """Awaitable task API for asyncio services, wrapping a TodoApp.
+
+    Create one with ``await AsyncTodoApp.open(...)`` and close it with
+    ``await app.close()`` (or use ``async with``). Methods return task dicts
+    instead of printing. All TodoApp work, including loading and saving,
+    runs on a dedicated worker thread, so a large store never blocks the
+    event loop. Operations run one at a time, in the order they were
+    awaited.
+
+    Changes are applied in memory straight away and saved by a single
+    flush that runs once the operations already waiting have been applied.
+    Concurrent changes are therefore written together. Each change returns
+    only after the flush that includes it has written the store, and it
+    raises that flush's error (OSError, or StoreConflict if another process
+    made it impossible), in which case the store is reloaded.
+    """
+
+    def __init__(self, app: TodoApp, executor):
+        import asyncio
+        self._app = app
+        self._executor = executor
+        self._lock = asyncio.Lock()
+        # Future shared by the changes the next flush will write (None: nothing
+        # pending), and the task running that flush
+        self._flush_done = None
+        self._flush_task = None
+
+    @classmethod
+    async def open(cls, data_file: Optional[str] = None, storage: Optional[str] = None) -> 'AsyncTodoApp':
+        """Load the store on a worker thread and return an AsyncTodoApp for it."""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tasks3')
+        try:
+            app = await asyncio.get_running_loop().run_in_executor(executor, TodoApp, data_file, storage)
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(app, executor)
+
+    async def __aenter__(self) -> 'AsyncTodoApp':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def app(self) -> TodoApp:
+        """The wrapped TodoApp; only use it from the worker thread (see run)."""
+        return self._app
+
+    async def run(self, func, *args):
+        """Run func(*args) on the worker thread, after earlier operations, and return its result."""
+        import asyncio
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _change(self, func, *args):
+        """Apply a change with run() and wait until the flush that saves it is done."""
+        import asyncio
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, self._apply_change, func, args)
+            done = self._flush_done
+            if done is None:
+                done = self._flush_done = loop.create_future()
+                # Queued on the lock behind changes already waiting, so they join this flush
+                self._flush_task = loop.create_task(self._flush())
+        await asyncio.shield(done)
+        return result
+
+    def _apply_change(self, func, args):
+        if not self._app.in_batch:
+            # Nothing to roll back to: a failed flush reloads the store instead
+            self._app.begin(snapshot=False)
+        return func(*args)
+
+    async def _flush(self) -> None:
+        import asyncio
+        async with self._lock:
+            done, self._flush_done = self._flush_done, None
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._executor, self._commit)
+            except BaseException as e:
+                done.set_exception(e)
+                # Retrieved here so an unawaited failure is not logged as well
+                done.exception()
+            else:
+                done.set_result(None)
+
+    def _commit(self) -> None:
+        app = self._app
+        try:
+            app.commit()
+        except SystemExit:
+            # _persist already printed the error; a service must not exit
+            app.load_todos()
+            raise OSError(f"Could not save {app.data_file}") from None
+        except StoreConflict:
+            raise
+        except BaseException:
+            app.load_todos()
+            raise
+
+    async def close(self) -> None:
+        """Wait for pending changes to be saved and stop the worker thread."""
+        done = self._flush_done
+        if done is not None:
             try:
-                return datetime.fromisoformat(ts).timestamp() if ts else float('inf')
+                await done
             except Exception:
-                return float('inf')
-
-        incompletes = [t for t in self.todos if not t.get('completed')]
-        completes = [t for t in self.todos if t.get('completed')]
-        incompletes.sort(key=lambda t: (safe_parse(t.get('created_at')), t.get('id', 0)))
-        completes.sort(key=lambda t: (safe_parse(t.get('created_at')), t.get('id', 0)))
-        new_list = incompletes + completes
-        for idx, t in enumerate(new_list, start=1):
-            t['id'] = idx
-        self.todos = new_list
-        self.save_todos()
+                pass
+        self._executor.shutdown(wait=True)
+
+    # Queries
+
+    async def list(self, show_all: bool = False, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Return the tasks in display order (display ID N is index N-1 + offset)."""
+        def select():
+            view = self._app._view(show_all)
+            start, stop = page_bounds(len(view), limit, offset)
+            return [_task_copy(t) for t in view[start:stop]]
+        return await self.run(select)
+
+    async def search(self, query: str) -> List[Dict]:
+        """Return the tasks whose title or description contains query, ignoring case."""
+        return await self.run(lambda: [_task_copy(t) for t in self._app.find_todos(query)])
+
+    async def counts(self) -> Tuple[int, int]:
+        """Return (total, completed) task counts."""
+        return await self.run(self._app._counts)
+
+    # Changes
+
+    async def add(self, title: str, description: str = '') -> Dict:
+        """Add a task and return it, with the ID it was saved under."""
+        if not title.strip():
+            raise ValueError("Task title cannot be empty")
+
+        def add():
+            todo = {
+                'id': self._app.get_next_id(),
+                'title': title,
+                'description': description,
+                'completed': False,
+                'created_at': datetime.now().isoformat(),
+                'completed_at': None,
+            }
+            self._app._perform({'op': 'add', 'task': todo})
+            # Applied to the batch the change joined (see _apply_change)
+            return self._app.todos[-1]
+
+        def saved(added: Task) -> Dict:
+            # The flush renumbers it when it reorders, and replaces it when it
+            # rebases onto another writer's tasks (see TodoApp._rebase)
+            if self._app._find_todo(added.id) is added:
+                return _task_copy(added)
+            identity = task_identity(added)
+            found = next((t for t in self._app.todos if task_identity(t) == identity), added)
+            return _task_copy(found)
+        return await self.run(saved, await self._change(add))
+
+    def _resolve(self, display_ids: List[int], show_all: bool) -> List[Task]:
+        found = self._app._get_todos_by_display_ids(display_ids, show_all)
+        missing = [str(display_id) for display_id, todo in zip(display_ids, found) if todo is None]
+        if missing:
+            raise ValueError(f"Task(s) {', '.join(missing)} not found")
+        unique = {id(todo): todo for todo in found}
+        return list(unique.values())
+
+    async def complete(self, display_ids: List[int]) -> List[Dict]:
+        """Complete tasks by display ID (as in list()); return those newly completed.
+
+        Raises ValueError, changing nothing, if an ID does not exist.
+        """
+        def complete():
+            todos = [t for t in self._resolve(display_ids, False) if not t['completed']]
+            if todos:
+                self._app._perform({
+                    'op': 'complete',
+                    'ids': [t['id'] for t in todos],
+                    'completed_at': datetime.now().isoformat(),
+                }, todos)
+            return [_task_copy(t) for t in todos]
+        return await self._change(complete)
+
+    async def delete(self, display_ids: List[int], show_all: bool = False) -> List[Dict]:
+        """Delete tasks by display ID (as in list(show_all)); return the deleted tasks.
+
+        Raises ValueError, changing nothing, if an ID does not exist.
+        """
+        def delete():
+            todos = self._resolve(display_ids, show_all)
+            deleted = [_task_copy(t) for t in todos]
+            self._app._perform({'op': 'delete', 'ids': [t['id'] for t in todos]}, todos)
+            return deleted
+        return await self._change(delete)
 
 
 def build_parser() -> argparse.ArgumentParser:
     """Construct and return the argument parser (without parsing)."""
+    import argparse
     parser = argparse.ArgumentParser(
         description="A simple CLI task application",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -307,12 +3176,36 @@ Examples:
     task add Buy groceries -d milk, eggs, bread
     task list
     task list --all
+    task list --limit 20 --offset 40
     task search groceries
     task complete 1 2 etc.
     task delete 1 2 etc.
     task delete --all
+    task --storage journal add Buy groceries
+    task convert tasks.bin
+    task import tasks.csv
+    task export --format csv --status completed
+    task serve
+    task --profile list --all
+    task --batch commands.txt
+    task --summarizer local add Plan the offsite -d Book a venue for twenty people...
         """
     )
+    # Global options; main() also extracts these itself before dispatching
+    parser.add_argument('--file', metavar='PATH', help='Data file to use (default: tasks.json next to this script)')
+    parser.add_argument('--storage', choices=sorted(STORAGE_BACKENDS),
+                        help='Storage backend; converts the data file if it uses a different one')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Run the commands in FILE ('-': stdin) and save once at the end; "
+                             "used for stdin when commands are piped in")
+    parser.add_argument('--save-every', type=int, metavar='N',
+                        help='With --batch, also save after every N commands')
+    parser.add_argument('--profile', nargs='?', const='1', metavar='TRACE',
+                        help=f'Print the time and memory of each phase to stderr, or with --profile=TRACE '
+                             f'write them to TRACE as JSON (also set by ${PROFILE_ENV})')
+    parser.add_argument('--summarizer', choices=sorted(SUMMARIZERS),
+                        help=f'Summarize long descriptions of added tasks in the background, '
+                             f'for the list table (also set by ${SUMMARIZER_ENV})')
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -329,6 +3222,13 @@ Examples:
     # Search command
     search_parser = subparsers.add_parser('search', help='Search tasks')
     search_parser.add_argument('query', help='Search query')
+
+    # Paging options shared by list and search
+    for paged_parser in (list_parser, search_parser):
+        paged_parser.add_argument('--limit', type=int, metavar='N', help='Show at most N tasks')
+        paged_parser.add_argument('--offset', type=int, default=0, metavar='N', help='Skip the first N tasks')
+        paged_parser.add_argument('--pager', action='store_true',
+                                  help=f'Show the output in $PAGER (default: {DEFAULT_PAGER}) on a terminal')
     
     # Complete command
     complete_parser = subparsers.add_parser('complete', help='Mark a task as completed')
@@ -341,10 +3241,67 @@ Examples:
 
     # Clean command
     clean_parser = subparsers.add_parser('clean', help='Remove all completed tasks')
+
+    # Convert command
+    convert_parser = subparsers.add_parser('convert', help='Copy all tasks to a new data file in another format')
+    convert_parser.add_argument('dest', help='File to create')
+    convert_parser.add_argument('--to', choices=sorted(STORAGE_BACKENDS),
+                                help='Format to write (default: json for .json, sqlite for .db/.sqlite/.sqlite3, otherwise binary)')
+    
+
+    # Import command
+    import_parser = subparsers.add_parser('import', help='Add tasks from a CSV or JSON Lines file')
+    import_parser.add_argument('file', nargs='?', default='-', help="File to read (default: '-', standard input)")
+    import_parser.add_argument('--format', choices=('csv', 'jsonl'),
+                               help='Input format (default: from the extension, else detected from the content)')
+
+    # Export command
+    export_parser = subparsers.add_parser('export', help='Write tasks as JSON Lines or CSV')
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, default='jsonl',
+                               help='Output format (default: jsonl; ndjson is the same)')
+    export_parser.add_argument('--status', choices=sorted(EXPORT_STATUSES), default='all',
+                               help='Which tasks to write (default: all)')
+    export_parser.add_argument('-o', '--output', metavar='FILE', default='-',
+                               help="File to write (default: '-', standard output)")
+
+    # Serve command
+    subparsers.add_parser('serve', help='Keep the store loaded and run other task commands against it')
     
     return parser
 
 
+def extract_global_options(argv: List[str]) -> tuple:
+    """Split leading global options (--file, --storage, --batch, --save-every,
+    --profile, --summarizer) off argv.
+
+    Returns (remaining_argv, options_dict). Done by hand because the add
+    command bypasses argparse to support unquoted multi-word titles.
+    `--profile` takes a value only as `--profile=TRACE`; on its own it is '1'.
+    """
+    options: Dict[str, Any] = {'file': None, 'storage': None, 'batch': None, 'save_every': None, 'profile': None,
+                               'summarizer': None}
+    argv = list(argv)
+    while argv and argv[0].split('=', 1)[0] in ('--file', '--storage', '--batch', '--save-every', '--profile',
+                                                '--summarizer'):
+        name, sep, value = argv.pop(0).partition('=')
+        if name == '--profile':
+            value = value if sep else '1'
+        elif not sep:
+            if not argv:
+                raise ValueError(f"{name} requires a value")
+            value = argv.pop(0)
+        options[name[2:].replace('-', '_')] = value
+    if options['storage'] and options['storage'] not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {options['storage']}")
+    if options['summarizer'] and options['summarizer'] not in SUMMARIZERS:
+        raise ValueError(f"Unknown summarizer: {options['summarizer']}")
+    if options['save_every'] is not None:
+        if not (options['save_every'].isdigit() and int(options['save_every']) > 0):
+            raise ValueError(f"--save-every must be a positive number, not {options['save_every']!r}")
+        options['save_every'] = int(options['save_every'])
+    return argv, options
+
+
 def parse_add_command(argv: List[str]) -> tuple:
     """Custom parser for add command to handle unquoted multi-word titles and descriptions."""
     if not argv or argv[0] != 'add':
@@ -370,54 +3327,113 @@ def parse_add_command(argv: List[str]) -> tuple:
     return title, description
 
 
-def dispatch_command(app: TodoApp, args: argparse.Namespace) -> None:
-    """Dispatch a parsed argparse Namespace to the appropriate handler."""
-    if args.command == 'add':
-        # Handle multi-word title and description
-        title = ' '.join(args.title) if isinstance(args.title, list) else args.title
-        description = ' '.join(args.description) if isinstance(args.description, list) else args.description
-        app.add_todo(title, description)
-    elif args.command == 'list':
-        app.list_todos(show_all=getattr(args, 'all', False))
-    elif args.command == 'search':
-        app.search_todos(args.query)
-    elif args.command == 'complete':
-        if isinstance(args.id, list):
-            app.complete_todos(args.id)
-        else:
-            app.complete_todo(args.id)
-    elif args.command == 'delete':
-        # Support deleting all, or specific display IDs
-        if getattr(args, 'all', False):
-            removed = len(app.todos)
-            app.todos = []
-            app.save_todos()
-            print(f"✗ Deleted all tasks ({removed} removed)")
-        else:
-            # Default behavior: delete from incomplete tasks list by display IDs
-            if len(args.id) == 0:
-                print("Error: Provide at least one ID or use --all to delete everything")
-                return
-            if len(args.id) == 1:
-                app.delete_todo(args.id[0], show_all=False)
-            else:
-                app.delete_todos(args.id, show_all=False)
-    elif args.command == 'clean':
-        before = len(app.todos)
-        app.todos = [t for t in app.todos if not t['completed']]
-        removed = before - len(app.todos)
-        # After cleaning, reindex automatically
-        app.reindex()
-        print(f"🧹 Removed {removed} completed task(s)")
+def parse_common_command(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse the everyday command forms without argparse, or return None.
+
+    Covers `list [-a|--all]`, `search QUERY`, `complete N...`,
+    `delete N...`, `delete --all` and `clean` with plain decimal IDs, and
+    returns the same attributes build_parser() would. Anything else (help,
+    abbreviations, errors) returns None and goes through argparse, so its
+    output is unchanged.
+    """
+    command, rest = argv[0], argv[1:]
+    ids = [int(arg) for arg in rest] if all(arg.isascii() and arg.isdigit() for arg in rest) else None
+    if command == 'list' and (not rest or (len(rest) == 1 and rest[0] in ('-a', '--all'))):
+        fields = {'all': bool(rest), 'limit': None, 'offset': 0, 'pager': False}
+    elif command == 'search' and len(rest) == 1 and not rest[0].startswith('-'):
+        fields = {'query': rest[0], 'limit': None, 'offset': 0, 'pager': False}
+    elif command == 'complete' and rest and ids:
+        fields = {'id': ids}
+    elif command == 'delete' and rest == ['--all']:
+        fields = {'id': [], 'all': True}
+    elif command == 'delete' and rest and ids:
+        fields = {'id': ids, 'all': False}
+    elif command == 'clean' and not rest:
+        fields = {}
     else:
-        print("Unknown command. Type 'help' for usage.")
+        return None
+    # Global options were already taken off argv (see extract_global_options)
+    return SimpleNamespace(file=None, storage=None, batch=None, save_every=None, profile=None,
+                           summarizer=None, command=command, **fields)
+
+
+def command_scope(args: argparse.Namespace) -> str:
+    """Return how much of the store a parsed command needs loaded (see LOAD_SCOPES)."""
+    if args.command == 'list':
+        return 'all' if getattr(args, 'all', False) else 'incomplete'
+    if args.command == 'search':
+        return 'none'
+    if args.command == 'export':
+        return 'stream'
+    return 'all'
+
+
+def dispatch_command(app: TodoApp, args: argparse.Namespace) -> bool:
+    """Dispatch a parsed argparse Namespace to the appropriate handler.
+
+    Problems are printed as "Error: ..." lines; returns False if the
+    command failed (in part), so that callers need not read its output.
+    """
+    try:
+        if args.command == 'add':
+            # Handle multi-word title and description
+            title = ' '.join(args.title) if isinstance(args.title, list) else args.title
+            description = ' '.join(args.description) if isinstance(args.description, list) else args.description
+            app.add_todo(title, description)
+        elif args.command == 'list':
+            with paged_output(getattr(args, 'pager', False)) as out:
+                app.list_todos(show_all=getattr(args, 'all', False), limit=getattr(args, 'limit', None),
+                               offset=getattr(args, 'offset', 0), out=out)
+        elif args.command == 'search':
+            with paged_output(getattr(args, 'pager', False)) as out:
+                app.search_todos(args.query, limit=getattr(args, 'limit', None),
+                                 offset=getattr(args, 'offset', 0), out=out)
+        elif args.command == 'complete':
+            if isinstance(args.id, list):
+                return app.complete_todos(args.id)
+            return app.complete_todo(args.id)
+        elif args.command == 'delete':
+            # Support deleting all, or specific display IDs
+            if getattr(args, 'all', False):
+                removed = app.delete_all()
+                print(f"✗ Deleted all tasks ({removed} removed)")
+            else:
+                # Default behavior: delete from incomplete tasks list by display IDs
+                if len(args.id) == 0:
+                    print("Error: Provide at least one ID or use --all to delete everything")
+                    return False
+                if len(args.id) == 1:
+                    return app.delete_todo(args.id[0], show_all=False)
+                return app.delete_todos(args.id, show_all=False)
+        elif args.command == 'clean':
+            removed = app.clean()
+            print(f"🧹 Removed {removed} completed task(s)")
+        elif args.command == 'convert':
+            return app.convert(args.dest, args.to)
+        elif args.command == 'import':
+            return app.import_tasks(args.file, args.format) is not None
+        elif args.command == 'export':
+            app.export_tasks(args.output, args.format, args.status)
+        else:
+            print("Unknown command. Type 'help' for usage.")
+            return False
+    except StoreConflict as e:
+        # Nothing was saved; the store is left as the other process wrote it
+        print(f"Error: {e}")
+        return False
+    return True
 
 
 def _print_help_with_repl_options(parser: argparse.ArgumentParser) -> None:
     """Print argparse help text, injecting REPL-only options under 'options:'."""
     help_text = parser.format_help()
     marker = "\noptions:\n"
-    insert_line = "  quit, exit, q         exit the interactive prompt\n"
+    insert_line = (
+        "  quit, exit, q         exit the interactive prompt\n"
+        "  begin                 start a batch: defer reindexing and saving\n"
+        "  commit                save everything done since 'begin'\n"
+        "  rollback              discard everything done since 'begin'\n"
+    )
     if marker in help_text:
         idx = help_text.find(marker) + len(marker)
         help_text = help_text[:idx] + insert_line + help_text[idx:]
@@ -426,8 +3442,12 @@ def _print_help_with_repl_options(parser: argparse.ArgumentParser) -> None:
     print(help_text)
 
 
-def repl(parser: argparse.ArgumentParser, app: TodoApp) -> None:
-    """Start an interactive REPL to accept commands repeatedly."""
+def repl(parser: argparse.ArgumentParser, app: TodoApp, profiler: Optional[Profiler] = None) -> None:
+    """Start an interactive REPL to accept commands repeatedly.
+
+    With a profiler that prints summaries, each command's phases are
+    printed after it runs.
+    """
     print("Task CLI interactive mode. Type 'help' to see commands, 'exit' to quit.\n")
     # Access subcommand names for help
     try:
@@ -445,82 +3465,520 @@ def repl(parser: argparse.ArgumentParser, app: TodoApp) -> None:
             continue
         if line.lower() in {"exit", "quit", "q"}:
             break
-        if line.lower().startswith("help"):
-            parts = line.split(maxsplit=1)
-            if len(parts) == 1:
-                _print_help_with_repl_options(parser)
-                print("Commands:", ", ".join(sorted(sub_map.keys())) if sub_map else "add, list, search, complete, delete, clean")
+        with phase('command', line=line):
+            repl_line(parser, app, line, sub_map)
+        if profiler is not None and not profiler.trace_path:
+            profiler.report(line)
+    
+    if app.in_batch:
+        print(f"Discarded {app.rollback()} uncommitted change(s)")
+    app.wait_summaries()
+
+
+def repl_line(parser: argparse.ArgumentParser, app: TodoApp, line: str, sub_map: Dict) -> None:
+    """Run one non-empty REPL line other than exit."""
+    import shlex
+    if line.lower() in {"begin", "commit", "rollback"}:
+        try:
+            count = getattr(app, line.lower())()
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+        if line.lower() == 'begin':
+            print("Batch started. Changes are saved on 'commit'.")
+        elif line.lower() == 'commit':
+            print(f"Committed {count} change(s)")
+        else:
+            print(f"Rolled back {count} change(s)")
+        return
+    if line.lower().startswith("help"):
+        parts = line.split(maxsplit=1)
+        if len(parts) == 1:
+            _print_help_with_repl_options(parser)
+            print("Commands:", ", ".join(sorted(sub_map.keys())) if sub_map else "add, list, search, complete, delete, clean")
+        else:
+            cmd = parts[1].strip()
+            sub = sub_map.get(cmd)
+            if sub is not None:
+                print(sub.format_help())
             else:
-                cmd = parts[1].strip()
-                sub = sub_map.get(cmd)
-                if sub is not None:
-                    print(sub.format_help())
-                else:
-                    print(f"No such command: {cmd}")
-            continue
-        
-        # Parse and execute command line
+                print(f"No such command: {cmd}")
+        return
+    
+    # Parse and execute command line
+    try:
+        argv = shlex.split(line)
+    except ValueError as e:
+        print(f"Parse error: {e}")
+        return
+    
+    # Handle add command with custom parsing for multi-word titles/descriptions
+    if argv and argv[0] == 'add':
+        add_from_argv(app, argv)
+        return
+    
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit:
+        # argparse attempted to exit on error; show help-like message and continue
+        return
+    if not getattr(args, 'command', None):
+        print("Please enter a command. Type 'help' for usage.")
+        return
+    dispatch_command(app, args)
+
+
+def parse_batch_line(parser: argparse.ArgumentParser, line: str) -> Tuple[str, Any]:
+    """Parse one line of a batch script, raising ValueError if it is invalid.
+
+    Returns ('add', (title, description)), ('commit', None) or
+    ('command', namespace) for dispatch_command.
+    """
+    import io
+    import shlex
+    from contextlib import redirect_stderr, redirect_stdout
+    try:
+        argv = shlex.split(line)
+    except ValueError as e:
+        raise ValueError(f"Parse error: {e}") from None
+    if argv == ['commit']:
+        return 'commit', None
+    if argv[0] in ('begin', 'rollback', 'help', 'serve'):
+        raise ValueError(f"{argv[0]} is not available in batch mode")
+    if argv[0] == 'add':
+        title, description = parse_add_command(argv)
+        if not title:
+            raise ValueError("Task title cannot be empty")
+        return 'add', (title, description)
+    args = parse_common_command(argv)
+    if args is None:
+        # argparse prints its error (or help) and exits; keep just the message
+        captured = io.StringIO()
         try:
-            argv = shlex.split(line)
-        except ValueError as e:
-            print(f"Parse error: {e}")
-            continue
-        
-        # Handle add command with custom parsing for multi-word titles/descriptions
-        if argv and argv[0] == 'add':
+            with redirect_stderr(captured), redirect_stdout(captured):
+                args = parser.parse_args(argv)
+        except SystemExit:
+            message = captured.getvalue().strip().splitlines()
+            raise ValueError(message[-1].split('error: ', 1)[-1] if message else "invalid command") from None
+        if not args.command:
+            raise ValueError("no command given")
+    return 'command', args
+
+
+def run_batch(app: TodoApp, source: str, save_every: Optional[int] = None,
+              parser: Optional[argparse.ArgumentParser] = None,
+              profiler: Optional[Profiler] = None) -> int:
+    """Run the commands in a script file ('-': stdin) as one batch; return an exit status.
+
+    Every line is parsed before anything runs; if any is invalid the errors
+    are listed by line and nothing runs (status 2). Blank lines and lines
+    starting with '#' are skipped, and `exit` ends the script. Commands then
+    run one after another against the in-memory store, which is reindexed
+    and saved once at the end, after every `save_every` commands, and at
+    each `commit` line. A command fails if its handler says so (see
+    dispatch_command) or it exits; failures are listed on stderr by line
+    and the rest still run (status 1 if any failed, else 0).
+    """
+    parser = parser or build_parser()
+    try:
+        if source == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error: Could not read {source}: {e}")
+        return 2
+
+    commands = []
+    errors = []
+    with phase('parse'):
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.lower() in {"exit", "quit", "q"}:
+                break
             try:
-                title, description = parse_add_command(argv)
-                if not title:
-                    print("Error: Task title cannot be empty")
-                    continue
-                app.add_todo(title, description)
+                commands.append((lineno, line) + parse_batch_line(parser, line))
             except ValueError as e:
-                print(f"Parse error: {e}")
-            continue
-        
+                errors.append(f"line {lineno}: {e}")
+    if errors:
+        for error in errors[:IMPORT_MAX_ERRORS]:
+            print(f"Error: {error}")
+        if len(errors) > IMPORT_MAX_ERRORS:
+            print(f"... and {len(errors) - IMPORT_MAX_ERRORS} more")
+        print(f"Nothing run: {len(errors)} invalid line(s)")
+        return 2
+
+    failed = []
+    ran = 0
+    try:
+        app.begin(snapshot=False)
+        pending = 0
+        for lineno, line, kind, payload in commands:
+            if kind == 'commit':
+                app.commit()
+                app.begin(snapshot=False)
+                pending = 0
+                continue
+            ran += 1
+            error = None
+            with phase('command', line=line):
+                try:
+                    if kind == 'add':
+                        app.add_todo(*payload)
+                    elif not dispatch_command(app, payload):
+                        error = "failed"
+                except SystemExit as e:
+                    error = f"exited with status {e.code}"
+            if error:
+                failed.append((lineno, line, error))
+            if profiler is not None and not profiler.trace_path:
+                profiler.report(line)
+            pending += 1
+            if save_every and pending >= save_every:
+                app.commit()
+                app.begin(snapshot=False)
+                pending = 0
+        app.commit()
+        app.wait_summaries()
+    except StoreConflict as e:
+        print(f"Error: {e}")
+        return 1
+
+    for lineno, line, error in failed:
+        print(f"line {lineno}: {line}: {error}", file=sys.stderr)
+    print(f"Ran {ran} command(s), {len(failed)} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def daemon_socket_path(data_file: str) -> str:
+    """Return the Unix socket a `task serve` daemon for data_file listens on.
+
+    The socket sits next to the data file (``<data_file>.sock``), so a client
+    finds the daemon for the store it was pointed at. Paths too long for a
+    socket address use a per-user name in the temp directory instead.
+    """
+    data_file = os.path.abspath(data_file)
+    path = data_file + DAEMON_SUFFIX
+    if len(os.fsencode(path)) > DAEMON_PATH_MAX:
+        import tempfile
+        import zlib
+        digest = zlib.crc32(os.fsencode(data_file))
+        path = os.path.join(tempfile.gettempdir(), f"tasks3-{os.getuid()}-{digest:08x}{DAEMON_SUFFIX}")
+    return path
+
+
+def run_command(app: TodoApp, argv: List[str], parser: Optional[argparse.ArgumentParser] = None) -> bool:
+    """Run one command line (global options already removed) against an open app; return False if it failed."""
+    if argv[0] == 'add':
+        return add_from_argv(app, argv)
+    args = parse_common_command(argv)
+    if args is None:
+        parser = parser or build_parser()
+        args = parser.parse_args(argv)
+        if not args.command:
+            parser.print_help()
+            return True
+    return dispatch_command(app, args)
+
+
+def add_from_argv(app: TodoApp, argv: List[str]) -> bool:
+    """Handle an `add ...` command line, printing parse errors; return False if it failed."""
+    try:
+        title, description = parse_add_command(argv)
+        if not title:
+            print("Error: Task title cannot be empty")
+            return False
+        app.add_todo(title, description)
+    except ValueError as e:
+        print(f"Parse error: {e}")
+        return False
+    return True
+
+
+def _store_fingerprint(app: TodoApp) -> List[Optional[Tuple[int, int]]]:
+    """Size and mtime of each of the app's storage files (None if missing)."""
+    fingerprint = []
+    for path in app.storage.files():
         try:
-            args = parser.parse_args(argv)
-        except SystemExit:
-            # argparse attempted to exit on error; show help-like message and continue
-            continue
-        if not getattr(args, 'command', None):
-            print("Please enter a command. Type 'help' for usage.")
-            continue
-        dispatch_command(app, args)
+            st = os.stat(path)
+        except OSError:
+            fingerprint.append(None)
+        else:
+            fingerprint.append((st.st_size, st.st_mtime_ns))
+    return fingerprint
+
+
+def _read_message(conn) -> Optional[Dict]:
+    """Read one newline-terminated JSON message from a socket (None if cut short)."""
+    chunks = []
+    while True:
+        chunk = conn.recv(1 << 16)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        if chunk.endswith(b'\n'):
+            return json.loads(b''.join(chunks))
+
+
+def serve(app: TodoApp, path: str) -> None:
+    """Keep app loaded and run commands sent by `task` clients over a Unix socket.
+
+    Requests are handled one at a time, in arrival order, so commands from
+    concurrent clients never interleave. Each request is a JSON line with
+    the client's argv and working directory. The reply holds the command's
+    output and exit status. If another process changes the store files, the
+    store is reloaded before the next command rather than overwritten.
+    """
+    import io
+    import signal
+    import socket
+    from contextlib import redirect_stderr, redirect_stdout
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: Daemon mode needs Unix-domain sockets, which this platform lacks")
+        sys.exit(1)
+    if forward_to_daemon(path, None) is not None:
+        print(f"Error: A daemon is already serving {app.data_file} on {path}")
+        sys.exit(1)
+    try:
+        os.unlink(path)  # left behind by a daemon that did not shut down cleanly
+    except FileNotFoundError:
+        pass
+    # Taken before clients can find the socket, so that a write they make
+    # once it exists is seen as a change
+    fingerprint = _store_fingerprint(app)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Only the owner may connect: clients act on their behalf
+    umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen(DAEMON_BACKLOG)
+    bound = os.stat(path).st_ino
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, stop)
+
+    parser = build_parser()
+    home = os.getcwd()
+    print(f"Serving {app.data_file} on {path}. Press Ctrl+C to stop.", flush=True)
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                # A client that never sends (a suspended shell) must not
+                # hold up everyone else; timeouts are OSErrors
+                conn.settimeout(DAEMON_REQUEST_TIMEOUT)
+                try:
+                    request = _read_message(conn)
+                except (OSError, ValueError):
+                    continue
+                if not request or not request.get('argv'):
+                    # Liveness probe (see forward_to_daemon) or a broken request
+                    continue
+                output = io.StringIO()
+                status = 0
+                with redirect_stdout(output), redirect_stderr(output):
+                    try:
+                        if _store_fingerprint(app) != fingerprint:
+                            # Summaries in progress are saved before reloading
+                            app.wait_summaries()
+                            app = TodoApp(app.data_file, summarizer=app.summarizer)
+                        os.chdir(request.get('cwd') or home)
+                        if not run_command(app, request['argv'], parser):
+                            status = 1
+                    except SystemExit as e:
+                        status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                    except Exception as e:
+                        print(f"Error: {e}")
+                        status = 1
+                    finally:
+                        os.chdir(home)
+                fingerprint = _store_fingerprint(app)
+                reply = json.dumps({'output': output.getvalue(), 'status': status}) + '\n'
+                try:
+                    conn.sendall(reply.encode())
+                except OSError:
+                    pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        app.wait_summaries()
+        try:
+            # Only remove the socket if it is still ours
+            if os.stat(path).st_ino == bound:
+                os.unlink(path)
+        except OSError:
+            pass
+        print("Daemon stopped.")
+
+
+def forward_to_daemon(path: str, argv: Optional[List[str]], pager: bool = False) -> Optional[int]:
+    """Run argv on the daemon listening on path and print its output.
+
+    Returns the command's exit status, or None when no daemon is running
+    (the caller then runs the command itself). argv None only checks that
+    a daemon answers. Once a request has been sent it is never retried
+    directly, since the daemon may already have applied it. With `pager`
+    the output is shown in the pager here, since the daemon has no
+    terminal (see paged_output).
+    """
+    if not os.path.exists(path):
+        return None
+    import socket
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(DAEMON_CONNECT_TIMEOUT)
+        try:
+            conn.connect(path)
+        except OSError:
+            # Stale socket left by a daemon that is gone
+            return None
+        if argv is None:
+            return 0
+        conn.settimeout(None)
+        try:
+            conn.sendall(json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode() + b'\n')
+            reply = _read_message(conn)
+        except (OSError, ValueError):
+            reply = None
+    finally:
+        conn.close()
+    if reply is None:
+        print(f"Error: Lost connection to the task daemon on {path}")
+        return 1
+    with paged_output(pager) as out:
+        out.write(reply['output'])
+    return reply['status']
+
+
+def open_app(options: Dict[str, Any], scope: str = 'all') -> TodoApp:
+    """Create the TodoApp selected by the global options, exiting on bad options."""
+    try:
+        # --summarizer, else the environment
+        name = options.get('summarizer') or os.environ.get(SUMMARIZER_ENV)
+        return TodoApp(options['file'], storage=options['storage'], scope=scope,
+                       summarizer=make_summarizer(name))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+    except ImportError as e:
+        # An optional dependency of the chosen summarizer is not installed
+        print(f"Error: {e}")
+        sys.exit(1)
 
 
 def main():
     """Main entry point for the CLI application."""
-    parser = build_parser()
+    started = perf_counter()
+    try:
+        argv, options = extract_global_options(sys.argv[1:])
+    except ValueError as e:
+        print(f"Parse error: {e}")
+        sys.exit(2)
+    
+    # --profile, else the environment (which also reaches the REPL); '0' is off
+    target = options['profile'] if options['profile'] is not None else os.environ.get(PROFILE_ENV)
+    if not target or target == '0':
+        run_main(argv, options)
+        return
+    with Profiler(None if target == '1' else target) as profiler:
+        profiler.record('startup', _MODULE_START, started)
+        run_main(argv, options, profiler)
+
+
+def run_main(argv: List[str], options: Dict[str, Any], profiler: Optional[Profiler] = None) -> None:
+    """Run the REPL, a batch script or the one-shot command in argv (global options already removed)."""
+    # Commands piped in with no command given run as a script, like --batch -
+    source = options['batch']
+    if source is None and not argv and sys.stdin is not None and not sys.stdin.isatty():
+        source = '-'
+    if source is not None:
+        if argv:
+            print("Error: --batch cannot be combined with a command")
+            sys.exit(2)
+        with phase('open'):
+            app = open_app(options)
+        status = run_batch(app, source, options['save_every'], profiler=profiler)
+        if status:
+            sys.exit(status)
+        return
     
     # If no args provided, start REPL; else process one-shot command
-    if len(sys.argv) == 1:
-        app = TodoApp()
-        repl(parser, app)
+    if not argv:
+        with phase('open'):
+            app = open_app(options)
+        repl(build_parser(), app, profiler)
         return
     
+    if argv[0] == 'serve':
+        build_parser().parse_args(argv)
+        # Absolute, since clients' working directories differ from the daemon's
+        if options['file']:
+            options['file'] = os.path.abspath(options['file'])
+        app = open_app(options)
+        serve(app, daemon_socket_path(app.data_file))
+        return
+
+    # A running `task serve` daemon for this store already has it loaded.
+    # --storage may convert the store, and import and export stream this
+    # process's standard input and output, so those are always handled here,
+    # as are profiled commands, whose phases would run in the daemon, and
+    # --summarizer, which the daemon was not started with.
+    if (options['storage'] is None and options.get('summarizer') is None and profiler is None
+            and argv[0] not in ('import', 'export')):
+        data_file = options['file'] or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tasks.json')
+        pager = argv[0] in ('list', 'search') and '--pager' in argv[1:]
+        status = forward_to_daemon(daemon_socket_path(data_file), argv, pager)
+        if status is not None:
+            if status:
+                sys.exit(status)
+            return
+
     # Handle add command with custom parsing for multi-word titles/descriptions
-    if len(sys.argv) > 1 and sys.argv[1] == 'add':
-        app = TodoApp()
-        try:
-            title, description = parse_add_command(sys.argv[1:])
-            if not title:
-                print("Error: Task title cannot be empty")
-                return
-            app.add_todo(title, description)
-        except ValueError as e:
-            print(f"Parse error: {e}")
+    if argv[0] == 'add':
+        with phase('open'):
+            app = open_app(options, scope='append')
+        summarizer = app.summarizer
+        if app.rewrites_store():
+            # Saving the summary would write the whole file a second time
+            app.summarizer = None
+        with phase('command', line='add'):
+            added = add_from_argv(app, argv)
+        if added and summarizer is not None and app.summarizer is None:
+            if needs_summary({'description': parse_add_command(argv)[1]}):
+                print(f"Warning: no summary made: a one-shot add to {app.storage.name} storage would have to "
+                      "rewrite the file again to save it (use journal or sqlite storage, the REPL or serve)",
+                      file=sys.stderr)
+        # The task is saved and reported; its summary is saved before exiting
+        app.wait_summaries(ONE_SHOT_SUMMARY_WAIT)
+        if not added:
+            sys.exit(1)
         return
     
-    args = parser.parse_args()
-    if not args.command:
-        parser.print_help()
-        return
+    # Common commands skip building the argparse tree (startup time matters
+    # for shell hooks that run the CLI many times)
+    with phase('parse'):
+        args = parse_common_command(argv)
+        if args is None:
+            parser = build_parser()
+            args = parser.parse_args(argv)
+            if not args.command:
+                parser.print_help()
+                return
     
-    # Initialize the app
-    app = TodoApp()
-    dispatch_command(app, args)
-
+    # Initialize the app, loading only what the command needs
+    with phase('open'):
+        app = open_app(options, scope=command_scope(args))
+    with phase('command', line=args.command):
+        ok = dispatch_command(app, args)
+    if not ok:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pathlib import Path
+import importlib.util
+import types
+
+import pytest
+
+TASK_PY = Path(__file__).resolve().parents[1] / "task.py"
+
+
+def load_task_module() -> types.ModuleType:
+    """Dynamically load the CLI module at tasks3/task.py for testing."""
+    spec = importlib.util.spec_from_file_location("task_cli", TASK_PY)
+    assert spec and spec.loader, "Failed to load task.py"
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[assignment]
+    return module
+
+
+@pytest.fixture()
+def task():
+    """A freshly loaded task.py module, so module state does not leak between tests."""
+    return load_task_module()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+
+def test_round_trip(task, tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        async with await task.AsyncTodoApp.open(str(path)) as app:
+            first = await app.add("Buy milk", "2 litres")
+            await app.add("Write report")
+            await app.add("Call bob")
+            assert first["id"] == 1 and first["title"] == "Buy milk"
+            assert [t["title"] for t in await app.search("REPORT")] == ["Write report"]
+            done = await app.complete([1])
+            assert [t["title"] for t in done] == ["Buy milk"]
+            assert [t["title"] for t in await app.list()] == ["Write report", "Call bob"]
+            deleted = await app.delete([2])
+            assert [t["title"] for t in deleted] == ["Call bob"]
+            assert await app.counts() == (2, 1)
+            assert [t["title"] for t in await app.list(show_all=True, limit=1, offset=1)] == ["Buy milk"]
+
+    asyncio.run(scenario())
+    saved = json.loads(path.read_text())
+    assert [(t["id"], t["title"], t["completed"]) for t in saved] == [(1, "Write report", False), (2, "Buy milk", True)]
+
+
+def test_concurrent_changes_share_one_write(task, tmp_path):
+    path = tmp_path / "tasks.json"
+    writes = []
+
+    async def scenario():
+        app = await task.AsyncTodoApp.open(str(path))
+        storage = app.app.storage
+        original = storage.record
+        storage.record = lambda op, todos, stats=None: (writes.append(op), original(op, todos, stats))
+        added = await asyncio.gather(*(app.add(f"Task {i}") for i in range(50)))
+        await app.close()
+        return added
+
+    added = asyncio.run(scenario())
+    assert sorted(t["id"] for t in added) == list(range(1, 51))
+    assert len(writes) == 1 and writes[0]["op"] == "batch" and len(writes[0]["ops"]) == 50
+    assert len(json.loads(path.read_text())) == 50
+
+
+def test_add_returns_id_after_coalesced_reorder(task, tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        async with await task.AsyncTodoApp.open(str(path)) as app:
+            for title in ("A", "B", "C"):
+                await app.add(title)
+            # Saved by one flush, whose reorder moves the completed A last
+            _, added = await asyncio.gather(app.complete([1]), app.add("D"))
+            return added
+
+    added = asyncio.run(scenario())
+    saved = {t["title"]: t["id"] for t in json.loads(path.read_text())}
+    assert added["title"] == "D" and added["id"] == saved["D"] == 3
+
+
+def test_add_returns_id_after_rebase(task, tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        async with await task.AsyncTodoApp.open(str(path)) as app:
+            await app.add("A")
+            # Another process adds before this app's next flush
+            task.TodoApp(str(path)).add_todo("Elsewhere")
+            return await app.add("B")
+
+    added = asyncio.run(scenario())
+    saved = {t["title"]: t["id"] for t in json.loads(path.read_text())}
+    assert added["id"] == saved["B"] == 3
+
+
+def test_slow_save_does_not_block_the_loop(task, tmp_path):
+    async def scenario():
+        app = await task.AsyncTodoApp.open(str(tmp_path / "tasks.json"))
+        storage = app.app.storage
+        original = storage.record
+
+        def slow_record(op, todos, stats=None):
+            time.sleep(0.3)
+            original(op, todos, stats)
+        storage.record = slow_record
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        running = asyncio.create_task(ticker())
+        await app.add("Slow")
+        running.cancel()
+        await app.close()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 10
+
+
+def test_unknown_id_changes_nothing(task, tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        async with await task.AsyncTodoApp.open(str(path)) as app:
+            await app.add("Only")
+            with pytest.raises(ValueError, match="Task\\(s\\) 5 not found"):
+                await app.complete([1, 5])
+            assert (await app.list())[0]["completed"] is False
+
+    asyncio.run(scenario())
+    assert json.loads(path.read_text())[0]["completed"] is False
+
+
+def test_failed_write_raises_and_reloads(task, tmp_path, capsys):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        async with await task.AsyncTodoApp.open(str(path)) as app:
+            await app.add("Saved")
+
+            def fail(op, todos, stats=None):
+                raise OSError("disk full")
+            app.app.storage.record = fail
+            with pytest.raises(OSError, match="Could not save"):
+                await app.add("Lost")
+            assert [t["title"] for t in await app.list()] == ["Saved"]
+
+    asyncio.run(scenario())
+    assert "Error saving todos: disk full" in capsys.readouterr().out
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+
+import pytest
+
+from conftest import TASK_PY
+
+
+def sequence(app):
+    for name in ["A", "B", "C", "D"]:
+        app.add_todo(name)
+    app.complete_todo(1)
+    app.delete_todo(2)
+    app.add_todo("E")
+    app.complete_todos([1, 2])
+
+
+def test_batch_matches_unbatched(task, tmp_path: Path):
+    plain = task.TodoApp(data_file=str(tmp_path / "plain.json"))
+    sequence(plain)
+    batched = task.TodoApp(data_file=str(tmp_path / "batched.json"))
+    with batched.batch():
+        sequence(batched)
+    strip = lambda todos: [(t["id"], t["title"], t["completed"]) for t in todos]
+    assert strip(batched.todos) == strip(plain.todos)
+    saved = json.loads((tmp_path / "batched.json").read_text())
+    assert strip(saved) == strip(plain.todos)
+
+
+def test_batch_defers_saving(task, tmp_path: Path, monkeypatch):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    writes = []
+    original = app.storage.record
+    monkeypatch.setattr(app.storage, "record", lambda op, todos, stats=None: (writes.append(op), original(op, todos, stats)))
+    with app.batch():
+        sequence(app)
+        assert writes == []
+    assert len(writes) == 1 and writes[0]["op"] == "batch"
+
+
+def test_batch_rolls_back_on_error(task, tmp_path: Path):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    app.add_todo("Keep")
+    with pytest.raises(RuntimeError):
+        with app.batch():
+            app.add_todo("Discard")
+            app.complete_todo(1)
+            raise RuntimeError("boom")
+    assert [(t["title"], t["completed"]) for t in app.todos] == [("Keep", False)]
+    reloaded = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    assert [t["title"] for t in reloaded.todos] == ["Keep"]
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.db"])
+def test_batch_replays_from_storage(task, tmp_path: Path, name):
+    data_file = str(tmp_path / name)
+    plain = task.TodoApp(data_file=str(tmp_path / "plain.json"))
+    sequence(plain)
+    storage = None if name.endswith(".db") else "journal"
+    app = task.TodoApp(data_file=data_file, storage=storage)
+    with app.batch():
+        sequence(app)
+    reloaded = task.TodoApp(data_file=data_file)
+    strip = lambda todos: [(t["id"], t["title"], t["completed"]) for t in todos]
+    assert strip(reloaded.todos) == strip(plain.todos)
+
+
+def test_repl_begin_commit(task, tmp_path: Path, monkeypatch, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    lines = iter(["begin", "add One", "add Two", "complete 1", "commit", "begin", "add Three", "rollback", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(lines))
+    task.repl(task.build_parser(), app)
+    out = capsys.readouterr().out
+    assert "Committed 3 change(s)" in out and "Rolled back 1 change(s)" in out
+    saved = json.loads((tmp_path / "tasks.json").read_text())
+    assert [(t["title"], t["completed"]) for t in saved] == [("Two", False), ("One", True)]
+
+
+def run_script(tmp_path: Path, script: str, *args: str):
+    import os
+    import subprocess
+    import sys
+    env = {k: v for k, v in os.environ.items() if k != "TASKS3_PROFILE"}
+    return subprocess.run([sys.executable, str(TASK_PY), "--file", str(tmp_path / "tasks.json"), *args],
+                          input=script, capture_output=True, text=True, env=env)
+
+
+def test_script_saves_once(task, tmp_path: Path, monkeypatch, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    writes = []
+    original = app.storage.record
+    monkeypatch.setattr(app.storage, "record", lambda op, todos, stats=None: (writes.append(op), original(op, todos, stats)))
+    script = tmp_path / "commands.txt"
+    script.write_text("# setup\nadd A\nadd B -d two words\n\nadd C\ncomplete 1\nlist --all\nexit\nadd Never\n")
+    assert task.run_batch(app, str(script)) == 0
+    assert len(writes) == 1 and len(writes[0]["ops"]) == 4
+    captured = capsys.readouterr()
+    assert "Ran 5 command(s), 0 failed" in captured.err
+    saved = json.loads((tmp_path / "tasks.json").read_text())
+    assert [(t["title"], t["description"], t["completed"]) for t in saved] == [
+        ("B", "two words", False), ("C", "", False), ("A", "", True),
+    ]
+
+
+def test_script_saves_every_n_and_at_commit(task, tmp_path: Path, monkeypatch):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    writes = []
+    original = app.storage.record
+    monkeypatch.setattr(app.storage, "record", lambda op, todos, stats=None: (writes.append(op), original(op, todos, stats)))
+    script = tmp_path / "commands.txt"
+    script.write_text("".join(f"add Task {i}\n" for i in range(5)) + "commit\nadd Last\n")
+    assert task.run_batch(app, str(script), save_every=2) == 0
+    assert [len(w.get("ops", [w])) for w in writes] == [2, 2, 1, 1]
+
+
+def test_piped_script_reports_failed_commands(tmp_path: Path):
+    result = run_script(tmp_path, "add One\ncomplete 7\nadd Two\ndelete 9\n")
+    assert result.returncode == 1
+    assert "Error: Task(s) 7 not found" in result.stdout
+    assert "line 2: complete 7: failed" in result.stderr
+    assert "line 4: delete 9: failed" in result.stderr
+    assert "Ran 4 command(s), 2 failed" in result.stderr
+    saved = json.loads((tmp_path / "tasks.json").read_text())
+    assert [t["title"] for t in saved] == ["One", "Two"]
+
+
+def test_script_failures_come_from_handlers(task, tmp_path: Path, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    script = tmp_path / "commands.txt"
+    # An "Error" title is printed but is not a failure; a missing ID is
+    script.write_text("add Error: not really\ncomplete 1\ncomplete 5\n")
+    assert task.run_batch(app, str(script)) == 1
+    err = capsys.readouterr().err
+    assert "line 3: complete 5: failed" in err
+    assert "Ran 3 command(s), 1 failed" in err
+
+
+def test_invalid_script_runs_nothing(tmp_path: Path):
+    script = tmp_path / "commands.txt"
+    script.write_text("add Fine\nadd\nlist --limit x\nrollback\n")
+    result = run_script(tmp_path, "", "--batch", str(script))
+    assert result.returncode == 2
+    assert "Error: line 2: Task title cannot be empty" in result.stdout
+    assert "Error: line 3: argument --limit: invalid int value: 'x'" in result.stdout
+    assert "Error: line 4: rollback is not available in batch mode" in result.stdout
+    assert "Nothing run: 3 invalid line(s)" in result.stdout
+    assert not (tmp_path / "tasks.json").exists() or json.loads((tmp_path / "tasks.json").read_text()) == []
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import subprocess
+import sys
+
+SUITE = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_suite.py"
+
+
+def run_suite(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, str(SUITE), "--sizes", "200", "--repeat", "1", *args],
+                          capture_output=True, text=True)
+
+
+def test_suite_writes_results_for_every_operation(tmp_path):
+    out = tmp_path / "results.json"
+    result = run_suite("--json", str(out))
+    assert result.returncode == 0, result.stderr
+    report = json.loads(out.read_text())
+    assert report["storage"] == "json"
+    timed = {(r["mode"], r["operation"]) for r in report["results"]}
+    assert {op for mode, op in timed if mode == "api"} == {
+        "load_todos", "save_todos", "add_todo", "list_todos", "search_todos",
+        "complete_todos", "delete_todos", "reindex",
+    }
+    assert {op for mode, op in timed if mode == "cli"} == {
+        "add_todo", "list_todos", "search_todos", "complete_todos", "delete_todos",
+    }
+    assert all(r["tasks"] == 200 and r["min_s"] > 0 for r in report["results"])
+
+
+def test_compare_flags_regressions(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    assert run_suite("--mode", "api", "--ops", "reindex", "list_todos", "--json", str(baseline)).returncode == 0
+    report = json.loads(baseline.read_text())
+    assert run_suite("--mode", "api", "--ops", "reindex", "--compare", str(baseline),
+                     "--threshold", "1000").returncode == 0
+    for r in report["results"]:
+        r["min_s"] /= 10_000
+    baseline.write_text(json.dumps(report))
+    result = run_suite("--mode", "api", "--ops", "reindex", "--compare", str(baseline))
+    assert result.returncode == 1
+    assert "1 timing(s) more than 1.25x slower" in result.stdout
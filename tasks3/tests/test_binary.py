@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+
+import pytest
+
+
+RECORDS = [
+    {"id": 1, "title": "Plain", "description": "", "completed": False,
+     "created_at": "2024-01-02T03:04:05.123456", "completed_at": None},
+    {"id": 2, "title": "Ünïcode ✓ 🧹", "description": "line\nbreak\x00nul", "completed": True,
+     "created_at": "2024-01-02T03:04:05+02:00", "completed_at": "2024-02-01T00:00:00"},
+    {"id": 3, "title": "Extra keys", "description": "d", "completed": False,
+     "created_at": None, "completed_at": None, "summary": "short", "tags": ["a", {"b": 1}]},
+    # Not representable in the columns: stored raw
+    {"id": 4, "title": "Numeric flag", "description": "", "completed": 1,
+     "created_at": "2024-01-01T00:00:00", "completed_at": None},
+    {"id": "5", "title": None, "description": "", "completed": False,
+     "created_at": 17, "completed_at": None},
+    {"id": 6, "title": "lone \ud800 surrogate", "description": "", "completed": False,
+     "created_at": "2024-01-01T00:00:00", "completed_at": None},
+    {"id": 2 ** 70, "title": "Big id", "description": "", "completed": False,
+     "created_at": "2024-01-01T00:00:00", "completed_at": None},
+]
+
+
+def as_json(todos):
+    return json.dumps(list(todos), default=lambda t: t.to_dict())
+
+
+def test_binary_round_trip_is_lossless(task, tmp_path: Path):
+    storage = task.BinaryStorage(str(tmp_path / "tasks.bin"))
+    storage.save(RECORDS)
+    assert as_json(storage.load()) == json.dumps(RECORDS)
+    assert as_json(storage.iter_tasks()) == json.dumps(RECORDS)
+    storage.save([])
+    assert storage.load() == []
+
+
+def test_binary_columns_without_a_free_separator(task, tmp_path: Path, capsys):
+    # Every separator candidate occurs in some title: that column falls back to lengths
+    titles = [f"{sep}title{i}" for i, sep in enumerate(task.BinaryStorage.SEPARATORS)]
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    for title in titles:
+        app.add_todo(title, "desc")
+    app.todos[0]["summary"] = "kept"
+    app.set_storage("binary")
+    reopened = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    assert [t["title"] for t in reopened.todos] == titles
+    assert reopened.todos == app.todos
+    assert reopened.todos[0]["summary"] == "kept"
+
+
+def test_binary_file_is_detected_and_used(task, tmp_path: Path, capsys):
+    path = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(path))
+    for name in ["A", "B", "C"]:
+        app.add_todo(name)
+    app.complete_todo(2)
+    app.set_storage("binary")
+    assert path.read_bytes().startswith(task.BinaryStorage.MAGIC)
+    assert task.detect_storage(str(path)) == "binary"
+    reopened = task.TodoApp(data_file=str(path))
+    assert reopened.storage.name == "binary"
+    assert reopened.todos == app.todos
+    reopened.add_todo("D")
+    partial = task.TodoApp(data_file=str(path), scope="incomplete")
+    assert [t["title"] for t in partial._view()] == ["A", "C", "D"]
+
+
+def test_binary_rejects_other_versions_and_corruption(task, tmp_path: Path, capsys):
+    path = tmp_path / "tasks.bin"
+    storage = task.BinaryStorage(str(path))
+    storage.save(RECORDS[:2])
+    data = path.read_bytes()
+    header = len(task.BinaryStorage.MAGIC)
+    path.write_bytes(data[:header] + (2).to_bytes(2, "little") + data[header + 2:])
+    with pytest.raises(ValueError, match="version 2"):
+        storage.load()
+    path.write_bytes(data[:-5])
+    with pytest.raises(ValueError):
+        storage.load()
+    # The app reports it like unparsable JSON
+    app = task.TodoApp(data_file=str(path))
+    assert "Could not parse" in capsys.readouterr().out
+    assert app.todos == []
+
+
+def test_convert_between_json_and_binary(task, tmp_path: Path, capsys):
+    source = tmp_path / "tasks.json"
+    source.write_text(json.dumps(RECORDS, indent=2))
+    app = task.TodoApp(data_file=str(source))
+    original = source.read_text()
+    app.save_todos()
+    assert source.read_text() == original
+
+    assert app.convert(str(tmp_path / "tasks.bin"))
+    binary = task.TodoApp(data_file=str(tmp_path / "tasks.bin"))
+    assert binary.storage.name == "binary"
+    assert binary.convert(str(tmp_path / "back.json"))
+    assert (tmp_path / "back.json").read_text() == original
+
+    assert not app.convert(str(tmp_path / "tasks.bin"))
+    assert "already exists" in capsys.readouterr().out
+
+
+def test_convert_refuses_lossy_format(task, tmp_path: Path, capsys):
+    source = tmp_path / "tasks.json"
+    source.write_text(json.dumps(RECORDS, indent=2))
+    app = task.TodoApp(data_file=str(source))
+    assert not app.convert(str(tmp_path / "tasks.db"))
+    assert "cannot hold these tasks exactly" in capsys.readouterr().out
+    assert not (tmp_path / "tasks.db").exists()
@@ -84,3 +84,13 @@ def test_cli_clean_removes_only_completed(tmp_path: Path):
 	out = r.stdout
 	assert 'A' in out and 'C' in out and 'B' not in out
 
+
+def test_cli_failed_command_exits_nonzero(tmp_path: Path):
+	script = prepare_temp_cli(tmp_path)
+	assert run([sys.executable, str(script), 'add', 'A'], cwd=tmp_path).returncode == 0
+	# Missing IDs and an empty title fail, so shell scripts can tell
+	for argv in (['complete', '9'], ['delete', '9'], ['add', '-d', 'no title'], ['delete', '1', '9']):
+		r = run([sys.executable, str(script), *argv], cwd=tmp_path)
+		assert r.returncode == 1, (argv, r.stdout)
+	# The delete of 1 and 9 still removed A
+	assert 'No tasks found' in run([sys.executable, str(script), 'list', '--all'], cwd=tmp_path).stdout
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+from conftest import TASK_PY
+
+
+def titles(app) -> list:
+    return [t["title"] for t in sorted(app.todos, key=lambda t: t["id"])]
+
+
+def fresh(task, path, **kwargs):
+    return task.TodoApp(str(path), **kwargs)
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "binary", "sqlite"])
+def test_interleaved_adds_keep_both(task, tmp_path, storage):
+    path = tmp_path / ("tasks.db" if storage == "sqlite" else "tasks.json")
+    fresh(task, path, storage=storage).add_todo("Base")
+    first = fresh(task, path)
+    second = fresh(task, path)
+    first.add_todo("From first")
+    # second loaded before first wrote; its add must not discard first's task
+    second.add_todo("From second")
+    app = fresh(task, path)
+    assert titles(app) == ["Base", "From first", "From second"]
+    assert [t["id"] for t in app.todos] == [1, 2, 3]
+
+
+def test_sqlite_reader_does_not_change_version(task, tmp_path, capsys):
+    path = tmp_path / "tasks.db"
+    writer = fresh(task, path)
+    writer.add_todo("A")
+    before = writer.storage.version()
+    reader = fresh(task, path)
+    reader.list_todos()
+    reader.search_todos("a")
+    assert writer.storage.version() == before
+    # So the writer's next change needs no rebase
+    writer._rebase = None
+    writer.complete_todo(1)
+
+
+def test_add_reports_rebased_id(task, tmp_path, capsys):
+    path = tmp_path / "tasks.json"
+    first, second = fresh(task, path), fresh(task, path)
+    first.add_todo("One")
+    second.add_todo("Two")
+    assert "Added task #2: Two" in capsys.readouterr().out
+
+
+def test_complete_follows_renumbered_task(task, tmp_path):
+    path = tmp_path / "tasks.json"
+    app = fresh(task, path)
+    for title in ("A", "B", "C"):
+        app.add_todo(title)
+    stale = fresh(task, path)
+    # Another process completes A: B and C move up to display IDs 1 and 2
+    fresh(task, path).complete_todo(1)
+    # stale still shows C as #3
+    stale.complete_todo(3)
+    done = {t["title"]: t["completed"] for t in fresh(task, path).todos}
+    assert done == {"A": True, "B": False, "C": True}
+
+
+def test_delete_of_task_already_deleted_elsewhere(task, tmp_path, capsys):
+    path = tmp_path / "tasks.json"
+    app = fresh(task, path)
+    for title in ("A", "B", "C"):
+        app.add_todo(title)
+    stale = fresh(task, path)
+    fresh(task, path).delete_todo(2)
+    stale.delete_todos([2, 3])
+    assert titles(fresh(task, path)) == ["A"]
+
+
+def test_complete_of_deleted_task_is_a_conflict(task, tmp_path, capsys):
+    path = tmp_path / "tasks.json"
+    app = fresh(task, path)
+    for title in ("A", "B"):
+        app.add_todo(title)
+    stale = fresh(task, path)
+    fresh(task, path).delete_todo(1)
+    before = path.read_text()
+    capsys.readouterr()
+    args = types.SimpleNamespace(command="complete", id=[1])
+    task.dispatch_command(stale, args)
+    out = capsys.readouterr().out
+    assert "Error: Task 'A' was deleted by another process" in out
+    assert "Completed" not in out
+    assert path.read_text() == before
+    # The app now holds what the other process wrote
+    assert titles(stale) == ["B"]
+
+
+def test_batch_commit_rebases_onto_other_writes(task, tmp_path):
+    path = tmp_path / "tasks.json"
+    app = fresh(task, path)
+    for title in ("A", "B"):
+        app.add_todo(title)
+    with app.batch():
+        app.add_todo("C")
+        app.complete_todo(1)
+        fresh(task, path).add_todo("Elsewhere")
+    app = fresh(task, path)
+    assert sorted(titles(app)) == ["A", "B", "C", "Elsewhere"]
+    assert {t["title"] for t in app.todos if t["completed"]} == {"A"}
+    assert sorted(t["id"] for t in app.todos) == [1, 2, 3, 4]
+
+
+def test_failed_write_leaves_previous_file(task, tmp_path, monkeypatch):
+    path = tmp_path / "tasks.json"
+    app = fresh(task, path)
+    app.add_todo("Kept")
+    before = path.read_text()
+
+    def crash(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(task.os, "replace", crash)
+    with pytest.raises(SystemExit):
+        app.add_todo("Lost")
+    assert path.read_text() == before
+    assert sorted(os.listdir(tmp_path)) == ["tasks.json", "tasks.json.lock"]
+
+
+@pytest.mark.parametrize("storage", ["json", "journal"])
+def test_parallel_cli_writers(tmp_path, storage):
+    path = tmp_path / "tasks.json"
+    subprocess.run([sys.executable, str(TASK_PY), "--file", str(path), "--storage", storage, "add", "Seed"],
+                   check=True, capture_output=True)
+    # 30 one-shot processes at once, as parallel shell jobs would run them
+    writers = [subprocess.Popen([sys.executable, str(TASK_PY), "--file", str(path), "add", f"Task {n}"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE) for n in range(30)]
+    for proc in writers:
+        assert proc.wait(timeout=60) == 0, proc.stderr.read()
+        proc.stderr.close()
+    listed = subprocess.run([sys.executable, str(TASK_PY), "--file", str(path), "--storage", "json", "list"],
+                            check=True, capture_output=True, text=True).stdout
+    assert "Total: 31" in listed
+    data = json.loads(path.read_text())
+    assert sorted(t["id"] for t in data) == list(range(1, 32))
+    assert len({t["title"] for t in data}) == 31
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_repeated_ids_after_other_write(task, tmp_path, storage, capsys):
+    path = tmp_path / ("tasks.db" if storage == "sqlite" else "tasks.json")
+    app = fresh(task, path, storage=storage)
+    for title in ("A", "B", "C"):
+        app.add_todo(title)
+    # Another process writes, so both commands below are rebased
+    fresh(task, path).add_todo("D")
+    capsys.readouterr()
+    app.complete_todos([1, 1])
+    app.delete_todos([2, 2])
+    out = capsys.readouterr().out
+    assert "Error" not in out
+    assert "✓ Completed task #1\n" in out and "✗ Deleted task #2\n" in out
+    app = fresh(task, path)
+    assert sorted(titles(app)) == ["A", "B", "D"]
+    assert {t["title"] for t in app.todos if t["completed"]} == {"A"}
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import TASK_PY
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix-domain sockets")
+
+
+def run_cli(store: Path, *argv: str, cwd: Path | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, str(TASK_PY), "--file", str(store), *argv],
+                          capture_output=True, text=True, cwd=cwd)
+
+
+@pytest.fixture()
+def daemon(tmp_path):
+    """Start `task serve` on a fresh store; yields (store, socket path, process)."""
+    store = tmp_path / "tasks.json"
+    run_cli(store, "add", "Existing", "task")
+    sock = Path(str(store) + ".sock")
+    proc = subprocess.Popen([sys.executable, str(TASK_PY), "--file", str(store), "serve"],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    deadline = time.monotonic() + 10
+    while not sock.exists():
+        assert proc.poll() is None, proc.stdout.read()
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+    yield store, sock, proc
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=10)
+    proc.stdout.close()
+
+
+def test_commands_run_on_daemon(daemon):
+    store, sock, proc = daemon
+    # A store edit the daemon does not know about would be lost if it did
+    # not run the commands, so check the output and the file agree
+    assert "Added task #2: Second" in run_cli(store, "add", "Second").stdout
+    listing = run_cli(store, "list").stdout
+    assert "Existing task" in listing and "Second" in listing
+    assert "Total: 2" in listing
+    assert [t["title"] for t in json.loads(store.read_text())] == ["Existing task", "Second"]
+    result = run_cli(store, "complete", "1")
+    assert result.returncode == 0 and "Completed" in result.stdout
+
+
+def test_output_and_status_match_direct_run(daemon, tmp_path):
+    store, sock, proc = daemon
+    direct_store = tmp_path / "direct.json"
+    run_cli(direct_store, "add", "Existing", "task")
+    for argv in (["list", "--all"], ["search", "exist"], ["complete", "7"], ["bogus"], ["list", "--help"]):
+        served = run_cli(store, *argv)
+        direct = run_cli(direct_store, *argv)
+        assert served.returncode == direct.returncode
+        if argv == ["complete", "7"]:
+            assert served.returncode == 1
+        assert served.stdout + served.stderr == (direct.stdout + direct.stderr).replace("direct.json", "tasks.json")
+
+
+def test_relative_paths_use_client_directory(daemon, tmp_path):
+    store, sock, proc = daemon
+    client_dir = tmp_path / "client"
+    client_dir.mkdir()
+    assert run_cli(store, "convert", "copy.bin", cwd=client_dir).returncode == 0
+    assert (client_dir / "copy.bin").exists()
+
+
+def test_daemon_reloads_after_external_change(daemon):
+    store, sock, proc = daemon
+    # Written behind the daemon's back, as another tool or an older CLI would
+    store.write_text(json.dumps([{"id": 1, "title": "Replaced", "description": "", "completed": False,
+                                  "created_at": "2025-01-01T00:00:00", "completed_at": None}]))
+    listing = run_cli(store, "list").stdout
+    assert "Replaced" in listing and "Existing" not in listing
+    run_cli(store, "add", "After")
+    assert [t["title"] for t in json.loads(store.read_text())] == ["Replaced", "After"]
+
+
+def test_second_daemon_refused_and_socket_removed_on_stop(daemon):
+    store, sock, proc = daemon
+    second = run_cli(store, "serve")
+    assert second.returncode == 1
+    assert "already serving" in second.stdout
+    proc.send_signal(signal.SIGTERM)
+    proc.wait(timeout=10)
+    assert not sock.exists()
+    # Without a daemon the CLI works on the file directly
+    assert "Existing task" in run_cli(store, "list").stdout
+
+
+def test_silent_client_does_not_block_others(daemon):
+    store, sock, proc = daemon
+    silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    silent.connect(str(sock))
+    try:
+        start = time.monotonic()
+        result = run_cli(store, "list")
+        assert result.returncode == 0 and "Existing task" in result.stdout
+        assert time.monotonic() - start < 10
+    finally:
+        silent.close()
+
+
+def test_forwarded_output_goes_to_pager(task, daemon, monkeypatch):
+    from contextlib import contextmanager
+    import io
+    store, sock, proc = daemon
+    paged = []
+
+    @contextmanager
+    def fake_pager(enabled=True):
+        out = io.StringIO()
+        yield out
+        paged.append((enabled, out.getvalue()))
+
+    monkeypatch.setattr(task, "paged_output", fake_pager)
+    assert task.forward_to_daemon(str(sock), ["list", "--pager"], pager=True) == 0
+    assert paged[0][0] is True and "Existing task" in paged[0][1]
+
+
+def test_stale_socket_falls_back_to_direct_access(task, tmp_path):
+    store = tmp_path / "tasks.json"
+    run_cli(store, "add", "Existing", "task")
+    sock = task.daemon_socket_path(str(store))
+    # A socket file nothing listens on, as left by a killed daemon
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(sock)
+    stale.close()
+    assert os.path.exists(sock)
+    assert task.forward_to_daemon(sock, ["list"]) is None
+    result = run_cli(store, "add", "Direct")
+    assert "Added task #2" in result.stdout
+    assert len(json.loads(store.read_text())) == 2
+
+
+def test_socket_path(task, tmp_path):
+    store = tmp_path / "tasks.json"
+    assert task.daemon_socket_path(str(store)) == str(store) + ".sock"
+    deep = tmp_path / ("d" * 120) / "tasks.json"
+    long_path = task.daemon_socket_path(str(deep))
+    assert len(long_path.encode()) <= 108
+    assert long_path == task.daemon_socket_path(str(deep))
+    assert long_path != task.daemon_socket_path(str(deep) + "2")
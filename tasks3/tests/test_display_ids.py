@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+import random
+
+
+def naive_view(todos, show_all):
+    todos_to_show = todos if show_all else [t for t in todos if not t["completed"]]
+    return sorted(todos_to_show, key=lambda t: t["id"])
+
+
+def random_ops(app, rng, steps):
+    for step in range(steps):
+        incomplete = sum(1 for t in app.todos if not t["completed"])
+        choice = rng.random()
+        if choice < 0.35 and incomplete:
+            app.complete_todos(rng.sample(range(1, incomplete + 1), min(2, incomplete)))
+        elif choice < 0.6 and incomplete:
+            app.delete_todos(rng.sample(range(1, incomplete + 1), min(2, incomplete)))
+        elif choice < 0.95:
+            app.add_todo(f"N{step}")
+        else:
+            app.clean()
+        for show_all in (False, True):
+            assert app._view(show_all) == naive_view(app.todos, show_all)
+
+
+def test_views_track_mutations(task, tmp_path: Path, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    random_ops(app, random.Random(5), 80)
+
+
+def test_views_track_mutations_in_batch(task, tmp_path: Path, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    for name in ["A", "B", "C"]:
+        app.add_todo(name)
+    with app.batch():
+        random_ops(app, random.Random(7), 40)
+
+
+def test_bulk_complete_resolves_in_one_pass(task, tmp_path: Path, monkeypatch, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    with app.batch():
+        for i in range(50):
+            app.add_todo(f"T{i}")
+    calls = []
+    original = app._view
+    monkeypatch.setattr(app, "_view", lambda show_all=False: (calls.append(show_all), original(show_all))[1])
+    app.complete_todos(list(range(1, 40, 2)))
+    assert calls == [False]
+    assert sum(1 for t in app.todos if t["completed"]) == 20
+
+
+def test_sqlite_bulk_resolution(task, tmp_path: Path, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.db"))
+    for name in ["A", "B", "C", "D"]:
+        app.add_todo(name)
+    app.complete_todos([2, 4, 9])
+    out = capsys.readouterr().out
+    assert "Task(s) 9 not found" in out
+    assert [t["title"] for t in app.storage.select(False)] == ["A", "C"]
+    assert app._todos is None
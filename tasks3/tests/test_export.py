@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import TASK_PY
+
+
+@pytest.fixture()
+def store(task, tmp_path):
+    path = tmp_path / "tasks.json"
+    app = task.TodoApp(str(path))
+    for title in ("Alpha", "Beta", "Gamma, with comma"):
+        app.add_todo(title, "desc")
+    app.complete_todo(2)
+    return path
+
+
+def records(path: Path) -> list:
+    return json.loads(path.read_text())
+
+
+@pytest.mark.parametrize("status, completed", [("all", None), ("incomplete", False), ("completed", True)])
+def test_jsonl_export_matches_store(task, store, tmp_path, status, completed):
+    out = tmp_path / "out.jsonl"
+    app = task.TodoApp(str(store), scope="stream")
+    expected = [t for t in records(store) if completed is None or t["completed"] == completed]
+    assert app.export_tasks(str(out), "jsonl", status) == len(expected)
+    assert [json.loads(line) for line in out.read_text().splitlines()] == expected
+
+
+def test_export_streams_without_loading(task, store, tmp_path, monkeypatch):
+    monkeypatch.setattr(task.JsonStorage, "load", lambda self: pytest.fail("store was loaded"))
+    app = task.TodoApp(str(store), scope="stream")
+    assert app.export_tasks(str(tmp_path / "out.jsonl")) == 3
+
+
+def test_export_includes_journal_operations(task, tmp_path):
+    path = tmp_path / "tasks.json"
+    app = task.TodoApp(str(path), storage="journal")
+    app.add_todo("Journaled")
+    out = tmp_path / "out.jsonl"
+    task.TodoApp(str(path), scope="stream").export_tasks(str(out))
+    assert [json.loads(line)["title"] for line in out.read_text().splitlines()] == ["Journaled"]
+
+
+def test_csv_export_round_trips_through_import(task, store, tmp_path):
+    out = tmp_path / "out.csv"
+    task.TodoApp(str(store), scope="stream").export_tasks(str(out), "csv")
+    assert out.read_text().splitlines()[0] == "id,title,description,completed,created_at,completed_at"
+    copy = task.TodoApp(str(tmp_path / "copy.json"))
+    copy.import_tasks(str(out))
+    fields = ("id", "title", "description", "completed", "created_at", "completed_at")
+    assert [{k: t[k] for k in fields} for t in copy.todos] == [{k: t[k] for k in fields} for t in records(store)]
+
+
+def test_cli_export_to_stdout_is_only_records(store):
+    result = subprocess.run([sys.executable, str(TASK_PY), "--file", str(store), "export", "--status", "incomplete"],
+                            capture_output=True, text=True, check=True)
+    assert [json.loads(line)["title"] for line in result.stdout.splitlines()] == ["Alpha", "Gamma, with comma"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import TASK_PY
+
+
+@pytest.fixture()
+def app(task, tmp_path):
+    app = task.TodoApp(str(tmp_path / "tasks.json"))
+    app.add_todo("Existing")
+    return app
+
+
+def test_csv_import_continues_ids(app, tmp_path, capsys):
+    source = tmp_path / "seed.csv"
+    source.write_text('Title,Description,Extra\nFirst,one,x\n"Second, with comma",,y\n', encoding="utf-8")
+    capsys.readouterr()
+    assert app.import_tasks(str(source)) == 2
+    assert "Imported 2 task(s)" in capsys.readouterr().out
+    assert [(t["id"], t["title"], t["description"]) for t in app.todos] == [
+        (1, "Existing", ""), (2, "First", "one"), (3, "Second, with comma", ""),
+    ]
+    assert all(set(t) == set(app.todos[0]) for t in app.todos)
+
+
+def test_jsonl_import_orders_completed_and_backdated(app, tmp_path):
+    source = tmp_path / "seed.jsonl"
+    source.write_text("\n".join(json.dumps(row) for row in [
+        {"title": "Done", "completed": True, "completed_at": "2024-05-01T00:00:00"},
+        {"title": "Old", "created_at": "2020-01-01T00:00:00", "id": 99},
+        {"title": "New"},
+    ]) + "\n")
+    app.import_tasks(str(source))
+    ordered = [(t["id"], t["title"], t["completed"]) for t in sorted(app.todos, key=lambda t: t["id"])]
+    assert ordered == [(1, "Old", False), (2, "Existing", False), (3, "New", False), (4, "Done", True)]
+    assert app._find_todo(4)["completed_at"] == "2024-05-01T00:00:00"
+
+
+def test_invalid_rows_import_nothing(app, tmp_path, capsys):
+    source = tmp_path / "seed.jsonl"
+    source.write_text('{"title": "Good"}\n{"title": ""}\nnot json\n{"title": "x", "completed": "maybe"}\n')
+    before = (tmp_path / "tasks.json").read_text()
+    assert app.import_tasks(str(source)) is None
+    out = capsys.readouterr().out
+    assert "Error: line 2: missing title" in out
+    assert "Error: line 3: invalid JSON" in out
+    assert "Error: line 4: completed must be true or false" in out
+    assert "Nothing imported: 3 invalid row(s)" in out
+    assert [t["title"] for t in app.todos] == ["Existing"]
+    assert (tmp_path / "tasks.json").read_text() == before
+
+
+def test_import_writes_store_once(task, tmp_path, monkeypatch):
+    app = task.TodoApp(str(tmp_path / "tasks.json"), storage="journal")
+    source = tmp_path / "seed.csv"
+    source.write_text("title\n" + "".join(f"Task {i}\n" for i in range(500)))
+    records = []
+    original = app.storage.record
+    monkeypatch.setattr(app.storage, "record", lambda op, todos, stats=None: (records.append(op), original(op, todos, stats)))
+    assert app.import_tasks(str(source)) == 500
+    assert len(records) == 1 and records[0]["op"] == "batch"
+    reloaded = task.TodoApp(str(tmp_path / "tasks.json"))
+    assert [t["id"] for t in reloaded.todos] == list(range(1, 501))
+
+
+@pytest.mark.parametrize("text", ["title\nFrom stdin\n", '{"title": "From stdin"}\n'])
+def test_cli_import_from_stdin(tmp_path, text):
+    store = tmp_path / "tasks.json"
+    result = subprocess.run([sys.executable, str(TASK_PY), "--file", str(store), "import"],
+                            input=text, capture_output=True, text=True)
+    assert "Imported 1 task(s)" in result.stdout
+    assert [t["title"] for t in json.loads(store.read_text())] == ["From stdin"]
@@ -1,26 +1,14 @@
 from __future__ import annotations
 
 from pathlib import Path
-import importlib.util
-import types
 from typing import Tuple
 
 import pytest
 
+from conftest import load_task_module
 from tasks3 import inc
 
 
-def load_task_module() -> types.ModuleType:
-    """Dynamically load the CLI module at tasks3/task.py for testing."""
-    base_dir = Path(__file__).resolve().parents[1]
-    task_path = base_dir / "task.py"
-    spec = importlib.util.spec_from_file_location("task_cli", task_path)
-    assert spec and spec.loader, "Failed to load task.py"
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)  # type: ignore[assignment]
-    return module
-
-
 @pytest.fixture()
 def cli(tmp_path: Path):
     """Provide a fresh TodoApp and parser using a temporary JSON file."""
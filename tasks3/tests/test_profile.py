@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import TASK_PY
+
+
+@pytest.fixture()
+def store(task, tmp_path):
+    path = tmp_path / "tasks.json"
+    app = task.TodoApp(str(path))
+    with app.batch():
+        for i in range(20):
+            app.add_todo(f"Task {i}", "report" if i % 2 else "")
+    return path
+
+
+def run_cli(*args: str) -> subprocess.CompletedProcess:
+    env = {k: v for k, v in os.environ.items() if k != "TASKS3_PROFILE"}
+    return subprocess.run([sys.executable, str(TASK_PY), *args], capture_output=True, text=True, env=env)
+
+
+def test_hooks_receive_nested_phases(task, store):
+    events = []
+    task.add_profile_hook(events.append)
+    try:
+        app = task.TodoApp(str(store))
+        with task.phase("outer", label="x"):
+            app.complete_todos([1])
+    finally:
+        task.remove_profile_hook(events.append)
+    by_name = {e["name"]: e for e in events}
+    assert by_name["load"]["depth"] == 0 and by_name["load"]["storage"] == "json"
+    assert by_name["reindex"]["depth"] == by_name["save"]["depth"] == 1
+    assert by_name["outer"]["label"] == "x" and by_name["outer"]["alloc"] is None
+    assert by_name["outer"]["duration"] >= by_name["save"]["duration"]
+    count = len(events)
+    app.list_todos()
+    assert len(events) == count
+
+
+def test_profiler_traces_allocations(task, store, capsys):
+    with task.Profiler() as profiler:
+        app = task.TodoApp(str(store))
+        with task.phase("big"):
+            block = [bytes(1000) for _ in range(1000)]
+            del block
+    load = next(e for e in profiler.events if e["name"] == "load")
+    big = next(e for e in profiler.events if e["name"] == "big")
+    assert load["alloc"] > 0 and load["peak"] >= load["alloc"]
+    assert big["peak"] >= 1_000_000 > big["alloc"]
+    err = capsys.readouterr().err
+    assert "Profile:" in err and "\nload " in err and "\nbig " in err
+    assert app.todos
+
+
+def test_extract_profile_option(task):
+    assert task.extract_global_options(["--profile", "list"]) == (["list"], {
+        "file": None, "storage": None, "batch": None, "save_every": None, "profile": "1",
+        "summarizer": None,
+    })
+    argv, options = task.extract_global_options(["--profile=t.json", "--file", "x.json", "list"])
+    assert argv == ["list"] and options["profile"] == "t.json" and options["file"] == "x.json"
+
+
+def test_cli_profile_summary_keeps_stdout(store):
+    plain = run_cli("--file", str(store), "list", "--all")
+    profiled = run_cli("--profile", "--file", str(store), "list", "--all")
+    assert profiled.stdout == plain.stdout
+    phases = [line.split()[0] for line in profiled.stderr.splitlines()[3:]]
+    assert phases == ["startup", "parse", "open", "load", "command", "render", "total"]
+
+
+def test_cli_profile_trace(store, tmp_path):
+    trace = tmp_path / "trace.json"
+    result = run_cli("--file", str(store), f"--profile={trace}", "search", "report")
+    assert "Found 10 task(s)" in result.stdout
+    assert f"Profile trace written to {trace}" in result.stderr
+    events = json.loads(trace.read_text())["traceEvents"]
+    names = [e["name"] for e in events]
+    assert names[0] == "startup" and {"parse", "open", "search", "render"} <= set(names)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert next(e for e in events if e["name"] == "search")["args"]["alloc"] is not None
+
+
+def test_repl_profiles_each_command(task, store, monkeypatch, capsys):
+    lines = iter(["complete 1", "list", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(lines))
+    with task.Profiler() as profiler:
+        task.repl(task.build_parser(), task.TodoApp(str(store)), profiler)
+    err = capsys.readouterr().err
+    assert "Profile (complete 1):" in err and "Profile (list):" in err
+    listing = err.split("Profile (list):")[1]
+    assert "render" in listing and "save" not in listing
+
+
+def test_piped_commands_profile_each_command(store):
+    result = subprocess.run([sys.executable, str(TASK_PY), "--file", str(store)], input="complete 1\nlist\n",
+                            capture_output=True, text=True, env=dict(os.environ, TASKS3_PROFILE="1"))
+    assert "Profile (complete 1):" in result.stderr and "Profile (list):" in result.stderr
+    listing, final = result.stderr.split("Profile (list):")[1].split("Profile:")
+    assert "render" in listing and "save" not in listing
+    # Piped commands are saved once, after the last one
+    assert "\nsave " in final
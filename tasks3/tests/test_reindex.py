@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import random
+
+
+def full_sort_order(todos):
+    """The original reindex ordering, recomputed from scratch."""
+    incompletes = [t for t in todos if not t.get("completed")]
+    completes = [t for t in todos if t.get("completed")]
+    key = lambda t: (datetime.fromisoformat(t["created_at"]).timestamp(), t["id"])
+    return [t["title"] for t in sorted(incompletes, key=key) + sorted(completes, key=key)]
+
+
+def test_incremental_reorder_matches_full_sort(task, tmp_path: Path):
+    rng = random.Random(299)
+    base = datetime(2025, 1, 1)
+    todos = [
+        {
+            "id": i + 1,
+            "title": f"T{i}",
+            "description": "",
+            "completed": rng.random() < 0.3,
+            # Shuffled, partly duplicated timestamps so ties fall back to id
+            "created_at": (base + timedelta(minutes=rng.randrange(50))).isoformat(),
+            "completed_at": None,
+        }
+        for i in range(60)
+    ]
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    app.todos = todos
+    app.reindex()
+    for step in range(40):
+        incomplete = sum(1 for t in app.todos if not t["completed"])
+        choice = rng.random()
+        if choice < 0.4 and incomplete:
+            app.complete_todos(rng.sample(range(1, incomplete + 1), min(3, incomplete)))
+        elif choice < 0.7 and incomplete:
+            app.delete_todo(rng.randint(1, incomplete))
+        elif choice < 0.9:
+            # Adding does not reindex, so there is nothing to compare yet
+            app.add_todo(f"N{step}")
+            continue
+        else:
+            app.clean()
+        assert [t["title"] for t in app.todos] == full_sort_order(app.todos)
+        assert [t["id"] for t in app.todos] == list(range(1, len(app.todos) + 1))
+
+
+def test_timestamps_parsed_once(task, tmp_path: Path, monkeypatch):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    for name in ["A", "B", "C"]:
+        app.add_todo(name)
+    app.complete_todo(1)
+    calls = []
+    original = task.parse_timestamp
+    monkeypatch.setattr(task, "parse_timestamp", lambda ts: (calls.append(ts), original(ts))[1])
+    app.complete_todo(1)
+    app.delete_todo(1)
+    assert calls == []
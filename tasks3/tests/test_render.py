@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import io
+import shlex
+import subprocess
+import sys
+
+import pytest
+
+from conftest import TASK_PY
+
+
+@pytest.fixture()
+def app(task, tmp_path):
+    app = task.TodoApp(str(tmp_path / "tasks.json"))
+    with app.batch():
+        for i in range(1, 26):
+            app.add_todo(f"Task {i}", "report" if i % 5 == 0 else "")
+    return app
+
+
+def legacy_row(shown_id, todo) -> str:
+    """One table row as list/search printed it before render_table."""
+    status = "✓ Completed" if todo['completed'] else "○ Incomplete"
+    title = todo['title'][:37] + "..." if len(todo['title']) > 40 else todo['title']
+    desc = todo['description'][:27] + "..." if len(todo['description']) > 30 else todo['description']
+    return f"{shown_id:<5} {status:<12} {title:<40} {desc:<30}\n"
+
+
+def test_render_table_matches_row_format(task):
+    todos = [
+        task.Task(1, "x" * 41, "y" * 31, True),
+        {"id": 2, "title": "Short", "description": "", "completed": False},
+        task.Task(3, "t" * 40, "d" * 30, False),
+    ]
+    rows = [(n, todo) for n, todo in enumerate(todos, 7)]
+    out = io.StringIO()
+    assert task.render_table(rows, out) == 3
+    assert out.getvalue() == task.TABLE_HEADER + "".join(legacy_row(n, t) for n, t in rows)
+
+
+def test_render_table_writes_in_chunks(task, monkeypatch):
+    monkeypatch.setattr(task, "RENDER_CHUNK", 4)
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    rows = [(n, {"title": "T", "description": "", "completed": False}) for n in range(10)]
+    assert task.render_table(rows, Recorder()) == 10
+    # Header, two full chunks and the rest
+    assert [w.count("\n") for w in writes] == [2, 4, 4, 2]
+
+
+def test_list_page(app, capsys):
+    app.list_todos(limit=3, offset=20)
+    out = capsys.readouterr().out
+    shown = [line.split()[0] for line in out.splitlines() if line[:1].isdigit()]
+    assert shown == ["21", "22", "23"]
+    assert "Showing 21-23 of 25. Use --offset 23 for more." in out
+    assert "Total: 25 (0 completed, 25 incomplete)" in out
+
+
+def test_last_and_empty_pages(app, capsys):
+    app.list_todos(limit=10, offset=20)
+    assert "Showing 21-25 of 25.\n" in capsys.readouterr().out
+    app.list_todos(offset=30)
+    assert "No rows at offset 25 (25 in total)" in capsys.readouterr().out
+
+
+def test_only_the_page_is_formatted(task, app, monkeypatch, capsys):
+    formatted = []
+    render = task.render_table
+    monkeypatch.setattr(task, "render_table", lambda rows, out: render(formatted.extend(rows) or formatted, out))
+    app.list_todos(limit=2, offset=5)
+    assert [n for n, _ in formatted] == [6, 7]
+
+
+def test_search_page(app, capsys):
+    app.search_todos("report", limit=2, offset=1)
+    out = capsys.readouterr().out
+    assert "Found 5 task(s) matching 'report'" in out
+    shown = [line.split()[0] for line in out.splitlines() if line[:1].isdigit()]
+    assert shown == ["10", "15"]
+    assert "Showing 2-3 of 5. Use --offset 3 for more." in out
+
+
+def test_pager_used_only_on_a_terminal(task, tmp_path, monkeypatch):
+    captured = tmp_path / "paged.txt"
+    monkeypatch.setenv("PAGER", shlex.join([
+        sys.executable, "-c", f"import sys; open({str(captured)!r}, 'w').write(sys.stdin.read())",
+    ]))
+    with task.paged_output() as out:
+        assert out is sys.stdout
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True, raising=False)
+    with task.paged_output() as out:
+        out.write("through the pager\n")
+    assert captured.read_text() == "through the pager\n"
+    with task.paged_output(enabled=False) as out:
+        assert out is sys.stdout
+
+
+def test_cli_paging_options(tmp_path):
+    store = tmp_path / "tasks.json"
+    for title in ("One", "Two", "Three"):
+        subprocess.run([sys.executable, str(TASK_PY), "--file", str(store), "add", title], check=True,
+                       capture_output=True)
+    result = subprocess.run([sys.executable, str(TASK_PY), "--file", str(store), "list", "--limit", "1",
+                             "--offset", "1", "--pager"], capture_output=True, text=True, check=True)
+    assert "Two" in result.stdout and "One" not in result.stdout and "Three" not in result.stdout
+    assert "Showing 2-2 of 3" in result.stdout
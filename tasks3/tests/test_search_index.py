@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+import random
+
+
+WORDS = ["Buy", "milk", "MILKSHAKE", "call", "Mom", "fix", "bug", "Éclair", "straße", "a\"b", "x"]
+QUERIES = ["milk", "MiLk", "mom", "éCL", "STRASSE", "straße", "ll m", "a\"b", "ug", "x", "", "zzz"]
+
+
+def search_output(app, capsys, query):
+    capsys.readouterr()
+    app.search_todos(query)
+    return capsys.readouterr().out
+
+
+def scan_output(app, capsys, query):
+    # Plain scan over the same tasks, leaving any index in place
+    index, app._search_index, app.scope = app._search_index, None, "incomplete"
+    try:
+        return search_output(app, capsys, query)
+    finally:
+        app._search_index, app.scope = index, "all"
+
+
+def random_ops(app, rng, steps):
+    for step in range(steps):
+        incomplete = sum(1 for t in app.todos if not t["completed"])
+        choice = rng.random()
+        if choice < 0.3 and incomplete:
+            app.complete_todos(rng.sample(range(1, incomplete + 1), min(2, incomplete)))
+        elif choice < 0.5 and incomplete:
+            app.delete_todos(rng.sample(range(1, incomplete + 1), min(2, incomplete)))
+        elif choice < 0.95:
+            app.add_todo(" ".join(rng.sample(WORDS, 2)), rng.choice(WORDS))
+        else:
+            app.clean()
+
+
+def test_index_matches_scan_through_mutations(task, tmp_path: Path, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    rng = random.Random(3)
+    index = app._search_index = task.TrigramIndex(app.todos)
+    for _ in range(6):
+        random_ops(app, rng, 25)
+        assert app._search_index is index
+        assert len(index) == len(app.todos)
+        for query in QUERIES:
+            assert search_output(app, capsys, query) == scan_output(app, capsys, query)
+
+
+def test_index_is_maintained_incrementally(task, tmp_path: Path, capsys):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    app.add_todo("Buy milk")
+    for _ in range(task.TrigramIndex.BUILD_AFTER_SCANS - 1):
+        app.search_todos("milk")
+    assert app._search_index is None
+    app.search_todos("milk")
+    index = app._search_index
+    assert index is not None
+    app.add_todo("Oat milk", "from the shop")
+    app.delete_todos([1])
+    assert app._search_index is index
+    assert [t["title"] for t in index.candidates("milk")] == ["Oat milk"]
+    assert index.candidates("mi") is None
+    assert index.candidates("qqq") == []
+
+
+def test_sqlite_search_uses_fts_and_matches_scan(task, tmp_path: Path, capsys):
+    json_app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    db_app = task.TodoApp(data_file=str(tmp_path / "tasks.db"))
+    assert db_app.storage.conn and db_app.storage.fts
+    for app in (json_app, db_app):
+        random_ops(app, random.Random(11), 60)
+    for query in QUERIES:
+        assert search_output(db_app, capsys, query) == scan_output(json_app, capsys, query)
+    rows = db_app.storage.conn.execute("SELECT COUNT(*) FROM tasks_fts").fetchone()[0]
+    assert rows == db_app.storage.counts()[0]
+
+
+def test_sqlite_index_built_for_existing_database(task, tmp_path: Path, capsys):
+    path = tmp_path / "tasks.db"
+    app = task.TodoApp(data_file=str(path))
+    app.add_todo("Buy milk")
+    conn = app.storage.conn
+    conn.execute("DROP TABLE tasks_fts")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+    reopened = task.TodoApp(data_file=str(path))
+    assert "Buy milk" in search_output(reopened, capsys, "MILK")
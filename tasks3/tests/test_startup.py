@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import tasks3
+
+
+@pytest.mark.parametrize("argv", [
+    ["list"], ["list", "-a"], ["list", "--all"],
+    ["search", "groceries"], ["search", "two words"],
+    ["complete", "1"], ["complete", "3", "1", "2"],
+    ["delete", "2"], ["delete", "1", "4"], ["delete", "--all"],
+    ["clean"],
+])
+def test_fast_path_matches_argparse(task, argv):
+    fast = task.parse_common_command(argv)
+    assert fast is not None
+    assert vars(fast) == vars(task.build_parser().parse_args(argv))
+
+
+@pytest.mark.parametrize("argv", [
+    ["list", "-h"], ["list", "--al"], ["search"], ["search", "-x"], ["search", "a", "b"],
+    ["complete"], ["complete", "-1"], ["complete", "1", "x"], ["complete", "١"],
+    ["delete"], ["delete", "1", "--all"], ["clean", "now"], ["convert", "out.bin"], ["--help"],
+])
+def test_other_forms_go_through_argparse(task, argv):
+    assert task.parse_common_command(argv) is None
+
+
+def test_entry_point_defers_heavy_imports(tmp_path: Path):
+    src = Path(tasks3.__file__).resolve().parents[1]
+    code = (
+        "import sys; sys.path.insert(0, sys.argv.pop(1)); import tasks3; tasks3.main(); "
+        "print(sorted(m for m in ('argparse', 'pathlib', 'shlex', 'sqlite3', 'typing') if m in sys.modules))"
+    )
+    for command in (["add", "Alpha"], ["list"], ["search", "alp"], ["complete", "1"]):
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(src), "--file", str(tmp_path / "tasks.json"), *command],
+            capture_output=True, text=True, check=True,
+        )
+        assert result.stdout.splitlines()[-1] == "[]", (command, result.stdout)
+
+
+def test_bytecode_cached_when_pycache_is_not_written(tmp_path: Path, monkeypatch):
+    from importlib.machinery import SourceFileLoader
+
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    source = tmp_path / "task.py"
+    source.write_text("VALUE = 1\n")
+    loader = SourceFileLoader("tasks3_cli", str(source))
+
+    def run():
+        namespace = {}
+        exec(tasks3._cli_code(loader, str(source)), namespace)
+        return namespace["VALUE"]
+
+    assert run() == 1
+    cache = Path(tasks3._bytecode_cache_path(str(source)))
+    assert cache.exists()
+    # A stale or corrupt cache is ignored
+    source.write_text("VALUE = 22\n")
+    assert run() == 22
+    cache.write_bytes(cache.read_bytes()[:-4])
+    assert run() == 22
+    assert not (tmp_path / "__pycache__").exists()
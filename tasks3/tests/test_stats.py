@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sqlite3
+
+import pytest
+
+
+def naive_stats(todos):
+    return (
+        max((t["id"] for t in todos), default=0) + 1,
+        (len(todos), sum(1 for t in todos if t["completed"])),
+    )
+
+
+def random_ops(app, rng, steps, check):
+    for step in range(steps):
+        incomplete = sum(1 for t in app.todos if not t["completed"])
+        choice = rng.random()
+        if choice < 0.3 and incomplete:
+            app.complete_todos(rng.sample(range(1, incomplete + 1), min(2, incomplete)))
+        elif choice < 0.5 and incomplete:
+            app.delete_todos(rng.sample(range(1, incomplete + 1), min(2, incomplete)))
+        elif choice < 0.6:
+            app.delete_todos([len(app.todos)] if app.todos else [])
+        elif choice < 0.95:
+            app.add_todo(f"N{step}")
+        else:
+            app.clean()
+        if check:
+            assert (app.get_next_id(), app._counts()) == naive_stats(app.todos)
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_stats_track_mutations(task, tmp_path: Path, capsys, batched):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    if batched:
+        with app.batch():
+            random_ops(app, random.Random(4), 80, check=True)
+    else:
+        random_ops(app, random.Random(4), 80, check=True)
+    assert (app.get_next_id(), app._counts()) == naive_stats(app.todos)
+
+
+def test_journal_add_reads_only_persisted_stats(task, tmp_path: Path, capsys, monkeypatch):
+    path = str(tmp_path / "tasks.json")
+    app = task.TodoApp(data_file=path, storage="journal")
+    random_ops(app, random.Random(9), 40, check=False)
+    expected = naive_stats(app.todos)
+    assert app.storage.stats().to_list() == [expected[0] - 1, *expected[1]]
+
+    def no_reads(self):
+        raise AssertionError("store was read")
+
+    monkeypatch.setattr(task.JsonStorage, "load", no_reads)
+    monkeypatch.setattr(task.JsonStorage, "iter_tasks", no_reads)
+    adder = task.TodoApp(data_file=path, scope="append")
+    adder.add_todo("Appended")
+    monkeypatch.undo()
+
+    reloaded = task.TodoApp(data_file=path)
+    assert reloaded.todos[-1]["title"] == "Appended"
+    assert reloaded.todos[-1]["id"] == expected[0]
+    stats = reloaded.storage.stats()
+    assert (stats.high_water + 1, stats.counts()) == naive_stats(reloaded.todos)
+
+
+def test_journal_stats_ignore_torn_or_stale_journal(task, tmp_path: Path, capsys):
+    path = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(path), storage="journal")
+    app.add_todo("A")
+    assert app.storage.stats() is not None
+    journal = Path(app.storage.journal_path)
+    journal.write_text(journal.read_text() + '{"op":"add"')
+    assert app.storage.stats() is None
+    app.save_todos()
+    assert app.storage.stats().to_list() == [1, 1, 0]
+    path.write_text("[]")
+    assert app.storage.stats() is None
+    # Falls back to reading the store
+    adder = task.TodoApp(data_file=str(path), scope="append")
+    assert adder.get_next_id() == 1
+
+
+def test_sqlite_counts_are_maintained(task, tmp_path: Path, capsys):
+    path = tmp_path / "tasks.db"
+    app = task.TodoApp(data_file=str(path))
+    json_app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    for each in (app, json_app):
+        random_ops(each, random.Random(2), 60, check=False)
+    assert (app.get_next_id(), app._counts()) == naive_stats(json_app.todos)
+    # A database from before the counts table gets it filled on open
+    app.storage.conn.close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE task_counts")
+        conn.execute("PRAGMA user_version = 1")
+    reopened = task.TodoApp(data_file=str(path))
+    assert reopened._counts() == naive_stats(json_app.todos)[1]
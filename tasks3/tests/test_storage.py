@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+
+import pytest
+
+
+def test_journal_appends_instead_of_rewriting(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    app.add_todo("Alpha")
+    app.add_todo("Bravo")
+    snapshot = data_file.read_text()
+    app.add_todo("Charlie")
+    app.complete_todo(1)
+    # The snapshot is untouched; each mutation is one journal line
+    assert data_file.read_text() == snapshot
+    lines = Path(str(data_file) + ".journal").read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines[1:]] == ["add", "add", "add", "complete"]
+
+
+def test_journal_replay_matches_live_state(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    for name in ["A", "B", "C", "D"]:
+        app.add_todo(name)
+    app.complete_todos([1, 3])
+    app.delete_todo(1)
+    app.clean()
+    reloaded = task.TodoApp(data_file=str(data_file))
+    assert reloaded.storage.name == "journal"
+    assert reloaded.todos == app.todos
+
+
+def test_journal_checkpoint_folds_into_snapshot(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    app.storage.checkpoint_every = 3
+    for name in ["A", "B", "C", "D"]:
+        app.add_todo(name)
+    assert [t["title"] for t in json.loads(data_file.read_text())] == ["A", "B", "C"]
+    assert task.TodoApp(data_file=str(data_file)).todos == app.todos
+
+
+def test_stale_journal_is_not_replayed(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    app.add_todo("A")
+    journal = Path(str(data_file) + ".journal").read_text()
+    app.save_todos()
+    # Simulate a crash between writing the checkpoint and resetting the journal
+    Path(str(data_file) + ".journal").write_text(journal)
+    assert [t["title"] for t in task.TodoApp(data_file=str(data_file)).todos] == ["A"]
+
+
+def test_touched_or_copied_snapshot_keeps_journal(task, tmp_path: Path, capsys):
+    import os
+    import shutil
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    app.add_todo("A")
+    app.save_todos()
+    app.add_todo("B")
+    # touch: same contents, new mtime
+    st = os.stat(data_file)
+    os.utime(data_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+    assert [t["title"] for t in task.TodoApp(data_file=str(data_file)).todos] == ["A", "B"]
+    # cp -r without -p
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    shutil.copy(data_file, copy / "tasks.json")
+    shutil.copy(str(data_file) + ".journal", copy / "tasks.json.journal")
+    adder = task.TodoApp(data_file=str(copy / "tasks.json"), scope="append")
+    adder.add_todo("C")
+    assert [t["title"] for t in task.TodoApp(data_file=str(copy / "tasks.json")).todos] == ["A", "B", "C"]
+
+
+def test_write_after_stale_journal_is_kept(task, tmp_path: Path, capsys):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    app.add_todo("A")
+    app.save_todos()
+    app.add_todo("B")
+    # The snapshot is replaced by other contents, so B's journal is stale
+    data_file.write_text(json.dumps([dict(app.todos[0], title="Z")]))
+    for scope in ("append", "all"):
+        adder = task.TodoApp(data_file=str(data_file), scope=scope)
+        adder.add_todo(f"New {scope}")
+    assert [t["title"] for t in task.TodoApp(data_file=str(data_file)).todos] == ["Z", "New append", "New all"]
+
+
+def test_switching_back_to_json_removes_journal(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file), storage="journal")
+    app.add_todo("A")
+    app = task.TodoApp(data_file=str(data_file), storage="json")
+    assert not Path(str(data_file) + ".journal").exists()
+    assert [t["title"] for t in json.loads(data_file.read_text())] == ["A"]
+
+
+def run_script(app):
+    for name in ["A", "B", "C", "D", "E"]:
+        app.add_todo(name, f"about {name}")
+    app.complete_todos([2, 4])
+    app.delete_todo(1)
+    app.complete_todo(1)
+    app.add_todo("F")
+    app.clean()
+
+
+def test_sqlite_matches_json_semantics(task, tmp_path: Path, capsys):
+    json_app = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    db_app = task.TodoApp(data_file=str(tmp_path / "tasks.db"))
+    assert db_app.storage.name == "sqlite"
+    outputs = []
+    for app in (json_app, db_app):
+        run_script(app)
+        app.list_todos(show_all=True)
+        app.search_todos("ABOUT")
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1]
+    # Neither list nor search needed to load the whole store
+    assert db_app._todos is None
+    reloaded = task.TodoApp(data_file=str(tmp_path / "tasks.db")).todos
+    assert [(t["id"], t["title"], t["completed"]) for t in reloaded] == [
+        (t["id"], t["title"], t["completed"]) for t in json_app.todos
+    ]
+
+
+def test_sqlite_lookup_uses_index(task, tmp_path: Path):
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.db"))
+    plan = app.storage.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE completed = 0 ORDER BY id LIMIT 1 OFFSET 3"
+    ).fetchall()
+    assert any("idx_tasks_completed" in row[-1] for row in plan)
+
+
+def test_sqlite_import_export_json(task, tmp_path: Path):
+    source = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    run_script(source)
+    db_app = task.TodoApp(data_file=str(tmp_path / "tasks.db"))
+    db_app.import_json(str(tmp_path / "tasks.json"))
+    db_app.export_json(str(tmp_path / "out.json"))
+    assert json.loads((tmp_path / "out.json").read_text()) == source.todos
+
+
+def test_sqlite_requires_database_extension(task, tmp_path: Path):
+    with pytest.raises(ValueError):
+        task.TodoApp(data_file=str(tmp_path / "tasks.json"), storage="sqlite")
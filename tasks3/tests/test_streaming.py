@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture()
+def store(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    app = task.TodoApp(data_file=str(data_file))
+    with app.batch():
+        for i in range(30):
+            app.add_todo(f"Task {i}", "needle" if i % 7 == 0 else 'hay [with] {braces}, "quotes"')
+        app.complete_todos(list(range(1, 30, 3)))
+    return data_file
+
+
+def test_iter_json_array_small_chunks(task, store: Path):
+    expected = json.loads(store.read_text())
+    with open(store) as f:
+        assert list(task.iter_json_array(f, chunk_size=7)) == expected
+    assert list(task.iter_json_array(io.StringIO("  [ ]  "))) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(task.iter_json_array(io.StringIO('[{"id": 1}, {"id"'), chunk_size=4))
+
+
+def test_list_scope_keeps_only_incomplete(task, store: Path, capsys):
+    full = task.TodoApp(data_file=str(store))
+    full.list_todos()
+    expected = capsys.readouterr().out
+    partial = task.TodoApp(data_file=str(store), scope="incomplete")
+    partial.list_todos()
+    assert capsys.readouterr().out == expected
+    assert partial._todos is None
+    assert len(partial._query._incomplete) == 20
+
+
+def test_search_scope_streams(task, store: Path, capsys):
+    task.TodoApp(data_file=str(store)).search_todos("NEEDLE")
+    expected = capsys.readouterr().out
+    partial = task.TodoApp(data_file=str(store), scope="none")
+    partial.search_todos("NEEDLE")
+    assert capsys.readouterr().out == expected
+    assert partial._todos is None
+
+
+def test_append_scope_with_journal_skips_loading(task, store: Path):
+    task.TodoApp(data_file=str(store), storage="journal")
+    app = task.TodoApp(data_file=str(store), scope="append")
+    app.add_todo("Appended")
+    assert app._todos is None
+    # Accessing todos loads the snapshot and replays the append
+    assert app.todos[-1]["title"] == "Appended" and app.todos[-1]["id"] == 31
+
+
+def test_partial_json_app_loads_before_mutating(task, store: Path):
+    app = task.TodoApp(data_file=str(store), scope="incomplete")
+    app.complete_todo(1)
+    app.add_todo("New")
+    saved = json.loads(store.read_text())
+    assert len(saved) == 31
+    assert sum(1 for t in saved if t["completed"]) == 11
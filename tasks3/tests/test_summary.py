@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+
+import pytest
+
+from conftest import TASK_PY
+
+
+LONG = "I need to book a venue for the team offsite. It should hold twenty people."
+
+
+def make_summarizer(task, gate=None):
+    class Recording(task.Summarizer):
+        def __init__(self):
+            self.calls = []
+
+        def summarize(self, description):
+            self.calls.append(description)
+            if gate is not None:
+                assert gate.wait(5)
+            if "fail" in description:
+                raise RuntimeError("model unavailable")
+            return "Book offsite venue"
+
+    return Recording()
+
+
+def test_summarizer_must_implement_summarize(task):
+    with pytest.raises(TypeError):
+        task.Summarizer()
+
+
+def test_local_summarizer_is_deterministic(task):
+    local = task.LocalSummarizer()
+    assert local.summarize(LONG) == "Book venue team offsite"
+    assert local.summarize("  the a an  ") == "The a an"
+
+
+def test_add_does_not_wait_for_the_summary(task, tmp_path, capsys):
+    gate = threading.Event()
+    summarizer = make_summarizer(task, gate)
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"), summarizer=summarizer)
+    app.add_todo("Offsite", LONG)
+    app.add_todo("Short", "fits in the table")
+    # Both adds returned while the summary was still blocked
+    assert "summary" not in app.todos[0] and summarizer.calls == [LONG]
+    gate.set()
+    assert app.wait_summaries() == 1
+    assert app.todos[0]["summary"] == "Book offsite venue"
+    out = io.StringIO()
+    app.list_todos(out=out)
+    assert "Book offsite venue" in out.getvalue() and "I need to book" not in out.getvalue()
+
+
+@pytest.mark.parametrize("storage", ["json", "journal", "binary", "sqlite"])
+def test_summary_is_saved_with_the_task(task, tmp_path, storage, capsys):
+    path = str(tmp_path / ("tasks.db" if storage == "sqlite" else "tasks.json"))
+    app = task.TodoApp(data_file=path, storage=storage, summarizer=make_summarizer(task))
+    app.add_todo("First", "short")
+    app.add_todo("Offsite", LONG)
+    app.complete_todo(1)
+    app.wait_summaries()
+    reloaded = task.TodoApp(data_file=path)
+    offsite = next(t for t in reloaded._view(True) if t["title"] == "Offsite")
+    assert task.task_summary(offsite) == "Book offsite venue"
+    assert not task.needs_summary(offsite)
+
+
+def test_only_recomputed_when_the_description_changes(task, tmp_path, capsys):
+    summarizer = make_summarizer(task)
+    path = str(tmp_path / "tasks.json")
+    app = task.TodoApp(data_file=path, summarizer=summarizer)
+    app.add_todo("Offsite", LONG)
+    app.wait_summaries()
+    todo = app.todos[0]
+    assert not task.needs_summary(todo)
+    todo["description"] = LONG + " Lunch included."
+    # The old summary no longer matches, so it is not shown and is asked for again
+    assert task.task_summary(todo) is None and task.needs_summary(todo)
+    app._queue_summary(todo)
+    app.wait_summaries()
+    assert len(summarizer.calls) == 2 and task.task_summary(todo) == "Book offsite venue"
+
+
+def test_ready_summaries_are_saved_with_the_next_add(task, tmp_path, monkeypatch, capsys):
+    gate = threading.Event()
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"), summarizer=make_summarizer(task, gate))
+    app.add_todo("Offsite", LONG)
+    app.add_todo("Retreat", LONG)
+    gate.set()
+    for job in app._summary_jobs:
+        job[3].result()
+    writes = []
+    original = app.storage.record
+    monkeypatch.setattr(app.storage, "record", lambda op, todos, stats=None: (writes.append(op), original(op, todos, stats)))
+    app.add_todo("Short")
+    # One rewrite of the file for the task and both summaries
+    assert [[sub["op"] for sub in w["ops"]] for w in writes] == [["summary", "summary", "add"]]
+    reloaded = task.TodoApp(data_file=str(tmp_path / "tasks.json"))
+    assert [task.task_summary(t) for t in reloaded.todos] == ["Book offsite venue", "Book offsite venue", None]
+
+
+def test_missing_tasks4_is_reported(task, monkeypatch):
+    monkeypatch.setitem(__import__("sys").modules, "tasks4", None)
+    with pytest.raises(ImportError, match="needs the tasks4 package.*uv sync --extra openai"):
+        task.make_summarizer("openai")
+
+
+def test_deleted_tasks_and_errors_are_skipped(task, tmp_path, capsys):
+    gate = threading.Event()
+    app = task.TodoApp(data_file=str(tmp_path / "tasks.json"), summarizer=make_summarizer(task, gate))
+    app.add_todo("Offsite", LONG)
+    app.add_todo("Broken", LONG + " fail")
+    app.delete_todo(1)
+    gate.set()
+    assert app.wait_summaries() == 0
+    assert "could not summarize task 'Broken'" in capsys.readouterr().err
+    assert [t.get("summary") for t in app.todos] == [None]
+
+
+def test_cli_summarizer_option(task, tmp_path):
+    import os
+    import subprocess
+    import sys
+    env = {k: v for k, v in os.environ.items() if k not in ("TASKS3_PROFILE", "TASKS3_SUMMARIZER")}
+    base = [sys.executable, str(TASK_PY), "--file", str(tmp_path / "tasks.json")]
+    added = subprocess.run(base[:2] + ["--storage", "journal"] + base[2:] + ["--summarizer", "local", "add", "Offsite", "-d", LONG],
+                           capture_output=True, text=True, env=env)
+    assert added.returncode == 0 and "Added task #1" in added.stdout
+    listed = subprocess.run(base + ["list"], capture_output=True, text=True, env=env)
+    assert "Book venue team offsite" in listed.stdout
+    bad = subprocess.run(base + ["list"], capture_output=True, text=True, env=dict(env, TASKS3_SUMMARIZER="nope"))
+    assert bad.returncode == 2 and "Unknown summarizer: nope" in bad.stdout
+    # A one-shot add to a JSON store does not rewrite it again for the summary
+    plain = base[:3] + [str(tmp_path / "plain.json")]
+    skipped = subprocess.run(plain + ["--summarizer", "local", "add", "Offsite", "-d", LONG],
+                             check=True, capture_output=True, text=True, env=env)
+    assert "summary" not in json.loads((tmp_path / "plain.json").read_text())[0]
+    assert "Warning: no summary made" in skipped.stderr
+    short = subprocess.run(plain + ["--summarizer", "local", "add", "Short"], capture_output=True, text=True, env=env)
+    assert short.returncode == 0 and short.stderr == ""
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+
+import pytest
+
+
+RECORD = {
+    "id": 4,
+    "title": "Write docs",
+    "description": "",
+    "completed": True,
+    "created_at": "2025-11-12T15:50:20.583252",
+    "completed_at": "2025-11-13T09:00:00",
+}
+
+
+def test_task_behaves_like_its_record(task):
+    t = task.Task.from_dict(RECORD)
+    assert t == RECORD and RECORD == t
+    assert dict(t) == RECORD and t.to_dict() == RECORD
+    assert t["title"] == "Write docs" and t.get("missing") is None
+    t["summary"] = "docs"
+    assert t.to_dict() == {**RECORD, "summary": "docs"}
+    assert not hasattr(t, "__dict__")
+    with pytest.raises(KeyError):
+        t["nope"]
+
+
+def test_task_columns_round_trip(task):
+    records = [
+        RECORD,
+        {**RECORD, "id": 5, "completed": False, "completed_at": None},
+        # Timestamps that do not survive a datetime round trip are kept verbatim
+        {**RECORD, "id": 6, "created_at": "2025-11-12 15:50", "completed_at": "not a date"},
+        {**RECORD, "id": 7, "created_at": "2025-11-12T15:50:20+02:00", "summary": "extra field"},
+    ]
+    columns = task.TaskColumns(records)
+    assert len(columns) == 4
+    assert list(columns) == records
+    assert columns[-1] == records[-1]
+
+
+def test_app_holds_tasks_and_saves_records(task, tmp_path: Path):
+    data_file = tmp_path / "tasks.json"
+    data_file.write_text(json.dumps([{**RECORD, "completed": False, "summary": "kept"}]))
+    app = task.TodoApp(data_file=str(data_file))
+    app.add_todo("Second")
+    assert all(isinstance(t, task.Task) for t in app.todos)
+    saved = json.loads(data_file.read_text())
+    assert saved[0]["summary"] == "kept"
+    assert saved[1]["title"] == "Second" and set(saved[1]) == set(task.TASK_FIELDS)
@@ -1,29 +1,321 @@
-from openai import OpenAI
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
-def main():
+from tasks4.cache import DEFAULT_MAX_ENTRIES, SummaryCache, cache_key
+from tasks4.ratelimit import DEFAULT_RETRIES, Metrics, RateLimiter, RetryingClient
+
+MODEL = "gpt-5-mini"
+PROMPT = "Summarize this task as a short phrase (5 words or less): {task}"
+BATCH_PROMPT = (
+    "Summarize each of these {count} tasks as a short phrase (5 words or less). "
+    "Reply with only a JSON object mapping each task's number to its summary, "
+    'like {{"1": "...", "2": "..."}}.\n\n{tasks}'
+)
+# Longer batched answers are treated as invalid and asked for again singly
+MAX_SUMMARY_WORDS = 10
+# Requests open at once, and seconds each one may take before it fails
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_TIMEOUT = 60.0
+
+# Sample paragraph-length task descriptions, used when no file is given
+SAMPLE_TASKS = [
+    "I need to prepare a comprehensive presentation for the quarterly review meeting scheduled for next Tuesday at 2 PM. This involves gathering all the sales data from Q3, creating clear visualizations showing trends and comparisons to previous quarters, writing detailed speaker notes for each slide to ensure I don't miss key points, and rehearsing the delivery at least twice to feel confident. The whole thing should take about 6 hours total of focused work.",
+
+    "My kitchen faucet has been dripping constantly for the past week and it's getting annoying plus wasting water. I need to either fix it myself by watching some YouTube tutorials and replacing the washer, or call a professional plumber if it turns out to be more complicated than I can handle. Before doing anything, I should also check if this kind of repair is covered under my home warranty to avoid unnecessary expenses."
+]
+
+
+class LazyOpenAI:
+    """An OpenAI client created on first use, from the given keyword arguments.
+
+    Importing openai takes most of a second, so a run answered entirely
+    from the summary cache never imports it.
+    """
+
+    def __init__(self, **options):
+        self._options = options
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Only called for attributes of the real client; the pool's threads may race here
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+                self._client = OpenAI(**self._options)
+        return getattr(self._client, name)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(base_url=None):
+    """The process-wide LazyOpenAI for an endpoint (None: the real API).
+
+    Reusing one client keeps its HTTP connections open between requests,
+    rather than paying a new TCP and TLS handshake for each. It does not
+    retry by itself; wrap it in a RetryingClient for that. It reads
+    OPENAI_API_KEY from the environment; a local endpoint does not need a
+    real key.
+    """
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            options = {"max_retries": 0}
+            if base_url:
+                options.update(base_url=base_url, api_key=os.environ.get("OPENAI_API_KEY") or "unused")
+            client = _clients[base_url] = LazyOpenAI(**options)
+        return client
+
+
+def summarize(client, task, model=MODEL, timeout=DEFAULT_TIMEOUT):
+    """Ask the model for a short summary of one task description."""
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": PROMPT.format(task=task)}],
+        timeout=timeout,
+    )
+    return response.choices[0].message.content
+
+
+def summarize_batch(client, tasks, model=MODEL, timeout=DEFAULT_TIMEOUT):
+    """Ask for short summaries of several task descriptions in one request.
+
+    The tasks are sent as a numbered list, and the model is asked for a
+    JSON object mapping each number to its summary. Returns one entry per
+    task, in order: the summary, or None where the reply has no valid one
+    (see parse_batch_reply). Raises if the request itself fails.
+    """
+    # One line per task, so descriptions cannot break the numbering
+    listing = "\n".join(f"{i}. {' '.join(task.split())}" for i, task in enumerate(tasks, 1))
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": BATCH_PROMPT.format(count=len(tasks), tasks=listing)}],
+        response_format={"type": "json_object"},
+        timeout=timeout,
+    )
+    return parse_batch_reply(response.choices[0].message.content, len(tasks))
+
+
+def parse_batch_reply(text, count):
+    """Return the count summaries in a batched reply, with None for each missing or invalid one.
+
+    The reply must hold a JSON object with keys "1" to "count" (a code
+    fence or text around it is ignored). A summary is valid if it is a
+    non-empty string of at most MAX_SUMMARY_WORDS words; anything longer
+    usually means the model merged or shifted tasks.
+    """
+    results = [None] * count
+    text = text or ""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return results
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return results
+    if not isinstance(data, dict):
+        return results
+    for i in range(count):
+        summary = data.get(str(i + 1))
+        if isinstance(summary, str) and summary.strip() and len(summary.split()) <= MAX_SUMMARY_WORDS:
+            results[i] = summary.strip()
+    return results
+
+
+def _summarize_or_error(client, task, model, timeout):
+    try:
+        return summarize(client, task, model, timeout)
+    except Exception as e:
+        return e
+
+
+def _summarize_chunk(client, chunk, model, timeout):
+    """Pool job: set the future of each (task, future) in chunk to its result.
+
+    Several tasks go in one batched request; any it does not answer, or
+    all of them if it fails, are then asked about one at a time.
+    """
+    chunk = [(task, future) for task, future in chunk if future.set_running_or_notify_cancel()]
+    results = [None] * len(chunk)
+    if len(chunk) > 1:
+        try:
+            results = summarize_batch(client, [task for task, _ in chunk], model, timeout)
+        except Exception:
+            pass
+    for (task, future), result in zip(chunk, results):
+        future.set_result(result if result is not None else _summarize_or_error(client, task, model, timeout))
+
+
+def summarize_all(client, tasks, max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=DEFAULT_TIMEOUT, model=MODEL,
+                  cache=None, batch_size=1):
+    """Summarize many task descriptions concurrently, yielding results in input order.
+
+    At most max_in_flight requests are open at once. Each result is the
+    summary, or the exception if that request failed or took longer than
+    timeout seconds; one failure does not stop the others. Only a few
+    batches of requests are queued ahead of the result being waited for,
+    so tasks can be any iterable, however long.
+
+    With batch_size above 1, up to that many tasks share one request (see
+    summarize_batch), and only those it does not answer get a request of
+    their own.
+
+    With a SummaryCache, descriptions already summarized with this model
+    and prompt are answered from it without a request, repeats within the
+    run share one request, and new summaries are added to it.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    prompt = BATCH_PROMPT if batch_size > 1 else PROMPT
+    # Ahead of the oldest pending result, so one slow reply does not idle the pool
+    window = max_in_flight * batch_size * 4
+    # (cache key, future) per task in order, the requests not yet cached by
+    # key, and the (task, future) pairs for the next request
+    pending = deque()
+    requested = {}
+    chunk = []
+
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="tasks4") as pool:
+
+        def send():
+            pool.submit(_summarize_chunk, client, list(chunk), model, timeout)
+            chunk.clear()
+
+        def finish():
+            key, future = pending.popleft()
+            if any(f is future for _, f in chunk):
+                send()
+            result = future.result()
+            if requested.get(key) is future:
+                del requested[key]
+                if isinstance(result, str):
+                    cache.put(key, result)
+            return result
+
+        try:
+            for task in tasks:
+                key = future = None
+                if cache is not None:
+                    key = cache_key(model, prompt, task)
+                    future = requested.get(key)
+                    if future is None:
+                        summary = cache.get(key)
+                        if summary is not None:
+                            future = Future()
+                            future.set_result(summary)
+                if future is None:
+                    future = Future()
+                    chunk.append((task, future))
+                    if len(chunk) >= batch_size:
+                        send()
+                    if key is not None:
+                        requested[key] = future
+                pending.append((key, future))
+                if len(pending) >= window:
+                    yield finish()
+            if chunk:
+                send()
+            while pending:
+                yield finish()
+        finally:
+            # The caller stopped early: drop what has not started
+            for _, future in pending:
+                future.cancel()
+
+
+def read_tasks(path):
+    """Read task descriptions, one per non-blank line, from a file ('-': stdin)."""
+    if path == "-":
+        return [line.strip() for line in sys.stdin if line.strip()]
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main(argv=None):
     """Main function that processes task descriptions and prints summaries."""
-    # Initialize OpenAI client (reads OPENAI_API_KEY from environment)
-    client = OpenAI()
+    parser = argparse.ArgumentParser(description="Summarize task descriptions in 5 words or less")
+    parser.add_argument("file", nargs="?",
+                        help="Task descriptions, one per line ('-': stdin; default: two samples)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT, metavar="N",
+                        help=f"Requests to send at once (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SECONDS",
+                        help=f"Give up on a request after this long (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--model", default=MODEL, help=f"Chat model to use (default: {MODEL})")
+    parser.add_argument("--base-url", metavar="URL",
+                        help="API endpoint, e.g. a local stub server (python -m tasks4.stub_server)")
+    parser.add_argument("--cache-file", metavar="PATH",
+                        help="Summary cache to use (default: ~/.cache/tasks4/summaries.db)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES, metavar="N",
+                        help=f"Keep at most N cached summaries, dropping the least recently used (default: {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--no-cache", action="store_true", help="Ask the model about every task")
+    parser.add_argument("--batch-size", type=int, default=1, metavar="N",
+                        help="Summarize up to N tasks per request, asking again singly for any it misses (default: 1)")
+    parser.add_argument("--rpm", type=float, metavar="N", help="Send at most N requests per minute")
+    parser.add_argument("--tpm", type=float, metavar="N", help="Use at most about N tokens per minute")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, metavar="N",
+                        help=f"Retry rate-limited and failed requests up to N times, backing off (default: {DEFAULT_RETRIES})")
+    args = parser.parse_args(argv)
+    if args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1")
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    for name in ("rpm", "tpm"):
+        if getattr(args, name) is not None and getattr(args, name) <= 0:
+            parser.error(f"--{name} must be positive")
+    if args.retries < 0:
+        parser.error("--retries must not be negative")
+
+    try:
+        tasks = read_tasks(args.file) if args.file else SAMPLE_TASKS
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    limiter = RateLimiter(args.rpm, args.tpm) if args.rpm or args.tpm else None
+    metrics = Metrics()
+    client = RetryingClient(shared_client(args.base_url), limiter, metrics, args.retries)
 
-    # Sample paragraph-length task descriptions
-    tasks = [
-        "I need to prepare a comprehensive presentation for the quarterly review meeting scheduled for next Tuesday at 2 PM. This involves gathering all the sales data from Q3, creating clear visualizations showing trends and comparisons to previous quarters, writing detailed speaker notes for each slide to ensure I don't miss key points, and rehearsing the delivery at least twice to feel confident. The whole thing should take about 6 hours total of focused work.",
-        
-        "My kitchen faucet has been dripping constantly for the past week and it's getting annoying plus wasting water. I need to either fix it myself by watching some YouTube tutorials and replacing the washer, or call a professional plumber if it turns out to be more complicated than I can handle. Before doing anything, I should also check if this kind of repair is covered under my home warranty to avoid unnecessary expenses."
-    ]
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = SummaryCache(args.cache_file, args.cache_size)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: not using the summary cache: {e}", file=sys.stderr)
 
-    # Loop through each task and get a summary
+    # Summaries are printed in task order as soon as each one is ready
     print("Task Summaries:\n")
-    for i, task in enumerate(tasks, 1):
-        response = client.chat.completions.create(
-            model="gpt-5-mini",
-            messages=[{
-                "role": "user",
-                "content": f"Summarize this task as a short phrase (5 words or less): {task}"
-            }]
-        )
-        summary = response.choices[0].message.content
-        print(f"{i}. {summary}")
+    failed = 0
+    try:
+        results = summarize_all(client, tasks, args.max_in_flight, args.timeout, args.model, cache,
+                                args.batch_size)
+        for i, summary in enumerate(results, 1):
+            if isinstance(summary, Exception):
+                failed += 1
+                print(f"{i}. (failed: {summary})")
+            else:
+                print(f"{i}. {summary}")
+            sys.stdout.flush()
+    finally:
+        if cache is not None:
+            cache.close()
+            print(cache.stats(), file=sys.stderr)
+        if metrics.requests:
+            print(metrics.report(), file=sys.stderr)
+    if failed:
+        print(f"\n{failed} of {len(tasks)} task(s) could not be summarized", file=sys.stderr)
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,3 @@
+from tasks4 import main
+
+main()
@@ -0,0 +1,126 @@
+"""Persistent cache of task summaries, so reruns only ask about new descriptions.
+
+Entries live in a small SQLite database (by default
+~/.cache/tasks4/summaries.db, or under $XDG_CACHE_HOME). Each is keyed by a
+SHA-256 hash of the model, the prompt template and the description, so
+changing any of them asks again. Once the cache holds more than
+max_entries summaries, the least recently used are dropped.
+"""
+
+import hashlib
+import os
+import sqlite3
+
+DEFAULT_MAX_ENTRIES = 10_000
+# Writes are committed in groups of this many, and on close
+COMMIT_EVERY = 100
+
+
+def default_cache_path():
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "tasks4", "summaries.db")
+
+
+def cache_key(model, prompt, task):
+    """Hex SHA-256 of (model, prompt template, description)."""
+    digest = hashlib.sha256()
+    for part in (model, prompt, task):
+        data = part.encode("utf-8")
+        # Length-prefixed, so no two different triples hash the same bytes
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """LRU-bounded on-disk map from cache_key() to summary, with hit/miss counts.
+
+    Not thread-safe: use it from one thread (summarize_all consults it from
+    the caller's thread). Use as a context manager, or call close(), to
+    save the last changes.
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key TEXT PRIMARY KEY, summary TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)")
+        self._count, last = self._db.execute("SELECT COUNT(*), MAX(last_used) FROM summaries").fetchone()
+        # Uses are numbered rather than timed, so the order is exact on any clock
+        self._clock = last or 0
+        self._unsaved = 0
+        self._evict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def get(self, key):
+        """Return the cached summary for key, or None; counts a hit or a miss."""
+        row = self._db.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._db.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (self._tick(), key))
+        self._changed()
+        return row[0]
+
+    def put(self, key, summary):
+        """Store a summary, dropping the least recently used ones beyond max_entries."""
+        now = self._tick()
+        updated = self._db.execute(
+            "UPDATE summaries SET summary = ?, last_used = ? WHERE key = ?", (summary, now, key)
+        ).rowcount
+        if not updated:
+            self._db.execute("INSERT INTO summaries (key, summary, last_used) VALUES (?, ?, ?)", (key, summary, now))
+            self._count += 1
+            self._evict()
+        self._changed()
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _evict(self):
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM summaries WHERE key IN"
+                " (SELECT key FROM summaries ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self._count -= excess
+
+    def _changed(self):
+        self._unsaved += 1
+        if self._unsaved >= COMMIT_EVERY:
+            self._db.commit()
+            self._unsaved = 0
+
+    def stats(self):
+        """A one-line report of this run's hits and misses."""
+        total = self.hits + self.misses
+        rate = f" ({self.hits / total:.0%} hits)" if total else ""
+        return f"Cache: {self.hits} hit(s), {self.misses} miss(es){rate}, {self._count} stored"
+
+    def close(self):
+        """Save pending changes and close the database."""
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
@@ -0,0 +1,183 @@
+"""Rate limiting, retries and request metrics for the summarizer.
+
+RetryingClient wraps an OpenAI client (or anything with
+chat.completions.create). Each request first waits for a RateLimiter, a
+pair of token buckets refilled at the configured requests and tokens per
+minute. Rate-limit (429), server (5xx), timeout and connection errors are
+then retried with exponential backoff and full jitter, waiting at least
+as long as any Retry-After header asks. Metrics counts requests, retries,
+failures and tokens for a throughput report at the end of a run.
+"""
+
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+DEFAULT_RETRIES = 4
+# Backoff before retry n (from 0) is uniform in [0, min(MAX_DELAY, BASE_DELAY * 2**n)]
+BASE_DELAY = 0.5
+MAX_DELAY = 30.0
+# A bucket holds at most this many seconds' worth of its rate, so a run
+# starts with a short burst rather than a whole minute's allowance
+BURST_SECONDS = 1.0
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class _Bucket:
+    def __init__(self, per_minute):
+        if per_minute <= 0:
+            raise ValueError("rate limits must be positive")
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * BURST_SECONDS)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self, amount):
+        # A request larger than the bucket waits for a full one, then overdraws it
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+
+class RateLimiter:
+    """Token buckets for requests and tokens per minute; either limit may be None.
+
+    acquire() blocks until both buckets allow one more request of the
+    given size. The size is only an estimate, so adjust() charges or
+    refunds the difference once the real usage is known; a bucket may go
+    below zero, which delays the next requests.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=0):
+        """Wait for room for one request of about this many tokens; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wanted = [(b, n) for b, n in ((self._requests, 1), (self._tokens, tokens)) if b is not None]
+                for bucket, _ in wanted:
+                    bucket.refill(now)
+                delay = max((bucket.wait(n) for bucket, n in wanted), default=0.0)
+                if delay <= 0:
+                    for bucket, n in wanted:
+                        bucket.level -= n
+                    return waited
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, tokens):
+        """Charge (or, if negative, refund) tokens beyond the estimate given to acquire()."""
+        if self._tokens is not None and tokens:
+            with self._lock:
+                self._tokens.refill(time.monotonic())
+                self._tokens.level = min(self._tokens.capacity, self._tokens.level - tokens)
+
+
+class Metrics:
+    """Thread-safe counts of requests, retries, failures, tokens and time spent throttled."""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.tokens = 0
+        self.throttled = 0.0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self):
+        """A one-line summary of the run so far, with the throughput achieved."""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (f"Requests: {self.requests} in {elapsed:.1f}s ({self.requests / elapsed:.1f}/s, "
+                f"{self.tokens / elapsed * 60:.0f} tokens/min), {self.retries} retried, "
+                f"{self.failures} failed, {self.throttled:.1f}s waiting for the rate limit")
+
+
+def is_retryable(error):
+    """Whether a failed request may succeed if sent again."""
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(error, APIConnectionError):
+        # Includes APITimeoutError
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait (Retry-After header), or None."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        # An HTTP date; the backoff will do
+        return None
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+    """Full-jitter exponential backoff before retry number attempt (from 0)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def estimate_tokens(request):
+    """A rough token count for a chat request: about four characters per token."""
+    return sum(len(m.get("content") or "") for m in request.get("messages", ())) // 4 + 1
+
+
+class RetryingClient:
+    """A chat client that rate-limits, retries and counts requests made through it.
+
+    Only chat.completions.create is provided, which is all tasks4 uses.
+    Give the wrapped client max_retries=0, so it does not retry as well.
+    """
+
+    def __init__(self, client, limiter=None, metrics=None, max_retries=DEFAULT_RETRIES,
+                 base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self._client = client
+        self.limiter = limiter
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        estimate = estimate_tokens(request)
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.metrics.add(throttled=self.limiter.acquire(estimate))
+            self.metrics.add(requests=1)
+            try:
+                response = self._client.chat.completions.create(**request)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.metrics.add(failures=1)
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                time.sleep(max(delay, retry_after(e) or 0.0))
+                self.metrics.add(retries=1)
+                attempt += 1
+                continue
+            usage = getattr(response, "usage", None)
+            used = getattr(usage, "total_tokens", None) or estimate
+            self.metrics.add(tokens=used)
+            if self.limiter is not None:
+                self.limiter.adjust(used - estimate)
+            return response
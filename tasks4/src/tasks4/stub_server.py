@@ -0,0 +1,201 @@
+"""A local stand-in for the Chat Completions endpoint, for tests and benchmarks.
+
+It answers POST /v1/chat/completions like the real API, after an optional
+delay, with the first five words of the text after the prompt's colon as
+the "summary". Requests for a JSON object (response_format json_object)
+get the batched reply tasks4 asks for: the first five words of each
+numbered task, except those containing SKIP_MARKER. To exercise retries it
+can fail some requests with 429 or 500 errors. No API key or network access
+is needed:
+
+    python -m tasks4.stub_server --port 8000 --latency 0.2 --error-rate 0.1
+    tasks4 --base-url http://127.0.0.1:8000/v1 descriptions.txt
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Numbered tasks containing this are left out of batched replies
+SKIP_MARKER = "[skip]"
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server that also counts requests, connections and peak concurrency.
+
+    errors is a list of HTTP statuses to answer the next requests with, in
+    order (None: answer normally); after it runs out, each request fails
+    with a 429 or 500 at random with probability error_rate. A 429 carries
+    a Retry-After of retry_after seconds, if given.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, errors=(), error_rate=0.0, retry_after=None):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.errors = list(errors)
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failed = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def enter(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def connected(self):
+        with self._lock:
+            self.connections += 1
+
+    def next_error(self):
+        """The status to fail this request with, or None."""
+        with self._lock:
+            if self.errors:
+                status = self.errors.pop(0)
+            elif self.error_rate and random.random() < self.error_rate:
+                status = random.choice((429, 500))
+            else:
+                status = None
+            if status is not None:
+                self.failed += 1
+            return status
+
+
+def fake_summary(prompt):
+    """The stub's answer: the first five words of the text after the first colon."""
+    text = prompt.split(":", 1)[-1]
+    return " ".join(text.split()[:5])
+
+
+def fake_batch_summary(prompt):
+    """The stub's batched answer: a JSON object of the first five words of each "N. task" line."""
+    answers = {}
+    for number, task in re.findall(r"^(\d+)\. (.*)$", prompt, re.MULTILINE):
+        if SKIP_MARKER not in task:
+            answers[number] = " ".join(task.split()[:5])
+    return json.dumps(answers)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can reuse their connections
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connected()
+
+    def do_POST(self):
+        # Read the whole request first, or the next one on this connection is garbled
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+        self.server.enter()
+        try:
+            body = json.loads(data or b"{}")
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            status = self.server.next_error()
+            if status == 429:
+                headers = {"Retry-After": str(self.server.retry_after)} if self.server.retry_after is not None else {}
+                self._send(429, {"error": {"message": "Rate limit reached (stub)", "type": "requests",
+                                           "code": "rate_limit_exceeded"}}, headers)
+                return
+            if status is not None:
+                self._send(status, {"error": {"message": f"Stub error {status}", "type": "server_error"}})
+                return
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            if (body.get("response_format") or {}).get("type") == "json_object":
+                content = fake_batch_summary(prompt)
+            else:
+                content = fake_summary(prompt)
+            self._send(200, {
+                "id": f"chatcmpl-stub-{self.server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 5,
+                          "total_tokens": len(prompt.split()) + 5},
+            })
+        finally:
+            self.server.leave()
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+@contextmanager
+def running_stub(latency=0.0, port=0, **options):
+    """Run a StubServer on 127.0.0.1 in a background thread; yields the server.
+
+    Other keyword arguments (errors, error_rate, retry_after) go to StubServer.
+    """
+    server = StubServer(("127.0.0.1", port), latency, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Chat Completions API locally")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each reply (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, metavar="P",
+                        help="Fail this fraction of requests with a 429 or 500 (default: 0)")
+    parser.add_argument("--retry-after", type=float, metavar="SECONDS", help="Retry-After to send with each 429")
+    args = parser.parse_args()
+    server = StubServer(("127.0.0.1", args.port), args.latency, error_rate=args.error_rate,
+                        retry_after=args.retry_after)
+    print(f"Stub API at {server.base_url} (latency {args.latency}s, error rate {args.error_rate:g}); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
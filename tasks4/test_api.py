@@ -1,12 +1,28 @@
+"""Check that the API key works: python test_api.py [BASE_URL]"""
 
-from openai import OpenAI
-
-try:
-    client = OpenAI()
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": "Respond with OK"}]
-    )
-    print("✓ API Working:", response.choices[0].message.content)
-except Exception as e:
-    print("✗ Error:", e)
\ No newline at end of file
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from tasks4 import shared_client
+from tasks4.ratelimit import RetryingClient
+
+
+def check_api(base_url=None):
+    # The shared client, so a caller checking several times reuses one connection
+    client = RetryingClient(shared_client(base_url))
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "Respond with OK"}]
+        )
+        print("✓ API Working:", response.choices[0].message.content)
+        return True
+    except Exception as e:
+        print("✗ Error:", e)
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_api(sys.argv[1] if len(sys.argv) > 1 else None) else 1)
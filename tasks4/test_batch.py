@@ -0,0 +1,76 @@
+"""Check batched summarizing against the local stub API: no key or network needed.
+
+    python test_batch.py        # prints request counts and times per batch size
+    python -m pytest test_batch.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from openai import OpenAI
+
+from tasks4 import parse_batch_reply, summarize_all
+from tasks4.cache import SummaryCache
+from tasks4.stub_server import SKIP_MARKER, running_stub
+
+LATENCY = 0.05
+
+
+def make_tasks(n):
+    return [f"Task number {i} needs doing before the end of the week" for i in range(n)]
+
+
+def expected(tasks):
+    return [" ".join(task.split()[:5]) for task in tasks]
+
+
+def run(server, tasks, batch_size, cache=None):
+    client = OpenAI(base_url=server.base_url, api_key="unused", max_retries=0)
+    return list(summarize_all(client, tasks, max_in_flight=4, cache=cache, batch_size=batch_size))
+
+
+def test_batches_cut_requests_and_keep_order():
+    tasks = make_tasks(100)
+    with running_stub() as server:
+        assert run(server, tasks, batch_size=20) == expected(tasks)
+        assert server.requests == 5
+
+
+def test_unanswered_tasks_are_asked_singly():
+    tasks = make_tasks(10)
+    tasks[3] += f" {SKIP_MARKER}"
+    tasks[7] += f" {SKIP_MARKER}"
+    with running_stub() as server:
+        assert run(server, tasks, batch_size=10) == expected(tasks)
+        # One batch, then one request each for the two it left out
+        assert server.requests == 3
+
+
+def test_invalid_replies_are_rejected():
+    assert parse_batch_reply('```json\n{"1": "Fix the tap", "2": ""}\n```', 3) == ["Fix the tap", None, None]
+    assert parse_batch_reply('{"1": "' + "word " * 20 + '", "2": 7}', 2) == [None, None]
+    assert parse_batch_reply("Sorry, I can't help with that.", 2) == [None, None]
+    assert parse_batch_reply('["Fix the tap"]', 1) == [None]
+
+
+def test_batches_use_the_cache(tmp_path):
+    tasks = make_tasks(30)
+    with running_stub() as server:
+        with SummaryCache(tmp_path / "summaries.db") as cache:
+            run(server, tasks[:10], batch_size=10, cache=cache)
+            assert run(server, tasks, batch_size=10, cache=cache) == expected(tasks)
+        # The first ten come from the cache; the other twenty take two batches
+        assert server.requests == 3 and cache.hits == 10
+
+
+if __name__ == "__main__":
+    n = 200
+    for batch_size in (1, 10, 25):
+        with running_stub(latency=LATENCY) as server:
+            start = time.perf_counter()
+            run(server, make_tasks(n), batch_size)
+            elapsed = time.perf_counter() - start
+        print(f"batch size {batch_size:>3}: {n} summaries in {server.requests} request(s), {elapsed:.2f}s")
@@ -0,0 +1,60 @@
+"""Check the summary cache against the local stub API: no key or network needed.
+
+    python -m pytest test_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from openai import OpenAI
+
+from tasks4 import PROMPT, summarize_all
+from tasks4.cache import SummaryCache, cache_key
+from tasks4.stub_server import running_stub
+
+
+def make_tasks(n):
+    return [f"Task number {i} needs doing before the end of the week" for i in range(n)]
+
+
+def run(server, cache, tasks, model="gpt-5-mini"):
+    client = OpenAI(base_url=server.base_url, api_key="unused", max_retries=0)
+    return list(summarize_all(client, tasks, max_in_flight=4, model=model, cache=cache))
+
+
+def test_rerun_is_answered_from_cache(tmp_path):
+    path = tmp_path / "summaries.db"
+    tasks = make_tasks(20)
+    with running_stub() as server:
+        with SummaryCache(path) as cache:
+            first = run(server, cache, tasks)
+        assert (cache.hits, cache.misses, server.requests) == (0, 20, 20)
+        with SummaryCache(path) as cache:
+            second = run(server, cache, tasks + ["A new task: write the tests"])
+        assert second[:20] == first and second[20] == "A new task: write the"
+        assert (cache.hits, cache.misses, server.requests) == (20, 1, 21)
+
+
+def test_key_covers_model_and_repeats_share_a_request(tmp_path):
+    with running_stub() as server, SummaryCache(tmp_path / "summaries.db") as cache:
+        assert run(server, cache, ["Same: one", "Same: one", "Same: one"]) == ["Same: one"] * 3
+        assert server.requests == 1
+        run(server, cache, ["Same: one"], model="other-model")
+        assert server.requests == 2
+    assert cache_key("m", PROMPT, "a") != cache_key("m", PROMPT + " ", "a")
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    path = tmp_path / "summaries.db"
+    with SummaryCache(path, max_entries=3) as cache:
+        for name in "abc":
+            cache.put(name, name.upper())
+        assert cache.get("a") == "A"
+        cache.put("d", "D")
+        assert len(cache) == 3 and cache.get("b") is None
+    with SummaryCache(path, max_entries=2) as cache:
+        assert len(cache) == 2 and cache.get("c") is None
+        assert (cache.get("a"), cache.get("d")) == ("A", "D")
+        assert cache.stats() == "Cache: 2 hit(s), 1 miss(es) (67% hits), 2 stored"
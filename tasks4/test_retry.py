@@ -0,0 +1,74 @@
+"""Check rate limiting, retries and client reuse against the local stub API.
+
+    python test_retry.py        # prints throughput with 10% of requests failing
+    python -m pytest test_retry.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from tasks4 import shared_client, summarize_all
+from tasks4.ratelimit import Metrics, RateLimiter, RetryingClient
+from tasks4.stub_server import running_stub
+
+
+def make_tasks(n):
+    return [f"Task number {i} needs doing before the end of the week" for i in range(n)]
+
+
+def retrying(server, limiter=None, max_retries=4):
+    return RetryingClient(shared_client(server.base_url), limiter, Metrics(), max_retries, base_delay=0.01)
+
+
+def test_transient_errors_are_retried():
+    with running_stub(errors=[429, 500, 503, None, 429], retry_after=0.05) as server:
+        client = retrying(server)
+        start = time.perf_counter()
+        results = list(summarize_all(client, make_tasks(6), max_in_flight=1))
+        elapsed = time.perf_counter() - start
+    assert results == [f"Task number {i} needs doing" for i in range(6)]
+    assert (client.metrics.requests, client.metrics.retries, client.metrics.failures) == (10, 4, 0)
+    # Both 429s waited at least their Retry-After
+    assert elapsed >= 0.1
+
+
+def test_give_up_after_max_retries_or_on_client_errors():
+    with running_stub(errors=[500, 500, 500, 400]) as server:
+        client = retrying(server, max_retries=2)
+        results = list(summarize_all(client, make_tasks(2), max_in_flight=1))
+    assert all(isinstance(r, Exception) for r in results)
+    # Three tries for the first task; the 400 is not retried
+    assert (client.metrics.requests, client.metrics.retries, client.metrics.failures) == (4, 2, 2)
+
+
+def test_rate_limit_paces_requests_and_connections_are_reused():
+    with running_stub() as server:
+        # 600 a minute is 10 a second, after a burst of up to 10
+        client = retrying(server, RateLimiter(requests_per_minute=600))
+        start = time.perf_counter()
+        list(summarize_all(client, make_tasks(20), max_in_flight=2))
+        elapsed = time.perf_counter() - start
+        assert server.requests == 20 and server.connections <= 2
+    assert 0.8 < elapsed < 3
+    assert client.metrics.throttled > 0
+
+
+def test_token_limit_counts_reported_usage():
+    limiter = RateLimiter(tokens_per_minute=60 * 100)
+    assert limiter.acquire(100) == 0
+    # The estimate was 100 but the request used 150: the next one waits for the 50 over
+    limiter.adjust(50)
+    waited = limiter.acquire(1)
+    assert 0.4 < waited < 1.0
+
+
+if __name__ == "__main__":
+    n = 200
+    with running_stub(latency=0.05, error_rate=0.1) as server:
+        client = retrying(server)
+        failed = sum(isinstance(r, Exception) for r in summarize_all(client, make_tasks(n)))
+        print(f"{n} tasks with 10% of requests failing: {failed} failed")
+        print(client.metrics.report())
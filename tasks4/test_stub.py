@@ -0,0 +1,59 @@
+"""Run the summarizer against the local stub API: no key or network needed.
+
+    python test_stub.py        # prints sequential vs concurrent throughput
+    python -m pytest test_stub.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from openai import OpenAI
+
+from tasks4 import summarize_all
+from tasks4.stub_server import running_stub
+
+LATENCY = 0.05
+
+
+def stub_client(server, max_retries=0):
+    return OpenAI(base_url=server.base_url, api_key="unused", max_retries=max_retries)
+
+
+def make_tasks(n):
+    return [f"Task number {i} needs doing before the end of the week" for i in range(n)]
+
+
+def throughput(max_in_flight, n):
+    with running_stub(latency=LATENCY) as server:
+        start = time.perf_counter()
+        summaries = list(summarize_all(stub_client(server), make_tasks(n), max_in_flight=max_in_flight))
+        elapsed = time.perf_counter() - start
+        return summaries, elapsed, server.max_in_flight
+
+
+def test_results_in_order_and_bounded():
+    summaries, elapsed, peak = throughput(max_in_flight=8, n=64)
+    assert summaries == [f"Task number {i} needs doing" for i in range(64)]
+    assert peak <= 8
+    # 64 requests of 50ms each, 8 at a time: about 0.4s rather than 3.2s
+    assert elapsed < 64 * LATENCY / 2
+
+
+def test_timeouts_fail_only_their_task():
+    with running_stub(latency=0.5) as server:
+        results = list(summarize_all(stub_client(server), make_tasks(3), max_in_flight=3, timeout=0.1))
+    assert all(isinstance(r, Exception) for r in results)
+    with running_stub() as server:
+        results = list(summarize_all(stub_client(server), make_tasks(3), timeout=5))
+    assert results[2] == "Task number 2 needs doing"
+
+
+if __name__ == "__main__":
+    n = 200
+    for max_in_flight in (1, 8, 32):
+        _, elapsed, peak = throughput(max_in_flight, n)
+        print(f"max in flight {max_in_flight:>3}: {n} summaries in {elapsed:.2f}s "
+              f"({n / elapsed:.0f}/s, peak {peak} open)")